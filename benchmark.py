@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+# Offline render benchmark: builds the real component tree with di.create_clock, draws onto an in-memory canvas
+# instead of an LED matrix (see headless.py), feeds the MQTT-backed data resolvers canned payloads, and steps a simulated clock forward
+# a fixed amount every frame.  Results are written as JSON so that they can be compared between revisions.
+#
+#   ./benchmark.py --frames 3000 --output before.json
+
+from di import create_clock
+from draw import Histogram
+from headless import MemoryMatrix, SimulatedTime, START_TIME, canned_payloads, feed_payloads, headless_config
+from pixelperfectpi import Clock
+from typing import Any
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import resource
+import sys
+import time
+import tracemalloc
+
+async def run_frames(clock: Clock, matrix: MemoryMatrix, simulated_time: SimulatedTime, frames: int, step: float, track_allocations: bool) -> dict[str, Any]:
+    frame_times = Histogram(window=frames)
+    allocation_peaks = Histogram(window=frames)
+    start = time.perf_counter()
+    for _ in range(frames):
+        simulated_time.now += step
+        if track_allocations:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        frame_start = time.perf_counter()
+        await clock.draw_frame(matrix)
+        frame_times.add(time.perf_counter() - frame_start)
+        if track_allocations:
+            _, peak = tracemalloc.get_traced_memory()
+            allocation_peaks.add(peak - before)
+    elapsed = time.perf_counter() - start
+
+    if track_allocations:
+        return {
+            "frame_allocation_peak_bytes": {
+                "p50": allocation_peaks.percentile(50),
+                "p95": allocation_peaks.percentile(95),
+                "p99": allocation_peaks.percentile(99),
+            },
+        }
+    return {
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "frame_time": frame_times.summary(),
+        "swaps": matrix.swaps,
+    }
+
+async def benchmark(frames: int, step: float, damage_tracking: bool, allocations: bool) -> dict[str, Any]:
+    matrix = MemoryMatrix()
+    simulated_time = SimulatedTime(START_TIME)
+    clock = create_clock(headless_config(damage_tracking), rgbmatrix_provider=lambda: matrix, time_source=simulated_time)
+    clock.pre_run()
+    await clock.create_canvas(matrix)
+    await feed_payloads(clock.data_resolvers, canned_payloads(START_TIME))
+
+    gc.collect()
+    results: dict[str, Any] = {
+        "damage_tracking": damage_tracking,
+        "step": step,
+    }
+    results.update(await run_frames(clock, matrix, simulated_time, frames, step, track_allocations=False))
+
+    if allocations:
+        # tracemalloc slows drawing considerably, so allocations are measured in a separate pass.
+        tracemalloc.start()
+        results.update(await run_frames(clock, matrix, simulated_time, frames, step, track_allocations=True))
+        results["traced_memory_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    results["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render the clock offline and report frame timings as JSON")
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--step", type=float, default=0.1, help="simulated seconds between frames")
+    parser.add_argument("--damage-tracking", action="store_true")
+    parser.add_argument("--no-allocations", action="store_true", help="skip the (slow) allocation tracking pass")
+    parser.add_argument("--output", help="file to write results to; defaults to stdout")
+    args = parser.parse_args()
+
+    # Keep the components' chatter out of the JSON output
+    with contextlib.redirect_stdout(sys.stderr):
+        results = asyncio.run(benchmark(args.frames, args.step, args.damage_tracking, not args.no_allocations))
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
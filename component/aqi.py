@@ -1,6 +1,6 @@
 from data import PurpleAirDataResolver
 from draw import TextNode, CarouselPanel
-from typing import Any
+from typing import Any, Hashable
 
 class AqiComponent(TextNode, CarouselPanel):
     def __init__(self, purpleair: PurpleAirDataResolver, font_path: str, **kwargs: Any) -> None:
@@ -19,6 +19,9 @@ class AqiComponent(TextNode, CarouselPanel):
         (red, green, blue) = self.purpleair.data["p25aqic"]
         return (red, green, blue)
 
+    def text_key(self) -> Hashable:
+        return self.purpleair.version
+
     def get_text(self) -> str:
         if self.purpleair.data is None:
             return "N/A"
@@ -1,12 +1,13 @@
-from data import CalendarDataResolver, DataResolver
+from data import CalendarDataResolver
+from data.currenttime import CurrentTimeDataResolver
 from draw import TextNode, CarouselPanel
 from PIL import ImageColor
-from typing import Any
+from typing import Any, Hashable
 import datetime
 import pytz
 
 class CalendarComponent(TextNode, CarouselPanel):
-    def __init__(self, calendar: CalendarDataResolver, current_time: DataResolver[float], display_tz: pytz.BaseTzInfo, font_path: str, calendar_index: int, **kwargs: Any) -> None:
+    def __init__(self, calendar: CalendarDataResolver, current_time: CurrentTimeDataResolver, display_tz: pytz.BaseTzInfo, font_path: str, calendar_index: int, **kwargs: Any) -> None:
         super().__init__(font="4x6", font_path=font_path, flex_grow=1, **kwargs)
         self.calendar = calendar
         self.current_time = current_time
@@ -25,6 +26,11 @@ class CalendarComponent(TextNode, CarouselPanel):
     def is_carousel_visible(self) -> bool:
         return self.my_event() is not None
 
+    # The text only depends upon the event and today's date (events are at most six days out, so "< 7 days" below
+    # doesn't change during the day).
+    def text_key(self) -> Hashable:
+        return (self.calendar.version, self.current_time.frame.date)
+
     def get_text(self) -> str:
         event = self.my_event()
         if event is None:
@@ -33,7 +39,7 @@ class CalendarComponent(TextNode, CarouselPanel):
         (dt, summary) = event
 
         preamble = ""
-        now_dt = datetime.datetime.now(self.display_tz)
+        now_dt = self.current_time.frame.local
 
         if dt.time() == datetime.time(0,0,0):
             # full day event probably
@@ -67,8 +73,10 @@ class CalendarComponent(TextNode, CarouselPanel):
     def get_background_color(self) -> tuple[int, int, int, int] | tuple[int, int, int]:
         return (0, 0, 16)
 
+    def next_frame_time(self, now: float) -> float | None:
+        # The text color cycles continuously, like TimeComponent's.
+        return now
+
     def get_text_color(self) -> tuple[int, int, int] | tuple[int, int, int, int]:
-        now = self.current_time.data
-        assert now is not None
-        hue = int(now*50 % 360)
+        hue = int(self.current_time.frame.timestamp*50 % 360)
         return ImageColor.getrgb(f"hsl({hue}, 100%, 50%)")
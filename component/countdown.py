@@ -1,9 +1,8 @@
-from data import DataResolver
+from data.currenttime import CurrentTimeDataResolver
 from datetime import datetime
 from draw import TextNode, CarouselPanel, ContainerNode, IconNode
 from PIL import ImageColor
 from typing import Any
-import pytz
 from stretchable.style import AlignItems
 from enum import Enum, auto
 
@@ -12,7 +11,7 @@ class CountDirection(Enum):
     UP = auto()
 
 class CountdownComponent(ContainerNode, CarouselPanel):
-    def __init__(self, current_time: DataResolver[float], target_date: datetime, font_path: str, icon_path: str, count_direction: CountDirection = CountDirection.DOWN, **kwargs: Any) -> None:
+    def __init__(self, current_time: CurrentTimeDataResolver, target_date: datetime, font_path: str, icon_path: str, count_direction: CountDirection = CountDirection.DOWN, **kwargs: Any) -> None:
         super().__init__(
             flex_grow=1,
             align_items=AlignItems.STRETCH,
@@ -24,9 +23,7 @@ class CountdownComponent(ContainerNode, CarouselPanel):
         self.add_child(self.CountdownText(current_time, target_date, font_path, count_direction))
 
     def is_carousel_visible(self) -> bool:
-        if self.current_time.data is None:
-            return False
-        now_dt = datetime.fromtimestamp(self.current_time.data, pytz.utc)
+        now_dt = self.current_time.frame.utc
         if self.count_direction == CountDirection.DOWN and now_dt > self.target_date:
             return False
         elif self.count_direction == CountDirection.UP and now_dt < self.target_date:
@@ -39,7 +36,7 @@ class CountdownComponent(ContainerNode, CarouselPanel):
             super().__init__(icon_path=icon_path, icon_file="france.png", background_color=(0, 32, 0), **kwargs)
 
     class CountdownText(TextNode):
-        def __init__(self, current_time: DataResolver[float], target_date: datetime, font_path: str, count_direction: CountDirection, **kwargs: Any) -> None:
+        def __init__(self, current_time: CurrentTimeDataResolver, target_date: datetime, font_path: str, count_direction: CountDirection, **kwargs: Any) -> None:
             super().__init__(font="5x8", font_path=font_path, **kwargs)
             self.current_time = current_time
             self.target_date = target_date
@@ -55,10 +52,7 @@ class CountdownComponent(ContainerNode, CarouselPanel):
             return ImageColor.getrgb(f"hsl({hue}, 100%, 50%)")
 
         def get_text(self) -> str:
-            now = self.current_time.data
-            assert now is not None
-
-            now_dt = datetime.fromtimestamp(now, pytz.utc)
+            now_dt = self.current_time.frame.utc
 
             if self.count_direction == CountDirection.DOWN:
                 delta = self.target_date - now_dt
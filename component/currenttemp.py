@@ -1,6 +1,7 @@
 from data import DataResolver
 from data.weather import CurrentWeatherData
 from draw import TextNode, CarouselPanel
+from typing import Hashable
 
 class CurrentTemperatureComponent(TextNode, CarouselPanel):
     def __init__(self, font_path: str, data_resolver: DataResolver[CurrentWeatherData]) -> None:
@@ -15,6 +16,9 @@ class CurrentTemperatureComponent(TextNode, CarouselPanel):
     def is_carousel_visible(self) -> bool:
         return self.data_resolver.data is not None and self.data_resolver.data.temperature is not None
 
+    def text_key(self) -> Hashable:
+        return self.data_resolver.version
+
     def get_text(self) -> str:
         data = self.data_resolver.data
         if data is None:
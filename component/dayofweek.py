@@ -1,10 +1,9 @@
-from data import DataResolver
+from data.currenttime import CurrentTimeDataResolver
 from draw import TextNode, CarouselPanel
 from PIL import ImageColor
-import time
 
 class DayOfWeekComponent(TextNode, CarouselPanel):
-    def __init__(self, font_path: str, current_time: DataResolver[float]) -> None:
+    def __init__(self, font_path: str, current_time: CurrentTimeDataResolver) -> None:
         assert font_path is not None
         assert current_time is not None
         super().__init__(
@@ -14,10 +13,7 @@ class DayOfWeekComponent(TextNode, CarouselPanel):
         self.current_time = current_time
 
     def get_text(self) -> str:
-        now = self.current_time.data
-        assert now is not None
-        timestr = time.strftime("%a", time.localtime(now))
-        return timestr
+        return self.current_time.frame.strftime("%a")
 
     def get_text_color(self) -> tuple[int, int, int] | tuple[int, int, int, int]:
         now = self.current_time.data
@@ -1,6 +1,7 @@
 from data import DistanceDataResolver
 from draw import TextNode, CarouselPanel, ContainerNode, IconNode
 from stretchable.style import AlignItems
+from typing import Hashable
 
 class DistanceComponent(ContainerNode, CarouselPanel):
     def __init__(self, distance: DistanceDataResolver, font_path: str, icon_path: str, label: str, icon: str) -> None:
@@ -36,6 +37,9 @@ class DistanceComponent(ContainerNode, CarouselPanel):
         def get_text_color(self) -> tuple[int, int, int]:
             return (255, 255, 0)
 
+        def text_key(self) -> Hashable:
+            return self.distance.version
+
         def get_text(self) -> str:
             if self.distance.data is None:
                 return ""
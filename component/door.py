@@ -1,26 +1,28 @@
 from data import DoorDataResolver, DoorStatus
+from data.currenttime import CurrentTimeDataResolver
 from draw import TextNode, CarouselPanel, ContainerNode, IconNode
 from stretchable.style import AlignItems
+from typing import Hashable
 import datetime
-import pytz
 
 class DoorComponent(ContainerNode, CarouselPanel):
-    def __init__(self, door: DoorDataResolver, font_path: str, icon_path: str, name: str) -> None:
+    def __init__(self, door: DoorDataResolver, current_time: CurrentTimeDataResolver, font_path: str, icon_path: str, name: str) -> None:
         super().__init__(
             flex_grow=1,
             align_items=AlignItems.STRETCH,
         )
         self.door = door
+        self.current_time = current_time
         self.name = name
         self.just_changed_timeframe = datetime.timedelta(seconds=10)
         self.left_open_timeframe = datetime.timedelta(minutes=5)
         self.add_child(self.DoorIcon(icon_path))
-        self.add_child(self.DoorText(door, font_path, name, self.just_changed_timeframe, self.left_open_timeframe))
+        self.add_child(self.DoorText(door, current_time, font_path, name, self.just_changed_timeframe, self.left_open_timeframe))
 
     def is_carousel_visible(self) -> bool:
         if self.door.data is None or self.door.data.status == DoorStatus.UNKNOWN:
             return False
-        now_dt = datetime.datetime.now(pytz.utc)
+        now_dt = self.current_time.frame.utc
         delta = now_dt - self.door.data.status_since
         if delta < self.just_changed_timeframe:
             return True
@@ -32,7 +34,7 @@ class DoorComponent(ContainerNode, CarouselPanel):
         # For the first 15 seconds after the door status changes, we want to show the status.
         if self.door.data is None:
             return 0
-        now_dt = datetime.datetime.now(pytz.utc)
+        now_dt = self.current_time.frame.utc
         delta = now_dt - self.door.data.status_since
         if delta < self.just_changed_timeframe:
             return 10
@@ -43,9 +45,10 @@ class DoorComponent(ContainerNode, CarouselPanel):
             super().__init__(icon_path=icon_path, icon_file="garage.png", background_color=(0, 32, 32))
 
     class DoorText(TextNode):
-        def __init__(self, door: DoorDataResolver, font_path: str, name: str, just_changed_timeframe: datetime.timedelta, left_open_timeframe: datetime.timedelta) -> None:
+        def __init__(self, door: DoorDataResolver, current_time: CurrentTimeDataResolver, font_path: str, name: str, just_changed_timeframe: datetime.timedelta, left_open_timeframe: datetime.timedelta) -> None:
             super().__init__(font="5x8", font_path=font_path)
             self.door = door
+            self.current_time = current_time
             self.name = name
             self.just_changed_timeframe = just_changed_timeframe
             self.left_open_timeframe = left_open_timeframe
@@ -56,10 +59,15 @@ class DoorComponent(ContainerNode, CarouselPanel):
         def get_text_color(self) -> tuple[int, int, int]:
             return (255, 128, 0)
 
+        def text_key(self) -> Hashable:
+            if self.door.data is None:
+                return self.door.version
+            return (self.door.version, self.current_time.frame.utc - self.door.data.status_since < self.just_changed_timeframe)
+
         def get_text(self) -> str:
             if self.door.data is None:
                 return ""
-            now_dt = datetime.datetime.now(pytz.utc)
+            now_dt = self.current_time.frame.utc
             delta = now_dt - self.door.data.status_since
             if delta < self.just_changed_timeframe:
                 if self.door.data.status == DoorStatus.OPEN:
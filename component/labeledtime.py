@@ -1,12 +1,10 @@
-from data import DataResolver
+from data.currenttime import CurrentTimeDataResolver
 from draw import TextNode, CarouselPanel
 from PIL import ImageColor
-import time
 import pytz
-from datetime import datetime
 
 class LabeledTimeComponent(TextNode, CarouselPanel):
-    def __init__(self, font_path: str, current_time: DataResolver[float], display_tz: pytz.BaseTzInfo, label: str) -> None:
+    def __init__(self, font_path: str, current_time: CurrentTimeDataResolver, display_tz: pytz.BaseTzInfo, label: str) -> None:
         assert font_path is not None
         assert current_time is not None
         super().__init__(
@@ -24,9 +22,7 @@ class LabeledTimeComponent(TextNode, CarouselPanel):
         return (0, 128, 0)
 
     def get_text(self) -> str:
-        now = self.current_time.data
-        assert now is not None
-        dt = datetime.fromtimestamp(now, pytz.utc).astimezone(self.display_tz)
+        dt = self.current_time.frame.utc.astimezone(self.display_tz)
         timestr = dt.strftime("%-I:%M%p").lower()
         # if int(now % 2) == 0:
         #     timestr = timestr.replace(":", " ")
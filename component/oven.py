@@ -1,6 +1,7 @@
 from data import OvenOnDataResolver, OvenStatus
 from draw import TextNode, CarouselPanel, ContainerNode, IconNode
 from stretchable.style import AlignItems
+from typing import Hashable
 
 class OvenOnComponent(ContainerNode, CarouselPanel):
     def __init__(self, oven_on: OvenOnDataResolver, font_path: str, icon_path: str) -> None:
@@ -34,6 +35,9 @@ class OvenOnComponent(ContainerNode, CarouselPanel):
         def get_text_color(self) -> tuple[int, int, int]:
             return (255, 0, 0)
 
+        def text_key(self) -> Hashable:
+            return self.oven_on.version
+
         def get_text(self) -> str:
             if self.oven_on.data is None:
                 return ""
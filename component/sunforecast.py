@@ -1,13 +1,14 @@
 from data import DataResolver, SunForecast
+from data.currenttime import CurrentTimeDataResolver
 from draw import TextNode, CarouselPanel
 from typing import Any, Literal
-import datetime
 import pytz
 
 class SunForecastComponent(TextNode, CarouselPanel):
-    def __init__(self, sun_forecast: DataResolver[SunForecast], display_tz: pytz.BaseTzInfo, font_path: str, **kwargs: Any) -> None:
+    def __init__(self, sun_forecast: DataResolver[SunForecast], current_time: CurrentTimeDataResolver, display_tz: pytz.BaseTzInfo, font_path: str, **kwargs: Any) -> None:
         super().__init__(font="5x8", font_path=font_path, flex_grow=1, **kwargs)
         self.sun_forecast = sun_forecast
+        self.current_time = current_time
         self.display_tz = display_tz
 
     def is_carousel_visible(self) -> bool:
@@ -16,7 +17,7 @@ class SunForecastComponent(TextNode, CarouselPanel):
     def mode(self) -> Literal["sunrise"] | Literal["sunset"]:
         if self.sun_forecast.data is None or self.sun_forecast.data.sunrise is None or self.sun_forecast.data.sunset is None:
             return "sunrise"
-        now_dt = datetime.datetime.now(self.display_tz)
+        now_dt = self.current_time.frame.local
         sunrise = self.sun_forecast.data.sunrise
         sunset = self.sun_forecast.data.sunset
         if sunrise > now_dt and sunrise < sunset:
@@ -39,7 +40,7 @@ class SunForecastComponent(TextNode, CarouselPanel):
     def get_text(self) -> str:
         if self.sun_forecast.data is None or self.sun_forecast.data.sunrise is None or self.sun_forecast.data.sunset is None:
             return "N/A"
-        now_dt = datetime.datetime.now(self.display_tz)
+        now_dt = self.current_time.frame.local
         sunrise = self.sun_forecast.data.sunrise
         sunset = self.sun_forecast.data.sunset
         if sunrise > now_dt and sunrise < sunset:
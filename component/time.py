@@ -1,10 +1,9 @@
-from data import DataResolver
+from data.currenttime import CurrentTimeDataResolver
 from draw import TextNode
 from PIL import ImageColor
-import time
 
 class TimeComponent(TextNode):
-    def __init__(self, font_path: str, current_time: DataResolver[float]) -> None:
+    def __init__(self, font_path: str, current_time: CurrentTimeDataResolver) -> None:
         assert font_path is not None
         assert current_time is not None
         super().__init__(
@@ -14,16 +13,17 @@ class TimeComponent(TextNode):
         self.current_time = current_time
 
     def get_text(self) -> str:
-        now = self.current_time.data
-        assert now is not None
-        timestr = time.strftime("%-I:%M", time.localtime(now))
-        if int(now % 2) == 0:
+        frame = self.current_time.frame
+        timestr = frame.strftime("%-I:%M")
+        if int(frame.timestamp % 2) == 0:
             timestr = timestr.replace(":", " ")
         return timestr
 
+    def next_frame_time(self, now: float) -> float | None:
+        # The text color cycles continuously.
+        return now
+
     def get_text_color(self) -> tuple[int, int, int] | tuple[int, int, int, int]:
-        now = self.current_time.data
-        assert now is not None
-        hue = int(now*50 % 360)
+        hue = int(self.current_time.frame.timestamp*50 % 360)
         return ImageColor.getrgb(f"hsl({hue}, 100%, 50%)")
 
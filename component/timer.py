@@ -1,25 +1,25 @@
 from data import TimerDataResolver, TimerState
+from data.currenttime import CurrentTimeDataResolver
 from draw import TextNode, CarouselPanel, ContainerNode, IconNode
 from stretchable.style import AlignItems
-import datetime
-import pytz
 
 class TimerComponent(ContainerNode, CarouselPanel):
-    def __init__(self, timer: TimerDataResolver, font_path: str, icon_path: str) -> None:
+    def __init__(self, timer: TimerDataResolver, current_time: CurrentTimeDataResolver, font_path: str, icon_path: str) -> None:
         super().__init__(
             flex_grow=1,
             align_items=AlignItems.STRETCH,
         )
         self.timer = timer
+        self.current_time = current_time
         self.add_child(self.TimerIcon(icon_path))
-        self.add_child(self.TimerText(timer, font_path))
+        self.add_child(self.TimerText(timer, current_time, font_path))
 
     def is_carousel_visible(self) -> bool:
         if self.timer.data is None:
             return False
         if self.timer.data.state not in (TimerState.RUNNING, TimerState.PAUSED):
             return False
-        if self.timer.data.state == TimerState.RUNNING and self.timer.data.finishes_at is not None and self.timer.data.finishes_at < datetime.datetime.now(pytz.utc):
+        if self.timer.data.state == TimerState.RUNNING and self.timer.data.finishes_at is not None and self.timer.data.finishes_at < self.current_time.frame.utc:
             return False
         return True
 
@@ -28,9 +28,10 @@ class TimerComponent(ContainerNode, CarouselPanel):
             super().__init__(icon_path=icon_path, icon_file="timer.png", background_color=(37, 37, 14))
 
     class TimerText(TextNode):
-        def __init__(self, timer: TimerDataResolver, font_path: str) -> None:
+        def __init__(self, timer: TimerDataResolver, current_time: CurrentTimeDataResolver, font_path: str) -> None:
             super().__init__(font="5x8", font_path=font_path)
             self.timer = timer
+            self.current_time = current_time
 
         def get_background_color(self) -> tuple[int, int, int]:
             return (37, 37, 14)
@@ -44,7 +45,7 @@ class TimerComponent(ContainerNode, CarouselPanel):
             if self.timer.data.state == TimerState.RUNNING:
                 if self.timer.data.finishes_at is None:
                     return ""
-                remaining = self.timer.data.finishes_at - datetime.datetime.now(pytz.utc)
+                remaining = self.timer.data.finishes_at - self.current_time.frame.utc
                 remaining_minutes = int(remaining.total_seconds() / 60)
                 remaining_seconds = int(remaining.total_seconds() % 60)
                 return f"Timer {remaining_minutes}:{remaining_seconds:02}"
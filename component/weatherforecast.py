@@ -1,14 +1,17 @@
 from data import WeatherForecast, WeatherForecasts, DataResolver
-from draw import TextNode, CarouselPanel, ContainerNode
+from data.currenttime import CurrentTimeDataResolver
+from draw import TextNode, CarouselPanel, ContainerNode, Sparkline
 from stretchable.style import AlignItems, FlexDirection, JustifyContent
-from typing import Any
+from typing import Any, Hashable
 import datetime
+import numpy.typing as npt
 import pytz
 
 class DailyWeatherForecastComponent(TextNode, CarouselPanel):
-    def __init__(self, weather_forecast_data: DataResolver[WeatherForecasts], offset: datetime.timedelta, display_tz: pytz.BaseTzInfo, label: str, font_path: str, **kwargs: Any) -> None:
+    def __init__(self, weather_forecast_data: DataResolver[WeatherForecasts], current_time: CurrentTimeDataResolver, offset: datetime.timedelta, display_tz: pytz.BaseTzInfo, label: str, font_path: str, **kwargs: Any) -> None:
         super().__init__(font="4x6", font_path=font_path, flex_grow=1, **kwargs)
         self.weather_forecast_data = weather_forecast_data
+        self.current_time = current_time
         self.offset = offset
         self.label = label
         self.display_tz = display_tz
@@ -16,13 +19,8 @@ class DailyWeatherForecastComponent(TextNode, CarouselPanel):
     def get_forecast(self, data: WeatherForecasts | None) -> WeatherForecast | None:
         if data is None:
             return None
-        now = datetime.datetime.now(tz=self.display_tz)
-        for day in data.daily:
-            if day.datetime is None:
-                continue
-            if day.datetime.date() == (now + self.offset).date():
-                return day
-        return None
+        now = self.current_time.frame.local
+        return data.daily_forecast((now + self.offset).date())
 
     def is_carousel_visible(self) -> bool:
         return self.get_forecast(self.weather_forecast_data.data) is not None
@@ -52,7 +50,7 @@ class DailyWeatherForecastComponent(TextNode, CarouselPanel):
 
 
 class HourlyWeatherForecastComponent(ContainerNode, CarouselPanel):
-    def __init__(self, weather_forecast_data: DataResolver[WeatherForecasts],  display_tz: pytz.BaseTzInfo, font_path: str, num_hours: int = 4, **kwargs: Any) -> None:
+    def __init__(self, weather_forecast_data: DataResolver[WeatherForecasts], current_time: CurrentTimeDataResolver, display_tz: pytz.BaseTzInfo, font_path: str, num_hours: int = 4, **kwargs: Any) -> None:
         super().__init__(
             flex_grow=1,
             flex_direction=FlexDirection.ROW,
@@ -61,13 +59,23 @@ class HourlyWeatherForecastComponent(ContainerNode, CarouselPanel):
         )
         self.weather_forecast_data = weather_forecast_data
         for i in range(num_hours):
-            self.add_child(HourlyWeatherForecastSingleHourPanel(weather_forecast_data=weather_forecast_data, display_tz=display_tz, font_path=font_path, offset_hour=i+1))
+            self.add_child(HourlyWeatherForecastSingleHourPanel(weather_forecast_data=weather_forecast_data, current_time=current_time, display_tz=display_tz, font_path=font_path, offset_hour=i+1))
         self.background_color = (16, 0, 0)
 
     def is_carousel_visible(self) -> bool:
         return self.weather_forecast_data.data is not None
 
 
+# The color thresholds
+TEMPERATURE_SCALE: list[tuple[float, tuple[int, int, int]]] = [
+    (-40, (0, 0, 255)),    # Deep blue
+    (0, (173, 216, 230)),  # Light blue
+    (10, (144, 238, 144)), # Light green
+    (20, (0, 255, 0)),     # Green
+    (30, (255, 255, 0)),   # Yellow
+    (40, (255, 0, 0))      # Red
+]
+
 def interpolate_color(temp: float) -> tuple[int, int, int]:
     """
     Converts a temperature (in Celsius) to an RGB color tuple.
@@ -79,15 +87,7 @@ def interpolate_color(temp: float) -> tuple[int, int, int]:
     40°C and above is red.
     Supports temperatures from -40°C to 40°C.
     """
-    # Define the color thresholds
-    thresholds = [
-        (-40, (0, 0, 255)),    # Deep blue
-        (0, (173, 216, 230)),  # Light blue
-        (10, (144, 238, 144)), # Light green
-        (20, (0, 255, 0)),     # Green
-        (30, (255, 255, 0)),   # Yellow
-        (40, (255, 0, 0))      # Red
-    ]
+    thresholds = TEMPERATURE_SCALE
 
     # Find the two thresholds that the current temp lies between
     for i in range(len(thresholds) - 1):
@@ -112,7 +112,7 @@ def interpolate_color(temp: float) -> tuple[int, int, int]:
 
 
 class HourlyWeatherForecastSingleHourPanel(ContainerNode, CarouselPanel):
-    def __init__(self, weather_forecast_data: DataResolver[WeatherForecasts], display_tz: pytz.BaseTzInfo, font_path: str, offset_hour: int, **kwargs: Any) -> None:
+    def __init__(self, weather_forecast_data: DataResolver[WeatherForecasts], current_time: CurrentTimeDataResolver, display_tz: pytz.BaseTzInfo, font_path: str, offset_hour: int, **kwargs: Any) -> None:
         super().__init__(
             flex_direction=FlexDirection.COLUMN,
             justify_content=JustifyContent.STRETCH,
@@ -121,6 +121,7 @@ class HourlyWeatherForecastSingleHourPanel(ContainerNode, CarouselPanel):
 
         self.font_path = font_path
         self.weather_forecast_data = weather_forecast_data
+        self.current_time = current_time
         self.display_tz = display_tz
         self.offset_hour = offset_hour
         self.background_color = (16, 0, 0)
@@ -129,23 +130,13 @@ class HourlyWeatherForecastSingleHourPanel(ContainerNode, CarouselPanel):
         self.add_child(self.TemperatureText(self))
         self.add_child(self.PrecipitationText(self))
 
-    # FIXME? Maybe this should be cached briefly since it's accessed repeatedly by the three subframes
     def get_forecast(self) -> WeatherForecast | None:
         forecast = self.weather_forecast_data.data
         if forecast is None:
             return None
-        now = datetime.datetime.now(pytz.utc).astimezone(self.display_tz)
+        now = self.current_time.frame.local
         target_time = now + self.offset_hour * datetime.timedelta(hours=1)
-        # print(f"Offset {self.offset_hour} is looking for {target_time}...")
-        for hour in forecast.hourly:
-            if hour.datetime is None:
-                continue
-            hour_time = hour.datetime.astimezone(self.display_tz)
-            # print(f"\tFound {hour_time}...")
-            if hour_time.date() == target_time.date() and hour_time.hour == target_time.hour:
-                # print("\tThat works!")
-                return hour
-        return None
+        return forecast.hourly_forecast(target_time.date(), target_time.hour)
 
     class HourText(TextNode):
         def __init__(self, hwparent: "HourlyWeatherForecastSingleHourPanel") -> None:
@@ -209,3 +200,35 @@ class HourlyWeatherForecastSingleHourPanel(ContainerNode, CarouselPanel):
             if forecast.precipitation < 1:
                 return "<1mm"
             return f"{forecast.precipitation:.0f}mm"
+
+
+# The temperature over the coming hours, starting with the current one.  Not part of the default layout; add it to a
+# carousel to use it.
+class HourlyTemperatureChartComponent(Sparkline, CarouselPanel):
+    def __init__(self, weather_forecast_data: DataResolver[WeatherForecasts], current_time: CurrentTimeDataResolver, num_hours: int = 24, **kwargs: Any) -> None:
+        super().__init__(mode="line", background_color=(16, 0, 0), flex_grow=1, **kwargs)
+        self.weather_forecast_data = weather_forecast_data
+        self.current_time = current_time
+        self.num_hours = num_hours
+
+    def first_hour(self) -> int | None:
+        if self.weather_forecast_data.data is None:
+            return None
+        now = self.current_time.frame.local
+        return self.weather_forecast_data.data.hourly_index(now.date(), now.hour)
+
+    def is_carousel_visible(self) -> bool:
+        return self.first_hour() is not None
+
+    def values_key(self) -> Hashable:
+        return (self.weather_forecast_data.version, self.first_hour())
+
+    def values(self) -> npt.ArrayLike:
+        first_hour = self.first_hour()
+        if self.weather_forecast_data.data is None or first_hour is None:
+            return []
+        # A view of the forecast's column; nothing is copied.
+        return self.weather_forecast_data.data.hourly[first_hour:first_hour + self.num_hours].values["temperature_high"]
+
+    def color_scale(self) -> list[tuple[float, tuple[int, int, int]]]:
+        return TEMPERATURE_SCALE
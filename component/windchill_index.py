@@ -1,7 +1,7 @@
 from data import DataResolver, CurrentWeatherData
 from draw import TextNode, CarouselPanel, ContainerNode, BarChart
 from stretchable.style import JustifyContent, AlignItems
-from typing import Any
+from typing import Any, Hashable
 
 class CurrentWindChillIndexComponent(ContainerNode, CarouselPanel):
     def __init__(self, data_resolver: DataResolver[CurrentWeatherData], font_path: str, **kwargs: Any) -> None:
@@ -37,6 +37,9 @@ class CurrentWindChillIndexComponent(ContainerNode, CarouselPanel):
         def get_text_color(self) -> tuple[int, int, int]:
             return (192, 191, 159)
 
+        def text_key(self) -> Hashable:
+            return self.data_resolver.version
+
         def get_text(self) -> str:
             if self.data_resolver.data is None or self.data_resolver.data.wind_chill is None:
                 return ""
@@ -25,8 +25,19 @@ class AppConfig:
     display_tz: str
     calendar_ical_url: str
     font_path: str
+    preload_fonts: list[str]
     icon_path: str
+    cache_path: str | None
+    parse_executor: Literal["inline"] | Literal["thread"] | Literal["process"]
     mqtt: MQTTConfig
     homeassistant_media_mqtt_topic: str | None
     location: LocationConfig
     weather_mqtt_topic: str
+    damage_tracking: bool
+    target_fps: float
+    profiling: bool
+
+# A comma-separated list, as given in an environment variable.  Empty entries are dropped, so that an empty value (eg.
+# PRELOAD_FONTS="") is an empty list.
+def comma_list(value: str) -> list[str]:
+    return [item for item in value.split(",") if item]
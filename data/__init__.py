@@ -2,12 +2,13 @@ from .calendar import CalendarDataResolver
 from .distance import DistanceDataResolver, LocationDistance
 from .door import DoorStatus, DoorInformation, DoorDataResolver
 from .envcanada import EnvironmentCanadaDataResolver
+from .httpclient import FetchResult, HttpCache, HttpClient
 from .media_player import MediaPlayerDataResolver, MediaPlayerInformation, MediaPlayerState
 from .ovenpower import OvenOnDataResolver, OvenInformation, OvenStatus
 from .purpleair import PurpleAirDataResolver
 from .resolver import DataResolver, StaticDataResolver
 from .timer import TimerDataResolver, TimerInformation, TimerState
-from .weather import CurrentWeatherData, WeatherForecasts, WeatherForecast, SunForecast
+from .weather import CurrentWeatherData, ForecastSeries, WeatherForecasts, WeatherForecast, SunForecast
 from .weather_mqtt import CurrentWeatherDataMqttResolver
 
 __all__ = [
@@ -20,6 +21,10 @@ __all__ = [
     'DoorInformation',
     'DoorStatus',
     'EnvironmentCanadaDataResolver',
+    'ForecastSeries',
+    'FetchResult',
+    'HttpCache',
+    'HttpClient',
     'LocationDistance',
     'MediaPlayerDataResolver',
     'MediaPlayerInformation',
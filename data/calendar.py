@@ -1,53 +1,102 @@
+from .httpclient import HttpClient
+from .icalindex import OccurrenceIndex
+from .icalstream import IcalEventFilter
 from .resolver import ScheduledDataResolver
+from concurrent.futures import Executor
 from typing import Any
-import aiohttp
 import datetime
-import icalendar # type: ignore
+import hashlib
+import icalendar
 import pytz
 import recurring_ical_events # type: ignore
 
 class CalendarDataResolver(ScheduledDataResolver[dict[str, Any]]): # FIXME: change to a dataclass
-    def __init__(self, ical_url: str, display_tz: pytz.BaseTzInfo) -> None:
-        super().__init__(refresh_interval=3600)
+    def __init__(self, ical_url: str, display_tz: pytz.BaseTzInfo, http_client: HttpClient, incremental: bool = True, streaming: bool = True, executor: Executor | None = None) -> None:
+        super().__init__(refresh_interval=3600, executor=executor)
         self.ical_url = ical_url
         self.display_tz = display_tz
+        self.http_client = http_client
+        # In incremental mode, recurrences are expanded through an OccurrenceIndex, which only re-expands events that
+        # changed; otherwise the whole calendar is expanded on every collection.
+        self.incremental = incremental
+        # In streaming mode, the feed is filtered as it's downloaded (see IcalEventFilter), so that past events are
+        # never buffered, parsed or cached.
+        self.streaming = streaming
+        # The last feed parsed, so that it's only re-parsed (and its recurrences re-expanded) when its content changes.
+        self.feed: ParsedFeed | None = None
 
-    async def fetch_ical(self) -> bytes:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.ical_url) as response:
-                if response.status != 200:
-                    raise Exception(f"Unexpected status code: {response.status}")
-                return await response.read()
+    async def cached_data(self) -> dict[str, Any] | None:
+        cached = self.http_client.cached(self.ical_url)
+        if cached is None:
+            return None
+        return await self.parse(cached.body, datetime.datetime.now(pytz.utc))
 
     async def do_collection(self) -> dict[str, Any]:
-        ical_content = await self.fetch_ical()
-        calendar = icalendar.Calendar.from_ical(ical_content)
-        future_events = []
-
-        now = datetime.datetime.now(pytz.utc) # datetime.timezone.utc)
-        today = datetime.date.today()
-
-        start_date = now
-        end_date = now + datetime.timedelta(days=14)
-        events = recurring_ical_events.of(calendar).between(start_date, end_date)
-        for event in events:
-            dtstart = event.get("dtstart").dt
-            if isinstance(dtstart, datetime.datetime):
-                if dtstart > now:
-                    future_events.append((dtstart.astimezone(self.display_tz), str(event.get("SUMMARY"))))
-            elif isinstance(dtstart, datetime.date):
-                # Show "today" events until 8am, then move on
-                dtstart_morning = datetime.datetime.combine(dtstart, datetime.time(8, 0, 0)).astimezone(self.display_tz)
-                if dtstart_morning > now:
-                    start = datetime.datetime.combine(dtstart, datetime.time()).astimezone(self.display_tz)
-                    future_events.append((start, str(event.get("SUMMARY"))))
-            else:
-                print("unexpected dt type", repr(dtstart))
-
-        future_cutoff = now + datetime.timedelta(days=6)
-        near_future_events = [x for x in future_events if x[0] < future_cutoff]
-        near_future_events = sorted(near_future_events, key=lambda event: event[0])
-
-        return {
-            "future_events": near_future_events
-        }
+        now = datetime.datetime.now(pytz.utc)
+        if self.streaming:
+            # Two days' slack covers time zones and all-day events that are still shown on the morning they start.
+            result = await self.http_client.fetch_stream(self.ical_url, IcalEventFilter(before=(now - datetime.timedelta(days=2)).date()))
+        else:
+            result = await self.http_client.fetch(self.ical_url)
+        return await self.parse(result.body, now)
+
+    # Collections are serialized by the resolver's lock, so self.feed is only ever updated by one parse at a time.
+    async def parse(self, ical_content: bytes, now: datetime.datetime) -> dict[str, Any]:
+        (self.feed, events) = await self.run_cpu_bound(upcoming_events, self.feed, ical_content, self.display_tz, now, self.incremental)
+        return events
+
+# A feed parsed from ical_content, and its OccurrenceIndex in incremental mode.
+class ParsedFeed(object):
+    def __init__(self, ical_content: bytes, incremental: bool) -> None:
+        self.digest = hashlib.sha256(ical_content).digest()
+        self.calendar = icalendar.Calendar.from_ical(ical_content)
+        self.occurrence_index = OccurrenceIndex() if incremental else None
+        if self.occurrence_index is not None:
+            self.occurrence_index.update(self.calendar)
+
+    def update(self, ical_content: bytes) -> None:
+        digest = hashlib.sha256(ical_content).digest()
+        if digest == self.digest:
+            return
+        self.digest = digest
+        self.calendar = icalendar.Calendar.from_ical(ical_content)
+        if self.occurrence_index is not None:
+            self.occurrence_index.update(self.calendar)
+
+# Events starting in the next 6 days, in display_tz, along with `feed` updated to ical_content (or a new ParsedFeed, if
+# feed is None) for the next call.  This is a module-level function taking only picklable arguments so that it can be
+# run in a process pool; there, the feed is copied to the worker and back on each call, and the worker keeps no state.
+def upcoming_events(feed: ParsedFeed | None, ical_content: bytes, display_tz: pytz.BaseTzInfo, now: datetime.datetime, incremental: bool = True) -> tuple[ParsedFeed, dict[str, Any]]:
+    if feed is None:
+        feed = ParsedFeed(ical_content, incremental)
+    else:
+        feed.update(ical_content)
+
+    future_events = []
+
+    start_date = now
+    end_date = now + datetime.timedelta(days=14)
+    if feed.occurrence_index is not None:
+        occurrences = [(dtstart, summary) for (_, dtstart, summary) in feed.occurrence_index.occurrences(now)]
+    else:
+        occurrences = [(event.get("dtstart").dt, str(event.get("SUMMARY"))) for event in recurring_ical_events.of(feed.calendar).between(start_date, end_date)]
+    for (dtstart, summary) in occurrences:
+        if isinstance(dtstart, datetime.datetime):
+            if dtstart > now:
+                future_events.append((dtstart.astimezone(display_tz), summary))
+        elif isinstance(dtstart, datetime.date):
+            # Show "today" events until 8am, then move on
+            dtstart_morning = datetime.datetime.combine(dtstart, datetime.time(8, 0, 0)).astimezone(display_tz)
+            if dtstart_morning > now:
+                start = datetime.datetime.combine(dtstart, datetime.time()).astimezone(display_tz)
+                future_events.append((start, summary))
+        else:
+            print("unexpected dt type", repr(dtstart))
+
+    future_cutoff = now + datetime.timedelta(days=6)
+    near_future_events = [x for x in future_events if x[0] < future_cutoff]
+    near_future_events = sorted(near_future_events, key=lambda event: event[0])
+
+    return (feed, {
+        "future_events": near_future_events
+    })
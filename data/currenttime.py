@@ -1,19 +1,59 @@
 from .resolver import DataResolver
 from lxml import etree # type: ignore
+from typing import Any, Callable, Hashable, TypeVar
+import datetime
+import pytz
 import time
 
+R = TypeVar('R')
+
+# The current time as needed to draw a frame: computed once per frame so that every component sees the same instant
+# without converting it again, plus a cache for values derived from it.
+class FrameContext(object):
+    def __init__(self, timestamp: float, display_tz: datetime.tzinfo) -> None:
+        self.timestamp = timestamp
+        self.utc = datetime.datetime.fromtimestamp(timestamp, pytz.utc)
+        self.local = self.utc.astimezone(display_tz)
+        self.date = self.local.date()
+        self.derived: dict[Hashable, Any] = {}
+
+    # fn(), computed at most once per frame for each key.
+    def cached(self, key: Hashable, fn: Callable[[], R]) -> R:
+        if key in self.derived:
+            value: R = self.derived[key]
+            return value
+        value = self.derived[key] = fn()
+        return value
+
+    def strftime(self, format: str) -> str:
+        return self.cached(("strftime", format), lambda: self.local.strftime(format))
+
 class CurrentTimeDataResolver(DataResolver[float]):
-    def __init__(self) -> None:
+    # time_source can be replaced to drive the display from a simulated clock, eg. for benchmarking.
+    def __init__(self, time_source: Callable[[], float] = time.time, display_tz: datetime.tzinfo = pytz.utc) -> None:
         self._frozen_time: float | None = None
+        self._frame: FrameContext | None = None
+        self.time_source = time_source
+        self.display_tz = display_tz
 
     def freeze_time(self) -> None:
-        self._frozen_time = time.time()
+        self._frozen_time = self.time_source()
+        self._frame = FrameContext(self._frozen_time, self.display_tz)
 
     def release_time(self) -> None:
         self._frozen_time = None
+        self._frame = None
 
-    @property
-    def data(self) -> float | None: # type: ignore
+    # Changes continuously, so `version` isn't maintained.
+    @property # type: ignore[misc]
+    def data(self) -> float | None:
         if self._frozen_time is not None:
             return self._frozen_time
-        return time.time()
+        return self.time_source()
+
+    # The frame being drawn; outside of a frame, a new context for the current time.
+    @property
+    def frame(self) -> FrameContext:
+        if self._frame is not None:
+            return self._frame
+        return FrameContext(self.time_source(), self.display_tz)
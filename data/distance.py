@@ -1,8 +1,8 @@
 from .resolver import DataResolver
-from aiomqtt import Client, Message
+from aiomqtt import Message
 from dataclasses import dataclass
-from mqtt import MqttMessageReceiver
-import json
+from mqtt import JsonMessageReceiver
+from typing import Any
 import math
 
 # Helper function to calculate distance between two geographic coordinates using Haversine formula
@@ -26,36 +26,29 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
 class LocationDistance:
     distance: float  # distance in km
 
-class DistanceDataResolver(DataResolver[LocationDistance], MqttMessageReceiver):
+class DistanceDataResolver(DataResolver[LocationDistance], JsonMessageReceiver):
     def __init__(self, home_lat: float, home_long: float, topic: str) -> None:
         self.home_lat = home_lat
         self.home_long = home_long
         self.data = LocationDistance(distance=0.0)
         self.topic = topic
 
-    async def maybe_refresh(self, now: float) -> None:
-        return
+    def topic_filters(self) -> list[str]:
+        return [self.topic]
 
-    async def subscribe_to_topics(self, client: Client) -> None:
-        await client.subscribe(self.topic)
-
-    async def handle_message(self, message: Message) -> bool:
+    async def handle_json(self, message: Message, payload: Any) -> bool:
         if str(message.topic) != self.topic:
             return False
-        if not isinstance(message.payload, bytes):
-            return False
-
-        assert self.data is not None
 
-        payload = json.loads(message.payload)
         latitude = payload.get("latitude")
         longitude = payload.get("longitude")
 
+        # A new LocationDistance, rather than changing the current one, so that the change is versioned.
         if latitude is None or longitude is None:
-            self.data.distance = 0.0
+            self.data = LocationDistance(distance=0.0)
         else:
             # Calculate the distance between the received point and hardcoded point
             distance = haversine_distance(latitude, longitude, self.home_lat, self.home_long)
-            self.data.distance = distance
+            self.data = LocationDistance(distance=distance)
 
         return True
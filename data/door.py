@@ -1,11 +1,10 @@
 from .resolver import DataResolver
-from aiomqtt import Client, Message
+from aiomqtt import Message
 from dataclasses import dataclass
 from enum import Enum, auto
-from mqtt import MqttMessageReceiver
-from typing import Literal
+from mqtt import JsonMessageReceiver
+from typing import Any, Literal
 import datetime
-import json
 import pytz
 
 class DoorStatus(Enum):
@@ -18,7 +17,7 @@ class DoorInformation:
     status: DoorStatus
     status_since: datetime.datetime
 
-class DoorDataResolver(DataResolver[DoorInformation], MqttMessageReceiver):
+class DoorDataResolver(DataResolver[DoorInformation], JsonMessageReceiver):
     def __init__(self, topic: str) -> None:
         self.data = DoorInformation(
             status=DoorStatus.UNKNOWN,
@@ -26,21 +25,15 @@ class DoorDataResolver(DataResolver[DoorInformation], MqttMessageReceiver):
         )
         self.topic = topic
 
-    async def maybe_refresh(self, now: float) -> None:
-        return
+    def topic_filters(self) -> list[str]:
+        return [self.topic]
 
-    async def subscribe_to_topics(self, client: Client) -> None:
-        await client.subscribe(self.topic)
-
-    async def handle_message(self, message: Message) -> bool:
+    async def handle_json(self, message: Message, payload: Any) -> bool:
         if str(message.topic) != self.topic:
             return False
-        if not isinstance(message.payload, bytes):
-            return False
 
         assert self.data is not None
 
-        payload = json.loads(message.payload)
         timestamp = datetime.datetime.strptime(payload.get("timestamp"), '%Y-%m-%d %H:%M:%S.%f%z')
         state: Literal["closed"] | Literal["open"] = payload.get("state")
 
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from service import Service
+from typing import Protocol
+import aiohttp
+import hashlib
+import json
+import os
+import os.path
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+
+@dataclass
+class FetchResult:
+    body: bytes
+    # False when the server reported the resource unchanged since it was cached, or when the body came from the cache
+    # without contacting the server.
+    modified: bool
+
+# Receives a response body as it arrives (see HttpClient.fetch_stream).
+class StreamTransform(Protocol):
+    def feed(self, chunk: bytes) -> None: ...
+    def finish(self) -> bytes: ...
+
+# The last response body and its validators for each URL, kept in memory and (when a directory is given) on disk so
+# that they survive a restart.  Files are named by a hash of the URL, as URLs may contain credentials.
+class HttpCache(object):
+    def __init__(self, directory: str | None) -> None:
+        self.directory = directory
+        self.entries: dict[str, CachedResponse] = {}
+        if directory is not None:
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError as e:
+                print("Unable to create HTTP cache directory; caching in memory only", directory, e)
+                self.directory = None
+
+    def path(self, url: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest())
+
+    def get(self, url: str) -> CachedResponse | None:
+        entry = self.entries.get(url)
+        if entry is None and self.directory is not None:
+            path = self.path(url)
+            try:
+                with open(path + ".json") as f:
+                    meta = json.load(f)
+                with open(path + ".body", "rb") as body:
+                    entry = CachedResponse(body=body.read(), etag=meta.get("etag"), last_modified=meta.get("last_modified"))
+                self.entries[url] = entry
+            except (OSError, ValueError):
+                return None
+        return entry
+
+    def put(self, url: str, entry: CachedResponse) -> None:
+        self.entries[url] = entry
+        if self.directory is None:
+            return
+        path = self.path(url)
+        try:
+            # Body first, so that validators are never stored alongside a stale body.
+            for (suffix, content) in ((".body", entry.body), (".json", json.dumps({"etag": entry.etag, "last_modified": entry.last_modified}).encode())):
+                with open(path + suffix + ".tmp", "wb") as f:
+                    f.write(content)
+                os.replace(path + suffix + ".tmp", path + suffix)
+        except OSError as e:
+            print("Unable to write HTTP cache entry", e)
+
+# One aiohttp ClientSession shared by every data resolver that polls over HTTP.  Connections are kept alive between
+# polls (keepalive_timeout should exceed the longest regular poll interval for the connection to be reused), and DNS
+# results are cached.
+class HttpClient(Service):
+    def __init__(self,
+        limit: int = 10,
+        limit_per_host: int = 2,
+        keepalive_timeout: float = 120,
+        timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=60, connect=10),
+        cache: HttpCache | None = None) -> None:
+        super().__init__()
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.cache = cache if cache is not None else HttpCache(directory=None)
+        self._session: aiohttp.ClientSession | None = None
+
+    # The session is created on first use, as it must be created within the running event loop.
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    # GET url, revalidating any cached copy with If-None-Match / If-Modified-Since.
+    async def fetch(self, url: str) -> FetchResult:
+        return await self.fetch_stream(url, None)
+
+    # Like fetch, but the body is passed through transform as it arrives rather than being buffered whole; for large
+    # resources of which only a small part is needed.  The transformed body is what's cached and returned when the
+    # resource is unchanged, so a transform must only drop content that later transforms of the URL would also drop.
+    async def fetch_stream(self, url: str, transform: StreamTransform | None, chunk_size: int = 65536) -> FetchResult:
+        cached = self.cache.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.etag is not None:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified is not None:
+                headers["If-Modified-Since"] = cached.last_modified
+        async with self.session().get(url, headers=headers) as response:
+            if response.status == 304 and cached is not None:
+                return FetchResult(body=cached.body, modified=False)
+            if response.status != 200:
+                raise Exception(f"Unexpected status code: {response.status}")
+            if transform is None:
+                body = await response.read()
+            else:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    transform.feed(chunk)
+                body = transform.finish()
+        self.cache.put(url, CachedResponse(body=body, etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified")))
+        return FetchResult(body=body, modified=True)
+
+    # The cached body for url, if any, without contacting the server; eg. to display something immediately at startup.
+    def cached(self, url: str) -> FetchResult | None:
+        entry = self.cache.get(url)
+        return FetchResult(body=entry.body, modified=False) if entry is not None else None
+
+    async def stop(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,116 @@
+from typing import Any
+import bisect
+import datetime
+import hashlib
+import icalendar
+import recurring_ical_events # type: ignore
+
+# (sort key, DTSTART value, SUMMARY) for one occurrence of an event.  The sort key is DTSTART as an aware datetime;
+# all-day events are keyed by local midnight.
+Occurrence = tuple[datetime.datetime, datetime.date, str]
+
+def sort_key(dtstart: datetime.date) -> datetime.datetime:
+    if isinstance(dtstart, datetime.datetime):
+        return dtstart if dtstart.tzinfo is not None else dtstart.astimezone()
+    return datetime.datetime.combine(dtstart, datetime.time()).astimezone()
+
+# All of the VEVENTs that share a UID (a recurring event and its modified occurrences), which must be expanded
+# together, and their expanded occurrences between window_start and window_end.
+class EventGroup(object):
+    def __init__(self, digest: str, calendar: icalendar.Calendar) -> None:
+        self.digest = digest
+        self.calendar = calendar
+        self.occurrences: list[Occurrence] = []
+        self.window_start: datetime.datetime | None = None
+        self.window_end: datetime.datetime | None = None
+
+    def expand(self, start: datetime.datetime, end: datetime.datetime) -> None:
+        seen = set((occurrence[1], occurrence[2]) for occurrence in self.occurrences)
+        for event in recurring_ical_events.of(self.calendar).between(start, end):
+            dtstart = event.get("dtstart").dt
+            summary = str(event.get("SUMMARY"))
+            if (dtstart, summary) in seen:
+                # Occurrences spanning the boundary between two expansions are returned by both.
+                continue
+            seen.add((dtstart, summary))
+            self.occurrences.append((sort_key(dtstart), dtstart, summary))
+        self.occurrences.sort(key=lambda occurrence: occurrence[0])
+        if self.window_start is None or start < self.window_start:
+            self.window_start = start
+        if self.window_end is None or end > self.window_end:
+            self.window_end = end
+
+    def prune(self, before: datetime.datetime) -> None:
+        keys = [occurrence[0] for occurrence in self.occurrences]
+        self.occurrences = self.occurrences[bisect.bisect_left(keys, before):]
+        if self.window_start is not None and self.window_start < before:
+            self.window_start = before
+
+# Sorted index of event occurrences over a rolling window, maintained incrementally:
+#   - events are grouped by UID and each group is hashed, so that when the calendar changes only the groups that
+#     changed are expanded again;
+#   - each group is expanded `margin` beyond the window, and when the window moves past that, only the newly uncovered
+#     span is expanded.
+class OccurrenceIndex(object):
+    def __init__(self,
+        window: datetime.timedelta = datetime.timedelta(days=14),
+        margin: datetime.timedelta = datetime.timedelta(days=7),
+        lookbehind: datetime.timedelta = datetime.timedelta(days=1)) -> None:
+        self.window = window
+        self.margin = margin
+        # Occurrences that started up to this long ago are kept, as all-day and multi-day events can still be current.
+        self.lookbehind = lookbehind
+        self.groups: dict[str, EventGroup] = {}
+        self.index: list[Occurrence] | None = None
+        self.expansions = 0
+
+    def update(self, calendar: icalendar.Calendar) -> None:
+        timezones = [component for component in calendar.walk("VTIMEZONE")]
+        timezones_digest = hashlib.sha256(b"".join(tz.to_ical() for tz in timezones)).hexdigest()
+
+        events_by_uid: dict[str, list[Any]] = {}
+        for event in calendar.walk("VEVENT"):
+            content = event.to_ical()
+            uid = str(event.get("UID", hashlib.sha256(content).hexdigest()))
+            events_by_uid.setdefault(uid, []).append((content, event))
+
+        groups: dict[str, EventGroup] = {}
+        for uid, events in events_by_uid.items():
+            digest = hashlib.sha256(timezones_digest.encode() + b"".join(sorted(content for content, _ in events))).hexdigest()
+            group = self.groups.get(uid)
+            if group is None or group.digest != digest:
+                group_calendar = icalendar.Calendar()
+                for tz in timezones:
+                    group_calendar.add_component(tz)
+                for _, event in events:
+                    group_calendar.add_component(event)
+                group = EventGroup(digest, group_calendar)
+                self.index = None
+            groups[uid] = group
+        if groups.keys() != self.groups.keys():
+            self.index = None
+        self.groups = groups
+
+    # All occurrences overlapping [now - lookbehind, now + window), sorted by start.
+    def occurrences(self, now: datetime.datetime) -> list[Occurrence]:
+        start = now - self.lookbehind
+        end = now + self.window
+        for group in self.groups.values():
+            if group.window_start is None or group.window_end is None or group.window_start > start:
+                group.occurrences = []
+                group.window_start = group.window_end = None
+                group.expand(start, end + self.margin)
+                self.expansions += 1
+                self.index = None
+            elif group.window_end < end:
+                group.expand(group.window_end, end + self.margin)
+                self.expansions += 1
+                self.index = None
+
+        if self.index is None:
+            for group in self.groups.values():
+                group.prune(start)
+            self.index = sorted((occurrence for group in self.groups.values() for occurrence in group.occurrences), key=lambda occurrence: occurrence[0])
+
+        keys = [occurrence[0] for occurrence in self.index]
+        return self.index[bisect.bisect_left(keys, start):bisect.bisect_left(keys, end)]
@@ -0,0 +1,72 @@
+import datetime
+import re
+
+# Properties that make an event recur, so that it can have occurrences after its own DTSTART/DTEND.
+RECURRENCE_PROPERTIES = (b"RRULE", b"RDATE")
+# Properties whose dates must all be in the past for an event to be discarded.  RECURRENCE-ID is included so that an
+# override moving a future occurrence into the past is kept, as dropping it would bring the original occurrence back.
+DATE_PROPERTIES = (b"DTSTART", b"DTEND", b"RECURRENCE-ID")
+FOLD = re.compile(rb"\r?\n[ \t]")
+
+# Filters an iCal feed as it arrives, chunk by chunk, without parsing it into a tree: VEVENTs are tokenized one at a
+# time, and non-recurring events which ended before `before` are discarded.  Everything else (the calendar's
+# properties, VTIMEZONEs, and candidate events) is passed through verbatim, so the result is a much smaller calendar
+# that parses to the same upcoming events.  The decision is made on dates only, so `before` should allow a day or so
+# for time zones.
+class IcalEventFilter(object):
+    def __init__(self, before: datetime.date) -> None:
+        self.before = before.strftime("%Y%m%d").encode()
+        self.output: list[bytes] = []
+        # Incomplete line at the end of the last chunk
+        self.pending = b""
+        # Lines of the VEVENT being read, if any
+        self.event: list[bytes] | None = None
+        self.kept = 0
+        self.discarded = 0
+
+    def feed(self, chunk: bytes) -> None:
+        lines = (self.pending + chunk).split(b"\n")
+        self.pending = lines.pop()
+        for line in lines:
+            self.line(line + b"\n")
+
+    def finish(self) -> bytes:
+        if self.pending:
+            self.line(self.pending)
+            self.pending = b""
+        if self.event is not None:
+            # Truncated feed; leave it to the parser to complain.
+            self.output.extend(self.event)
+            self.event = None
+        return b"".join(self.output)
+
+    def line(self, line: bytes) -> None:
+        if self.event is None:
+            if line.rstrip().upper() == b"BEGIN:VEVENT":
+                self.event = [line]
+            else:
+                self.output.append(line)
+            return
+        self.event.append(line)
+        if line.rstrip().upper() == b"END:VEVENT":
+            if self.is_candidate(b"".join(self.event)):
+                self.output.extend(self.event)
+                self.kept += 1
+            else:
+                self.discarded += 1
+            self.event = None
+
+    def is_candidate(self, event: bytes) -> bool:
+        dates = []
+        for line in FOLD.sub(b"", event).splitlines():
+            (name, _, value) = line.partition(b":")
+            name = name.split(b";", 1)[0].upper()
+            if name in RECURRENCE_PROPERTIES:
+                return True
+            if name in DATE_PROPERTIES:
+                date = value.strip()[:8]
+                if len(date) != 8 or not date.isdigit():
+                    return True
+                dates.append(date)
+        # Dates are YYYYMMDD, so they compare as strings.
+        return len(dates) == 0 or max(dates) >= self.before
@@ -25,12 +25,12 @@
 # mode: single
 
 from .resolver import DataResolver
-from aiomqtt import Client, Message
+from aiomqtt import Message
 from dataclasses import dataclass
 from enum import Enum, auto
-from mqtt import MqttMessageReceiver
+from mqtt import JsonMessageReceiver
+from typing import Any
 import datetime
-import json
 import pytz
 
 class MediaPlayerState(Enum):
@@ -68,25 +68,18 @@ class MediaPlayerInformation:
         return retval
 
 
-class MediaPlayerDataResolver(DataResolver[MediaPlayerInformation], MqttMessageReceiver):
+class MediaPlayerDataResolver(DataResolver[MediaPlayerInformation], JsonMessageReceiver):
     def __init__(self, topic: str | None) -> None:
         self.data = MediaPlayerInformation(state=MediaPlayerState.UNKNOWN, updated_at=None, media_position=None, media_duration=None)
         self.topic = topic
 
-    async def maybe_refresh(self, now: float) -> None:
-        return
+    def topic_filters(self) -> list[str]:
+        return [self.topic] if self.topic is not None else []
 
-    async def subscribe_to_topics(self, client: Client) -> None:
-        if self.topic is not None:
-            await client.subscribe(self.topic)
-
-    async def handle_message(self, message: Message) -> bool:
+    async def handle_json(self, message: Message, payload: Any) -> bool:
         if str(message.topic) != self.topic:
             return False
-        if not isinstance(message.payload, bytes):
-            return False
 
-        payload = json.loads(message.payload)
         match payload.get("state"):
             case "playing":
                 media_player_state = MediaPlayerState.PLAYING
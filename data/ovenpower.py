@@ -1,9 +1,9 @@
 from .resolver import DataResolver
-from aiomqtt import Client, Message
+from aiomqtt import Message
 from dataclasses import dataclass
 from enum import Enum, auto
-from mqtt import MqttMessageReceiver
-import json
+from mqtt import JsonMessageReceiver
+from typing import Any
 
 class OvenStatus(Enum):
     UNKNOWN = auto()
@@ -21,23 +21,17 @@ class OvenInformation:
 # The goal would be that if the clock restarts when the oven is on, it should continue to display
 # that state.
 
-class OvenOnDataResolver(DataResolver[OvenInformation], MqttMessageReceiver):
+class OvenOnDataResolver(DataResolver[OvenInformation], JsonMessageReceiver):
     def __init__(self) -> None:
         self.data = OvenInformation(status=OvenStatus.UNKNOWN)
         self.topic = "prometheus/alerts/OvenPoweredOn"
 
-    async def maybe_refresh(self, now: float) -> None:
-        return
+    def topic_filters(self) -> list[str]:
+        return [self.topic]
 
-    async def subscribe_to_topics(self, client: Client) -> None:
-        await client.subscribe(self.topic)
-
-    async def handle_message(self, message: Message) -> bool:
+    async def handle_json(self, message: Message, payload: Any) -> bool:
         if str(message.topic) != self.topic:
             return False
-        if not isinstance(message.payload, bytes):
-            return False
-        payload = json.loads(message.payload)
         alert_status = payload.get("status")
         if alert_status == "firing":
             self.data = OvenInformation(status=OvenStatus.ON)
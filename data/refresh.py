@@ -0,0 +1,87 @@
+from .resolver import DataResolver, ScheduledDataResolver
+from service import Service
+from typing import Any, Callable, TYPE_CHECKING
+import asyncio
+import heapq
+import itertools
+import random
+import time
+
+if TYPE_CHECKING:
+    from displaybase import DisplayBase
+
+# Refreshes every ScheduledDataResolver from a single task, which sleeps until the earliest refresh is due; resolvers
+# that are pushed their data (eg. over MQTT) are never touched.  Each resolver decides its next delay, backing off after
+# failures (see ScheduledDataResolver.next_refresh_delay); every delay is stretched by up to `jitter` (a fraction;
+# always longer, so that refresh_interval is never undercut) so that resolvers drift apart.
+class RefreshScheduler(Service):
+    # clock is monotonic, in seconds, and can be replaced to test scheduling without waiting.
+    def __init__(self, data_resolvers: list[DataResolver[Any]], jitter: float = 0.2, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__()
+        self.resolvers: list[ScheduledDataResolver[Any]] = [data for data in data_resolvers if isinstance(data, ScheduledDataResolver)]
+        self.jitter = jitter
+        self.clock = clock
+        # (due, sequence, resolver), by self.clock; a resolver is either in the queue or being refreshed.
+        self.queue: list[tuple[float, int, ScheduledDataResolver[Any]]] = []
+        self.sequence = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task[None] | None = None
+        self.refreshes: set[asyncio.Task[None]] = set()
+
+    async def start(self, clock: "DisplayBase") -> None:
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        tasks = list(self.refreshes) + ([self.task] if self.task is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.task = None
+
+    def delay(self, resolver: ScheduledDataResolver[Any]) -> float:
+        return resolver.next_refresh_delay() * (1 + random.random() * self.jitter)
+
+    def schedule(self, resolver: ScheduledDataResolver[Any], delay: float) -> None:
+        heapq.heappush(self.queue, (self.clock() + delay, next(self.sequence), resolver))
+        self.wakeup.set()
+
+    # Removes the resolvers that are due from the queue, returning them and the number of seconds until the next one
+    # is (None if the queue is then empty).
+    def take_due(self) -> tuple[list[ScheduledDataResolver[Any]], float | None]:
+        now = self.clock()
+        due = []
+        while len(self.queue) > 0 and self.queue[0][0] <= now:
+            due.append(heapq.heappop(self.queue)[2])
+        return (due, self.queue[0][0] - now if len(self.queue) > 0 else None)
+
+    async def run(self) -> None:
+        # Everything is refreshed immediately at startup.
+        for resolver in self.resolvers:
+            self.schedule(resolver, 0)
+        while True:
+            self.wakeup.clear()
+            (due, timeout) = self.take_due()
+            for resolver in due:
+                # Refreshes run concurrently, so that one slow resolver doesn't hold up the others.
+                task = asyncio.create_task(self.refresh(resolver))
+                self.refreshes.add(task)
+                task.add_done_callback(self.refreshes.discard)
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    async def refresh(self, resolver: ScheduledDataResolver[Any]) -> None:
+        async with resolver.lock:
+            await resolver.refresh()
+        self.schedule(resolver, self.delay(resolver))
+
+    # Refresh counters and staleness of each resolver, by class name.
+    def report(self) -> dict[str, Any]:
+        report = {}
+        for resolver in self.resolvers:
+            name = type(resolver).__name__
+            if name in report:
+                name = f"{name}#{self.resolvers.index(resolver)}"
+            report[name] = dict(resolver.stats.report(), stale_since=resolver.stale_since)
+        return report
@@ -1,50 +1,134 @@
-from typing import TypeVar, Generic
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, TypeVar, Generic
 import asyncio
-import random
+import time
 import traceback
 
 T = TypeVar('T')
+R = TypeVar('R')
 
+# Holds the latest value of some data, in `data`.  Every time a structurally different value (by ==) is stored,
+# `version` is incremented and subscribers are notified, so that consumers can skip work while the data is unchanged.
 class DataResolver(Generic[T]):
+    # Class-level defaults, as not every subclass calls __init__ before storing data.
+    _data: None | T = None
+    version = 0
+    _subscribers: list[Callable[["DataResolver[T]"], None]] | None = None
+
     def __init__(self) -> None:
-        self.data: None | T = None
+        self.data = None
+
+    @property
+    def data(self) -> None | T:
+        return self._data
+
+    @data.setter
+    def data(self, value: None | T) -> None:
+        if value == self._data:
+            return
+        self._data = value
+        self.version += 1
+        if self._subscribers is not None:
+            for subscriber in self._subscribers:
+                subscriber(self)
+
+    # Call subscriber(resolver) whenever the data changes.
+    def subscribe(self, subscriber: Callable[["DataResolver[T]"], None]) -> None:
+        if self._subscribers is None:
+            self._subscribers = []
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Callable[["DataResolver[T]"], None]) -> None:
+        if self._subscribers is not None:
+            self._subscribers.remove(subscriber)
+
+@dataclass
+class RefreshStats:
+    successes: int = 0
+    failures: int = 0
+    # Failures since the last success
+    consecutive_failures: int = 0
+    # Collection latency, in seconds
+    last_latency: float | None = None
+    max_latency: float = 0
+    total_latency: float = 0
 
-    async def maybe_refresh(self, now: float) -> None:
-        return
+    def report(self) -> dict[str, Any]:
+        report = asdict(self)
+        attempts = self.successes + self.failures
+        report["mean_latency"] = self.total_latency / attempts if attempts > 0 else None
+        return report
 
+# Polls for its data every refresh_interval seconds; see RefreshScheduler.  When a collection fails, the last good data
+# is kept (stale-while-revalidate) and the collection is retried sooner, backing off exponentially from min_retry up to
+# refresh_interval, so that a failing endpoint isn't hammered.
 class ScheduledDataResolver(DataResolver[T]):
-    def __init__(self, refresh_interval: float) -> None:
-        jitter_frac = 1 + (random.random() * 0.2) # always jitter longer so we don't drop below refresh_interval
-        self.refresh_interval = (refresh_interval * jitter_frac)
-        self.last_refresh: float = 0
+    # executor, if provided, runs the CPU-bound steps of collection (see run_cpu_bound) off of the event loop, so that
+    # drawing frames isn't stalled while they run.
+    def __init__(self, refresh_interval: float, executor: Executor | None = None, min_retry: float = 30) -> None:
+        self.refresh_interval = refresh_interval
+        self.min_retry = min_retry
         self.lock = asyncio.Lock()
-        self.data: None | T = None
+        self.data = None
+        self.executor = executor
+        self.stats = RefreshStats()
+        # When self.data was last known to be current, if a collection has failed since; None while it's fresh.
+        self.stale_since: float | None = None
 
-    async def maybe_refresh(self, now: float) -> None:
-        delta = now - self.last_refresh
-        if delta > self.refresh_interval:
-            try:
-                await asyncio.wait_for(self.lock.acquire(), timeout=0.0000001)
-                try:
-                    await self.refresh()
-                    self.last_refresh = now
-                finally:
-                    self.lock.release()
-            except TimeoutError:
-                pass
+    # Run fn(*args) in self.executor, or directly if there isn't one.  With a process pool, fn must be a module-level
+    # function and its arguments and result must be picklable; keep them compact, as they're copied between processes.
+    async def run_cpu_bound(self, fn: Callable[..., R], *args: Any) -> R:
+        if self.executor is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
 
     async def do_collection(self) -> None | T:
         raise NotImplementedError
 
-    async def refresh(self) -> None:
+    # Data to display until the first collection completes, eg. from a persistent cache; None if there isn't any.
+    async def cached_data(self) -> None | T:
+        return None
+
+    # Seconds until the next refresh is due, given the outcome of the last one.
+    def next_refresh_delay(self) -> float:
+        if self.stats.consecutive_failures == 0:
+            return self.refresh_interval
+        return min(self.min_retry * (1 << min(self.stats.consecutive_failures - 1, 16)), self.refresh_interval)
+
+    # Returns whether the collection succeeded.
+    async def refresh(self) -> bool:
+        if self.data is None:
+            try:
+                self.data = await self.cached_data()
+            except:
+                print("cached_data error occurred")
+                traceback.print_exc()
+        start = time.monotonic()
         try:
             cr = self.do_collection()
             self.data = await cr
+            succeeded = True
         except:
             # FIXME: log error
             print("do_collection error occurred")
             traceback.print_exc()
-            self.data = None
+            succeeded = False
+        latency = time.monotonic() - start
+
+        self.stats.last_latency = latency
+        self.stats.max_latency = max(self.stats.max_latency, latency)
+        self.stats.total_latency += latency
+        if succeeded:
+            self.stats.successes += 1
+            self.stats.consecutive_failures = 0
+            self.stale_since = None
+        else:
+            self.stats.failures += 1
+            self.stats.consecutive_failures += 1
+            if self.stale_since is None:
+                self.stale_since = time.time()
+        return succeeded
 
 
 class StaticDataResolver(DataResolver[T]):
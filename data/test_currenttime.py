@@ -0,0 +1,27 @@
+from .currenttime import CurrentTimeDataResolver
+import datetime
+import pytz
+
+def test_frame_is_shared_while_frozen() -> None:
+    now = [1697000000.0]
+    current_time = CurrentTimeDataResolver(time_source=lambda: now[0], display_tz=pytz.timezone("America/Toronto"))
+    current_time.freeze_time()
+    frame = current_time.frame
+    now[0] += 3600
+    assert current_time.frame is frame
+    assert current_time.data == frame.timestamp == 1697000000.0
+    assert frame.utc == datetime.datetime(2023, 10, 11, 4, 53, 20, tzinfo=pytz.utc)
+    assert frame.local.hour == 0
+    assert frame.date == datetime.date(2023, 10, 11)
+
+    calls: list[str] = []
+    def derive() -> str:
+        calls.append("called")
+        return "value"
+    assert frame.cached("key", derive) == frame.cached("key", derive) == "value"
+    assert len(calls) == 1
+    assert frame.strftime("%a %-I:%M") == "Wed 12:53"
+
+    current_time.release_time()
+    assert current_time.frame is not frame
+    assert current_time.frame.timestamp == now[0]
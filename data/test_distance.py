@@ -1,7 +1,9 @@
 from .distance import DistanceDataResolver, haversine_distance
+from component.distance import DistanceComponent
 from aiomqtt import Client, Message
 from unittest.mock import Mock
 import json
+import os.path
 import pytest
 
 # Fixture for mock client
@@ -69,3 +71,17 @@ def test_haversine_distance() -> None:
     # Expected value is roughly 3931 km.
     distance = haversine_distance(40.730610, -73.935242, 34.0522, -118.2437)
     assert 3900 <= distance <= 4000
+
+@pytest.mark.asyncio
+async def test_new_position_is_versioned(mock_message: Mock) -> None:
+    resolver = DistanceDataResolver(0, 0, "homeassistant/output/location/mathieu")
+    text = DistanceComponent.DistanceText(resolver, os.path.join(os.path.dirname(__file__), "..", "fonts"), "Mathieu")
+    versions = []
+    texts = []
+    for latitude in (0.5, 1.0):
+        mock_message.payload = json.dumps({"latitude": latitude, "longitude": 0}).encode()
+        assert await resolver.handle_message(mock_message)
+        versions.append(resolver.version)
+        texts.append(text.inner_get_text())
+    assert versions[1] > versions[0]
+    assert texts == ["Mathieu - 55.6km", "Mathieu - 111.2km"]
@@ -0,0 +1,90 @@
+from .httpclient import HttpCache, HttpClient
+from .purpleair import PurpleAirDataResolver
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from typing import AsyncIterator
+import pytest
+import pytest_asyncio
+
+@pytest_asyncio.fixture
+async def purpleair_server() -> AsyncIterator[tuple[TestServer, list[object]]]:
+    peers: list[object] = []
+    async def handler(request: web.Request) -> web.Response:
+        assert request.transport is not None
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({
+            "p25aqic": "rgb(87,237,0)",
+            "pm2.5_aqi": 35,
+            "pm2.5_aqi_b": 30,
+            "current_temp_f": 62,
+        })
+    app = web.Application()
+    app.router.add_get("/json", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield (server, peers)
+    await server.close()
+
+@pytest.mark.asyncio
+async def test_session_is_shared() -> None:
+    http_client = HttpClient()
+    assert http_client.session() is http_client.session()
+    await http_client.stop()
+
+@pytest.mark.asyncio
+async def test_connection_is_reused_between_polls(purpleair_server: tuple[TestServer, list[object]]) -> None:
+    server, peers = purpleair_server
+    http_client = HttpClient()
+    resolver = PurpleAirDataResolver(url=str(server.make_url("/json")), http_client=http_client)
+    first = await resolver.do_collection()
+    second = await resolver.do_collection()
+    await http_client.stop()
+
+    assert first["p25aqic"] == (87, 237, 0)
+    assert second["p25aqiavg"] == 32.5
+    assert len(peers) == 2
+    assert peers[0] == peers[1]
+
+@pytest_asyncio.fixture
+async def etag_server() -> AsyncIterator[tuple[TestServer, list[str | None]]]:
+    conditional_headers: list[str | None] = []
+    async def handler(request: web.Request) -> web.Response:
+        conditional_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=b"BEGIN:VCALENDAR", headers={"ETag": '"v1"', "Last-Modified": "Mon, 15 Jan 2024 08:00:00 GMT"})
+    app = web.Application()
+    app.router.add_get("/calendar.ics", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield (server, conditional_headers)
+    await server.close()
+
+@pytest.mark.asyncio
+async def test_conditional_fetch(etag_server: tuple[TestServer, list[str | None]]) -> None:
+    server, conditional_headers = etag_server
+    http_client = HttpClient()
+    url = str(server.make_url("/calendar.ics"))
+    first = await http_client.fetch(url)
+    second = await http_client.fetch(url)
+    await http_client.stop()
+
+    assert (first.body, first.modified) == (b"BEGIN:VCALENDAR", True)
+    assert (second.body, second.modified) == (b"BEGIN:VCALENDAR", False)
+    assert conditional_headers == [None, '"v1"']
+
+@pytest.mark.asyncio
+async def test_disk_cache_survives_restart(etag_server: tuple[TestServer, list[str | None]], tmp_path: str) -> None:
+    server, conditional_headers = etag_server
+    url = str(server.make_url("/calendar.ics"))
+    http_client = HttpClient(cache=HttpCache(directory=str(tmp_path)))
+    await http_client.fetch(url)
+    await http_client.stop()
+
+    restarted = HttpClient(cache=HttpCache(directory=str(tmp_path)))
+    cached = restarted.cached(url)
+    assert cached is not None and cached.body == b"BEGIN:VCALENDAR"
+    result = await restarted.fetch(url)
+    await restarted.stop()
+    assert not result.modified
+    assert conditional_headers == [None, '"v1"']
@@ -0,0 +1,117 @@
+from .calendar import CalendarDataResolver, upcoming_events
+from .httpclient import HttpClient
+from .icalindex import OccurrenceIndex
+import concurrent.futures
+import datetime
+import icalendar
+import pytest
+import pytz
+
+ICAL = b"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//test//EN
+BEGIN:VTIMEZONE
+TZID:America/Edmonton
+BEGIN:STANDARD
+DTSTART:19701101T020000
+RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU
+TZOFFSETFROM:-0600
+TZOFFSETTO:-0700
+END:STANDARD
+BEGIN:DAYLIGHT
+DTSTART:19700308T020000
+RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU
+TZOFFSETFROM:-0700
+TZOFFSETTO:-0600
+END:DAYLIGHT
+END:VTIMEZONE
+BEGIN:VEVENT
+UID:swim
+SUMMARY:Swimming
+DTSTART;TZID=America/Edmonton:20230102T170000
+DTEND;TZID=America/Edmonton:20230102T180000
+RRULE:FREQ=WEEKLY;BYDAY=MO,TH
+EXDATE;TZID=America/Edmonton:20240118T170000
+END:VEVENT
+BEGIN:VEVENT
+UID:swim
+SUMMARY:Swimming (late)
+RECURRENCE-ID;TZID=America/Edmonton:20240122T170000
+DTSTART;TZID=America/Edmonton:20240122T190000
+DTEND;TZID=America/Edmonton:20240122T200000
+END:VEVENT
+BEGIN:VEVENT
+UID:garbage
+SUMMARY:Garbage day
+DTSTART;VALUE=DATE:20230104
+RRULE:FREQ=WEEKLY;BYDAY=WE
+END:VEVENT
+BEGIN:VEVENT
+UID:dentist
+SUMMARY:Dentist
+DTSTART:20240119T163000Z
+DTEND:20240119T170000Z
+END:VEVENT
+BEGIN:VEVENT
+UID:trip
+SUMMARY:Trip
+DTSTART;VALUE=DATE:20240126
+DTEND;VALUE=DATE:20240129
+END:VEVENT
+END:VCALENDAR
+"""
+
+START = datetime.datetime(2024, 1, 15, 15, 0, tzinfo=pytz.utc)
+
+DISPLAY_TZ = pytz.timezone("America/Edmonton")
+
+def test_matches_full_expansion_as_window_rolls() -> None:
+    incremental_feed = full_feed = None
+    for hours in range(0, 24 * 30, 7):
+        now = START + datetime.timedelta(hours=hours)
+        (incremental_feed, incremental_events) = upcoming_events(incremental_feed, ICAL, DISPLAY_TZ, now, incremental=True)
+        (full_feed, full_events) = upcoming_events(full_feed, ICAL, DISPLAY_TZ, now, incremental=False)
+        assert incremental_events == full_events, now
+    assert len(upcoming_events(None, ICAL, DISPLAY_TZ, START)[1]["future_events"]) > 0
+
+@pytest.mark.asyncio
+async def test_parses_in_process_pool() -> None:
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+        resolver = CalendarDataResolver(ical_url="http://localhost/pool.ics", display_tz=DISPLAY_TZ, http_client=HttpClient(), executor=executor)
+        pooled = await resolver.parse(ICAL, START)
+        # The feed comes back from the worker, and is reused for the next parse
+        assert resolver.feed is not None and resolver.feed.occurrence_index is not None
+        assert await resolver.parse(ICAL, START) == pooled
+    assert pooled == upcoming_events(None, ICAL, DISPLAY_TZ, START)[1]
+
+@pytest.mark.asyncio
+async def test_resolvers_keep_their_own_feed() -> None:
+    resolvers = [CalendarDataResolver(ical_url="http://localhost/same.ics", display_tz=DISPLAY_TZ, http_client=HttpClient()) for _ in range(2)]
+    await resolvers[0].parse(ICAL, START)
+    assert resolvers[0].feed is not None and resolvers[1].feed is None
+
+def test_only_changed_events_are_reexpanded() -> None:
+    index = OccurrenceIndex()
+    index.update(icalendar.Calendar.from_ical(ICAL))
+    index.occurrences(START)
+    assert index.expansions == 4
+
+    # Unchanged calendar, window still within the expanded margin
+    index.update(icalendar.Calendar.from_ical(ICAL))
+    index.occurrences(START + datetime.timedelta(days=1))
+    assert index.expansions == 4
+
+    index.update(icalendar.Calendar.from_ical(ICAL.replace(b"SUMMARY:Dentist", b"SUMMARY:Orthodontist")))
+    occurrences = index.occurrences(START + datetime.timedelta(days=1))
+    assert index.expansions == 5
+    assert "Orthodontist" in [summary for (_, _, summary) in occurrences]
+
+def test_window_rolls_forward_incrementally() -> None:
+    index = OccurrenceIndex(window=datetime.timedelta(days=14), margin=datetime.timedelta(days=7))
+    index.update(icalendar.Calendar.from_ical(ICAL))
+    index.occurrences(START)
+    index.occurrences(START + datetime.timedelta(days=8))
+    # every group was extended once, rather than re-expanded from scratch
+    assert index.expansions == 8
+    swims = [occurrence for occurrence in index.occurrences(START + datetime.timedelta(days=8)) if occurrence[2].startswith("Swimming")]
+    assert len(swims) == len(set(swims))
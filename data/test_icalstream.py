@@ -0,0 +1,99 @@
+from .calendar import upcoming_events
+from .httpclient import HttpClient
+from .icalstream import IcalEventFilter
+from .test_icalindex import DISPLAY_TZ, ICAL, START
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from typing import Iterator
+import datetime
+import pytest
+import tracemalloc
+
+BEFORE = (START - datetime.timedelta(days=2)).date()
+
+def past_event(i: int) -> bytes:
+    day = datetime.date(2020, 1, 1) + datetime.timedelta(days=i % 1400)
+    return (
+        b"BEGIN:VEVENT\r\n"
+        b"UID:past-%d\r\n"
+        b"SUMMARY:Past meeting %d with a long description that gets folded across line\r\n"
+        b"  boundaries like real feeds do\r\n"
+        b"DTSTART:%sT170000Z\r\n"
+        b"DTEND:%sT180000Z\r\n"
+        b"END:VEVENT\r\n"
+    ) % (i, i, day.strftime("%Y%m%d").encode(), day.strftime("%Y%m%d").encode())
+
+# ICAL with `count` past, non-recurring events inserted before its own events.
+def big_feed(count: int) -> Iterator[bytes]:
+    (header, events) = ICAL.split(b"BEGIN:VEVENT", 1)
+    yield header
+    for i in range(count):
+        yield past_event(i)
+    yield b"BEGIN:VEVENT" + events
+
+def filtered(chunks: Iterator[bytes], chunk_size: int) -> tuple[IcalEventFilter, bytes]:
+    event_filter = IcalEventFilter(before=BEFORE)
+    data = b"".join(chunks)
+    for i in range(0, len(data), chunk_size):
+        event_filter.feed(data[i:i + chunk_size])
+    return (event_filter, event_filter.finish())
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_filtered_feed_has_same_upcoming_events(chunk_size: int) -> None:
+    (event_filter, body) = filtered(big_feed(200), chunk_size)
+    assert (event_filter.kept, event_filter.discarded) == (5, 200)
+    for days in (0, 1, 5):
+        now = START + datetime.timedelta(days=days)
+        assert upcoming_events(None, body, DISPLAY_TZ, now)[1] == upcoming_events(None, ICAL, DISPLAY_TZ, now)[1]
+
+def test_keeps_overrides_of_future_occurrences() -> None:
+    override = (
+        b"BEGIN:VCALENDAR\r\n"
+        b"BEGIN:VEVENT\r\nUID:x\r\nRECURRENCE-ID:20240125T170000Z\r\nDTSTART:20240101T170000Z\r\nEND:VEVENT\r\n"
+        b"BEGIN:VEVENT\r\nUID:y\r\nDTSTART;VALUE=DATE:20240101\r\nDTEND;VALUE=DATE:20240301\r\nEND:VEVENT\r\n"
+        b"END:VCALENDAR\r\n"
+    )
+    event_filter = IcalEventFilter(before=BEFORE)
+    event_filter.feed(override)
+    assert event_filter.finish() == override
+
+def test_memory_is_bounded_by_candidates() -> None:
+    count = 20000
+    size = sum(len(chunk) for chunk in big_feed(count))
+    tracemalloc.start()
+    event_filter = IcalEventFilter(before=BEFORE)
+    for chunk in big_feed(count):
+        event_filter.feed(chunk)
+    body = event_filter.finish()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert body == ICAL
+    assert peak < size / 10
+
+@pytest.mark.asyncio
+async def test_fetch_stream_caches_filtered_body() -> None:
+    async def handler(request: web.Request) -> web.StreamResponse:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        response = web.StreamResponse(headers={"ETag": '"v1"'})
+        await response.prepare(request)
+        for chunk in big_feed(1000):
+            await response.write(chunk)
+        await response.write_eof()
+        return response
+    app = web.Application()
+    app.router.add_get("/calendar.ics", handler)
+    server = TestServer(app)
+    await server.start_server()
+
+    http_client = HttpClient()
+    url = str(server.make_url("/calendar.ics"))
+    first = await http_client.fetch_stream(url, IcalEventFilter(before=BEFORE))
+    second = await http_client.fetch_stream(url, IcalEventFilter(before=BEFORE))
+    await http_client.stop()
+    await server.close()
+
+    assert first.modified and not second.modified
+    assert first.body == second.body
+    assert b"Past meeting" not in first.body
+    assert b"Swimming" in first.body
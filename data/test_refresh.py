@@ -0,0 +1,112 @@
+from .refresh import RefreshScheduler
+from .resolver import DataResolver, ScheduledDataResolver
+import asyncio
+import pytest
+
+class FlakyResolver(ScheduledDataResolver[int]):
+    def __init__(self, refresh_interval: float, failures: int = 0, min_retry: float = 30) -> None:
+        super().__init__(refresh_interval=refresh_interval, min_retry=min_retry)
+        self.failures = failures
+        self.collections: list[float] = []
+
+    async def do_collection(self) -> int:
+        self.collections.append(asyncio.get_running_loop().time())
+        if self.failures > 0:
+            self.failures -= 1
+            raise Exception("unavailable")
+        return len(self.collections)
+
+class PushResolver(DataResolver[int]):
+    pass
+
+class FakeClock(object):
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.mark.asyncio
+async def test_refreshes_on_interval() -> None:
+    clock = FakeClock()
+    fast = FlakyResolver(refresh_interval=0.05)
+    slow = FlakyResolver(refresh_interval=10)
+    scheduler = RefreshScheduler([fast, PushResolver(), slow], jitter=0, clock=clock)
+    assert scheduler.resolvers == [fast, slow]
+    for resolver in scheduler.resolvers:
+        scheduler.schedule(resolver, 0)
+    assert scheduler.take_due() == ([fast, slow], None)
+
+    await scheduler.refresh(fast)
+    await scheduler.refresh(slow)
+    (due, timeout) = scheduler.take_due()
+    assert due == [] and timeout == pytest.approx(0.05)
+    for _ in range(4):
+        clock.now += 0.05
+        (due, _) = scheduler.take_due()
+        assert due == [fast]
+        await scheduler.refresh(fast)
+    assert (len(fast.collections), len(slow.collections)) == (5, 1)
+    (due, timeout) = scheduler.take_due()
+    assert due == [] and timeout == pytest.approx(0.05)
+    assert slow.data == 1
+
+@pytest.mark.asyncio
+async def test_backs_off_after_failures() -> None:
+    clock = FakeClock()
+    resolver = FlakyResolver(refresh_interval=10, failures=3, min_retry=0.02)
+    scheduler = RefreshScheduler([resolver], jitter=0, clock=clock)
+    # Retried after 0.02, 0.04 and 0.08s, then succeeded and waits for the refresh interval.
+    delays = []
+    for _ in range(4):
+        await scheduler.refresh(resolver)
+        (_, timeout) = scheduler.take_due()
+        assert timeout is not None
+        delays.append(timeout)
+        clock.now += timeout
+        assert scheduler.take_due() == ([resolver], None)
+    assert delays == pytest.approx([0.02, 0.04, 0.08, 10])
+    assert resolver.data == 4
+    report = scheduler.report()["FlakyResolver"]
+    assert (report["successes"], report["failures"], report["consecutive_failures"]) == (1, 3, 0)
+
+@pytest.mark.asyncio
+async def test_run_refreshes_due_resolvers() -> None:
+    resolver = FlakyResolver(refresh_interval=0.01)
+    scheduler = RefreshScheduler([resolver], jitter=0)
+    await scheduler.start(None) # type: ignore[arg-type]
+    async def refreshed_three_times() -> None:
+        while len(resolver.collections) < 3:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(refreshed_three_times(), 5)
+    await scheduler.stop()
+    assert scheduler.task is None and len(scheduler.refreshes) == 0
+
+@pytest.mark.asyncio
+async def test_serves_stale_data_while_failing() -> None:
+    resolver = FlakyResolver(refresh_interval=60, min_retry=30)
+    assert await resolver.refresh()
+    assert resolver.next_refresh_delay() == 60
+
+    resolver.failures = 5
+    for expected_delay in (30, 60, 60):
+        assert not await resolver.refresh()
+        assert resolver.data == 1
+        assert resolver.stale_since is not None
+        assert resolver.next_refresh_delay() == expected_delay
+
+    stale_since = resolver.stale_since
+    assert not await resolver.refresh()
+    assert resolver.stale_since == stale_since
+    assert resolver.stats.consecutive_failures == 4
+
+    resolver.failures = 0
+    assert await resolver.refresh()
+    assert resolver.data == 6
+    assert resolver.stale_since is None
+    assert resolver.stats.report()["mean_latency"] is not None
+
+def test_delay_is_jittered() -> None:
+    resolver = FlakyResolver(refresh_interval=60)
+    scheduler = RefreshScheduler([resolver], jitter=0.2)
+    assert 60 <= scheduler.delay(resolver) <= 72
@@ -0,0 +1,43 @@
+from .door import DoorDataResolver, DoorInformation, DoorStatus
+from .resolver import DataResolver, ScheduledDataResolver
+import datetime
+import pytest
+import pytz
+
+class Poller(ScheduledDataResolver[dict[str, int]]):
+    def __init__(self) -> None:
+        super().__init__(refresh_interval=60)
+        self.value = {"aqi": 35}
+
+    async def do_collection(self) -> dict[str, int]:
+        # A new, but equal, object every time
+        return dict(self.value)
+
+@pytest.mark.asyncio
+async def test_identical_polls_keep_version() -> None:
+    resolver = Poller()
+    changes: list[DataResolver[dict[str, int]]] = []
+    resolver.subscribe(changes.append)
+    await resolver.refresh()
+    assert (resolver.version, len(changes)) == (1, 1)
+    await resolver.refresh()
+    assert (resolver.version, len(changes)) == (1, 1)
+
+    resolver.value = {"aqi": 40}
+    await resolver.refresh()
+    assert (resolver.version, len(changes)) == (2, 2)
+    assert changes[-1] is resolver
+
+    resolver.unsubscribe(changes.append)
+    resolver.value = {"aqi": 45}
+    await resolver.refresh()
+    assert (resolver.version, len(changes)) == (3, 2)
+
+def test_version_of_resolver_without_init() -> None:
+    since = datetime.datetime(2023, 10, 10, 13, 52, tzinfo=pytz.utc)
+    door = DoorDataResolver("homeassistant/output/door/garage_door")
+    version = door.version
+    door.data = DoorInformation(status=DoorStatus.OPEN, status_since=since)
+    door.data = DoorInformation(status=DoorStatus.OPEN, status_since=since)
+    assert door.version == version + 1
+    assert DataResolver().version == 0
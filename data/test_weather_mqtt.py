@@ -0,0 +1,67 @@
+from .weather import WeatherForecast, WeatherForecasts, forecast_series
+from .weather_mqtt import WeatherForecastDataMqttResolver
+import datetime
+import numpy as np
+import pytz
+
+DISPLAY_TZ = pytz.timezone("America/Edmonton")
+
+def forecast(dt: datetime.datetime, temperature: float) -> dict[str, object]:
+    return {"condition": "sunny", "datetime": dt.isoformat(), "temperature": temperature}
+
+# Spans the start of daylight saving time, when 2am local doesn't exist.
+START = datetime.datetime(2024, 3, 9, 12, 0, tzinfo=pytz.utc)
+
+def parsed() -> WeatherForecasts:
+    resolver = WeatherForecastDataMqttResolver("homeassistant/output/weather/Home", display_tz=DISPLAY_TZ)
+    return resolver.parse_weather_data({
+        "forecasts": {
+            "hourly": [forecast(START + datetime.timedelta(hours=i), i) for i in range(48)],
+            "daily": [forecast(START + datetime.timedelta(days=i), i) for i in range(7)],
+        }
+    })
+
+def scan_hourly(forecasts: WeatherForecasts, target: datetime.datetime) -> WeatherForecast | None:
+    for hour in forecasts.hourly:
+        assert hour.datetime is not None
+        hour_time = hour.datetime.astimezone(DISPLAY_TZ)
+        if hour_time.date() == target.date() and hour_time.hour == target.hour:
+            return hour
+    return None
+
+def test_hourly_index_matches_scan() -> None:
+    forecasts = parsed()
+    for i in range(-2, 52):
+        target = (START + datetime.timedelta(hours=i)).astimezone(DISPLAY_TZ)
+        assert forecasts.hourly_forecast(target.date(), target.hour) is scan_hourly(forecasts, target), target
+    # No forecast for the hour skipped by daylight saving time
+    assert forecasts.hourly_forecast(datetime.date(2024, 3, 10), 2) is None
+
+def test_daily_index() -> None:
+    forecasts = parsed()
+    assert [forecasts.daily_forecast(datetime.date(2024, 3, 9 + i)) for i in range(7)] == list(forecasts.daily)
+    assert forecasts.daily_forecast(datetime.date(2024, 3, 8)) is None
+
+def test_indexes_are_ignored_by_equality() -> None:
+    assert parsed() == WeatherForecasts(daily=parsed().daily, hourly=parsed().hourly)
+
+def test_series_round_trips_forecasts() -> None:
+    forecasts = [
+        WeatherForecast(condition="rainy", datetime=datetime.datetime(2024, 3, 9, 5, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=-7))),
+            humidity=80, pressure=1012.5, wind_bearing=270, wind_speed=12.5, precipitation=0.5, temperature_high=-3.5, temperature_low=-10.0),
+        WeatherForecast(condition=None, datetime=None, humidity=None, pressure=None, wind_bearing=None, wind_speed=None,
+            precipitation=None, temperature_high=None, temperature_low=None),
+    ]
+    series = forecast_series(forecasts)
+    assert list(series) == forecasts
+    assert series[0].datetime is not None and series[0].datetime.utcoffset() == datetime.timedelta(hours=-7)
+    assert series[0] is series[0]
+    assert np.isnan(series.values["temperature_high"][1])
+
+def test_series_slices_share_columns() -> None:
+    hourly = parsed().hourly
+    window = hourly[6:12]
+    assert len(window) == 6
+    assert list(window) == list(hourly)[6:12]
+    assert np.shares_memory(window.values["temperature_high"], hourly.values["temperature_high"])
+    assert window == parsed().hourly[6:12] != hourly
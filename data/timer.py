@@ -36,12 +36,12 @@
 # duration == 0:18:00
 
 from .resolver import DataResolver
-from aiomqtt import Client, Message
+from aiomqtt import Message
 from dataclasses import dataclass
 from enum import Enum, auto
-from mqtt import MqttMessageReceiver
+from mqtt import JsonMessageReceiver
+from typing import Any
 import datetime
-import json
 
 class TimerState(Enum):
     UNKNOWN = auto()
@@ -56,25 +56,18 @@ class TimerInformation:
     remaining: datetime.timedelta | None
     duration: datetime.timedelta | None
 
-class TimerDataResolver(DataResolver[TimerInformation], MqttMessageReceiver):
+class TimerDataResolver(DataResolver[TimerInformation], JsonMessageReceiver):
     def __init__(self, topic: str | None) -> None:
         self.data = TimerInformation(state=TimerState.UNKNOWN, finishes_at=None, remaining=None, duration=None)
         self.topic = topic
 
-    async def maybe_refresh(self, now: float) -> None:
-        return
+    def topic_filters(self) -> list[str]:
+        return [self.topic] if self.topic is not None else []
 
-    async def subscribe_to_topics(self, client: Client) -> None:
-        if self.topic is not None:
-            await client.subscribe(self.topic)
-
-    async def handle_message(self, message: Message) -> bool:
+    async def handle_json(self, message: Message, payload: Any) -> bool:
         if str(message.topic) != self.topic:
             return False
-        if not isinstance(message.payload, bytes):
-            return False
 
-        payload = json.loads(message.payload)
         match payload.get("state"):
             case "active":
                 timer_state = TimerState.RUNNING
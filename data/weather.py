@@ -1,8 +1,14 @@
 # Generic weather data classes.
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Iterator, Sequence, overload
 import datetime
+import math
+import numpy as np
+import numpy.typing as npt
+import pytz
+
+EPOCH = datetime.date(1970, 1, 1)
 
 @dataclass
 class CurrentWeatherData:
@@ -27,10 +33,153 @@ class WeatherForecast:
     temperature_high: None | float # Celsius
     temperature_low: None | float # Celsius
 
+# The numeric fields of WeatherForecast, each stored as a column of a ForecastSeries.
+VALUE_COLUMNS = ("humidity", "pressure", "wind_bearing", "wind_speed", "precipitation", "temperature_high", "temperature_low")
+
+FloatArray = npt.NDArray[np.float32]
+
+# A sequence of forecasts stored column-wise: one NumPy array per field, with NaN for missing values.  Times are kept as
+# timestamps plus the UTC offset they were given in, and conditions as indexes into condition_names (-1 for none).  A
+# 48 hour forecast takes about 2KB rather than tens of KB of objects; slicing a series shares its arrays rather than
+# copying them, and the columns can be handed to vectorized code (eg. charts) as they are.  Indexing a single row
+# builds its WeatherForecast once, so repeated lookups return the same object.
+class ForecastSeries(object):
+    def __init__(self, timestamp: npt.NDArray[np.float64], utc_offset: npt.NDArray[np.int32], condition: npt.NDArray[np.int8], condition_names: tuple[str, ...], values: dict[str, FloatArray]) -> None:
+        self.timestamp = timestamp
+        self.utc_offset = utc_offset
+        self.condition = condition
+        self.condition_names = condition_names
+        self.values = values
+        self.rows: list[WeatherForecast | None] = [None] * len(timestamp)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @overload
+    def __getitem__(self, index: int) -> WeatherForecast: ...
+    @overload
+    def __getitem__(self, index: slice) -> "ForecastSeries": ...
+    def __getitem__(self, index: int | slice) -> "WeatherForecast | ForecastSeries":
+        if isinstance(index, slice):
+            return ForecastSeries(
+                self.timestamp[index],
+                self.utc_offset[index],
+                self.condition[index],
+                self.condition_names,
+                {name: column[index] for name, column in self.values.items()},
+            )
+        row = self.rows[index]
+        if row is None:
+            row = self.rows[index] = self.materialize(index)
+        return row
+
+    def __iter__(self) -> Iterator[WeatherForecast]:
+        return (self[i] for i in range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ForecastSeries):
+            return NotImplemented
+        return (
+            np.array_equal(self.timestamp, other.timestamp, equal_nan=True)
+            and np.array_equal(self.utc_offset, other.utc_offset)
+            and self.condition_list() == other.condition_list()
+            and all(np.array_equal(self.values[name], other.values[name], equal_nan=True) for name in VALUE_COLUMNS)
+        )
+
+    def __repr__(self) -> str:
+        return f"ForecastSeries({len(self)} forecasts)"
+
+    def condition_list(self) -> list[str | None]:
+        return [self.condition_names[code] if code >= 0 else None for code in self.condition]
+
+    def datetime_at(self, index: int) -> datetime.datetime | None:
+        timestamp = self.timestamp[index]
+        if np.isnan(timestamp):
+            return None
+        tz = datetime.timezone(datetime.timedelta(seconds=int(self.utc_offset[index])))
+        return datetime.datetime.fromtimestamp(float(timestamp), tz)
+
+    def value_at(self, name: str, index: int) -> float | None:
+        value = self.values[name][index]
+        return None if np.isnan(value) else float(value)
+
+    def integer_at(self, name: str, index: int) -> int | None:
+        value = self.value_at(name, index)
+        return None if value is None else int(value)
+
+    def materialize(self, index: int) -> WeatherForecast:
+        code = self.condition[index]
+        return WeatherForecast(
+            condition=self.condition_names[code] if code >= 0 else None,
+            datetime=self.datetime_at(index),
+            humidity=self.integer_at("humidity", index),
+            pressure=self.value_at("pressure", index),
+            wind_bearing=self.integer_at("wind_bearing", index),
+            wind_speed=self.value_at("wind_speed", index),
+            precipitation=self.value_at("precipitation", index),
+            temperature_high=self.value_at("temperature_high", index),
+            temperature_low=self.value_at("temperature_low", index),
+        )
+
+def forecast_series(forecasts: Sequence[WeatherForecast]) -> ForecastSeries:
+    condition_names: dict[str, int] = {}
+    for forecast in forecasts:
+        if forecast.condition is not None:
+            condition_names.setdefault(forecast.condition, len(condition_names))
+    def missing(value: float | None) -> float:
+        return math.nan if value is None else value
+    return ForecastSeries(
+        timestamp=np.array([f.datetime.timestamp() if f.datetime is not None else math.nan for f in forecasts], dtype=np.float64),
+        utc_offset=np.array([utc_offset(f.datetime) for f in forecasts], dtype=np.int32),
+        condition=np.array([condition_names[f.condition] if f.condition is not None else -1 for f in forecasts], dtype=np.int8),
+        condition_names=tuple(condition_names),
+        values={name: np.array([missing(getattr(f, name)) for f in forecasts], dtype=np.float32) for name in VALUE_COLUMNS},
+    )
+
+def utc_offset(dt: datetime.datetime | None) -> int:
+    if dt is None:
+        return 0
+    offset = dt.utcoffset()
+    return int(offset.total_seconds()) if offset is not None else 0
+
 @dataclass
 class WeatherForecasts:
-    daily: List[WeatherForecast]
-    hourly: List[WeatherForecast]
+    daily: ForecastSeries
+    hourly: ForecastSeries
+    # When given, forecasts are indexed for lookups by daily_forecast and hourly_forecast: daily forecasts by their
+    # date, and hourly forecasts by their date and hour in display_tz.  The first forecast for each wins.  The indexes
+    # are built once, at construction; daily and hourly shouldn't be modified afterwards.
+    display_tz: pytz.BaseTzInfo | None = field(default=None, compare=False, repr=False)
+    by_date: dict[datetime.date, int] = field(init=False, compare=False, repr=False)
+    by_hour: dict[tuple[datetime.date, int], int] = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.by_date = {}
+        self.by_hour = {}
+        if self.display_tz is None:
+            return
+        # Each daily forecast's date is in its own UTC offset.
+        days = (self.daily.timestamp + self.daily.utc_offset) // 86400
+        for i, day in enumerate(days):
+            if not np.isnan(day):
+                self.by_date.setdefault(EPOCH + datetime.timedelta(days=int(day)), i)
+        for i in range(len(self.hourly)):
+            hour = self.hourly.datetime_at(i)
+            if hour is not None:
+                local = hour.astimezone(self.display_tz)
+                self.by_hour.setdefault((local.date(), local.hour), i)
+
+    def daily_forecast(self, date: datetime.date) -> WeatherForecast | None:
+        index = self.by_date.get(date)
+        return self.daily[index] if index is not None else None
+
+    # The row of hourly for the given date and hour in display_tz; eg. to slice the hours that follow it.
+    def hourly_index(self, date: datetime.date, hour: int) -> int | None:
+        return self.by_hour.get((date, hour))
+
+    def hourly_forecast(self, date: datetime.date, hour: int) -> WeatherForecast | None:
+        index = self.hourly_index(date, hour)
+        return self.hourly[index] if index is not None else None
 
 @dataclass
 class SunForecast:
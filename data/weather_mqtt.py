@@ -2,12 +2,12 @@
 # Example HA automation: see weather-ha.yml
 
 from .resolver import DataResolver
-from .weather import CurrentWeatherData, WeatherForecasts, WeatherForecast
-from aiomqtt import Client, Message
-from mqtt import MqttMessageReceiver
+from .weather import CurrentWeatherData, WeatherForecasts, WeatherForecast, forecast_series
+from aiomqtt import Message
+from mqtt import JsonMessageReceiver
 from typing import Any, Dict
 import datetime
-import json
+import pytz
 
 def translate_condition(cond: str | None) -> str | None:
     if cond is not None:
@@ -22,7 +22,7 @@ def wind_chill(air_temperature: float, wind_speed: float) -> float:
         return air_temperature
     return float(13.12 + (0.6215 * air_temperature) - (11.37 * (wind_speed ** 0.16)) + (0.3965 * air_temperature * (wind_speed ** 0.16)))
 
-class CurrentWeatherDataMqttResolver(DataResolver[CurrentWeatherData], MqttMessageReceiver):
+class CurrentWeatherDataMqttResolver(DataResolver[CurrentWeatherData], JsonMessageReceiver):
     def __init__(self, topic: str) -> None:
         self.data = CurrentWeatherData(
             condition=None,
@@ -36,18 +36,14 @@ class CurrentWeatherDataMqttResolver(DataResolver[CurrentWeatherData], MqttMessa
         )
         self.topic = topic
 
-    async def subscribe_to_topics(self, client: Client) -> None:
-        # print("CurrentWeatherDataMqttResolver: Subscribing to topic", self.topic)
-        await client.subscribe(self.topic)
+    def topic_filters(self) -> list[str]:
+        return [self.topic]
 
-    async def handle_message(self, message: Message) -> bool:
+    async def handle_json(self, message: Message, payload: Any) -> bool:
         # print("CurrentWeatherDataMqttResolver: Received message: ", message.topic, message.payload)
         if str(message.topic) != self.topic:
             return False
-        if not isinstance(message.payload, bytes):
-            return False
-        data = json.loads(message.payload)
-        self.data = self.parse_weather_data(data)
+        self.data = self.parse_weather_data(payload)
         # print("CurrentWeatherDataMqttResolver: Parsed data: ", self.data)
         return True
 
@@ -71,42 +67,32 @@ class CurrentWeatherDataMqttResolver(DataResolver[CurrentWeatherData], MqttMessa
             wind_chill=wc,
         )
 
-class WeatherForecastDataMqttResolver(DataResolver[WeatherForecasts], MqttMessageReceiver):
-    def __init__(self, topic: str) -> None:
+class WeatherForecastDataMqttResolver(DataResolver[WeatherForecasts], JsonMessageReceiver):
+    # Forecasts are indexed by display_tz's dates and hours as they're parsed; see WeatherForecasts.
+    def __init__(self, topic: str, display_tz: pytz.BaseTzInfo) -> None:
         self.data = None
         self.topic = topic
+        self.display_tz = display_tz
 
-    async def subscribe_to_topics(self, client: Client) -> None:
-        # FIXME: technically we subscribe to the same weather topic twice
-        # between both resolvers... it's OK... it does cause the messages to be
-        # received and parsed twice.  Could be fixed maybe by making the Mqtt
-        # client an abstraction that tracks the subscriptions in a set?
-        await client.subscribe(self.topic)
+    def topic_filters(self) -> list[str]:
+        # Shared with CurrentWeatherDataMqttResolver; MqttServer subscribes to the topic once and routes each message,
+        # decoded once, to both.
+        return [self.topic]
 
-    async def handle_message(self, message: Message) -> bool:
+    async def handle_json(self, message: Message, payload: Any) -> bool:
         # print("WeatherForecastDataMqttResolver: Received message: ", message.topic)
         if str(message.topic) != self.topic:
             return False
-        if not isinstance(message.payload, bytes):
-            return False
-        data = json.loads(message.payload)
-        self.data = self.parse_weather_data(data)
+        self.data = self.parse_weather_data(payload)
         return True
 
     def parse_weather_data(self, data: Dict[str, Any]) -> WeatherForecasts:
-        retval = WeatherForecasts(
-            daily=[],
-            hourly=[]
-        )
         forecasts = data.get("forecasts", {})
-        daily = forecasts.get('daily', [])
-        for day in daily:
-            retval.daily.append(self.parse_weather_forecast(day))
-        hourly = forecasts.get('hourly', [])
-        for hour in hourly:
-            retval.hourly.append(self.parse_weather_forecast(hour))
-        # print("Weather forecast data: ", retval)
-        return retval
+        return WeatherForecasts(
+            daily=forecast_series([self.parse_weather_forecast(day) for day in forecasts.get('daily', [])]),
+            hourly=forecast_series([self.parse_weather_forecast(hour) for hour in forecasts.get('hourly', [])]),
+            display_tz=self.display_tz,
+        )
 
     def parse_weather_forecast(self, data: Dict[str, Any]) -> WeatherForecast:
         return WeatherForecast(
@@ -21,19 +21,24 @@ from data.currenttime import CurrentTimeDataResolver
 from data.distance import DistanceDataResolver
 from data.door import DoorDataResolver
 from data.envcanada import EnvironmentCanadaDataResolver
+from data.httpclient import HttpCache, HttpClient
 from data.media_player import MediaPlayerDataResolver
 from data.ovenpower import OvenOnDataResolver
 from data.purpleair import PurpleAirDataResolver
+from data.refresh import RefreshScheduler
 from data.timer import TimerDataResolver
 from data.weather_mqtt import CurrentWeatherDataMqttResolver, WeatherForecastDataMqttResolver
-from draw import ContainerNode, CarouselDrawable
+from draw import ContainerNode, CarouselDrawable, font_registry, profiler
+from framescheduler import FrameScheduler
 from mqtt import MqttConfig, MqttServer, MqttMessageReceiver
 from pixelperfectpi import Clock
 from stretchable.style import PCT, FlexDirection, AlignItems, JustifyContent
-from typing import List, Any
+from typing import List, Any, Callable, Literal
 import asyncio
+import concurrent.futures
 import datetime
 import pytz
+import time
 
 import rgbmatrix # type: ignore
 try:
@@ -56,15 +61,30 @@ def real_rgbmatrixoptions_factory(cols: int, rows: int, hardware_mapping: str, g
     opts.gpio_slowdown = gpio_slowdown
     return opts
 
-def create_clock(config: AppConfig) -> Clock:
+# Executor for the CPU-bound parts of data collection (feed parsing, recurrence expansion).  A single worker is enough
+# as collections are infrequent; the point is to keep them from stalling frames.  A process pool also keeps them from
+# contending for the GIL, at the cost of copying feeds to the worker.
+def create_parse_executor(kind: Literal["inline"] | Literal["thread"] | Literal["process"]) -> concurrent.futures.Executor | None:
+    if kind == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="parse")
+    elif kind == "process":
+        return concurrent.futures.ProcessPoolExecutor(max_workers=1)
+    return None
+
+# rgbmatrix_provider and time_source can be provided to run the display without hardware, or on a simulated clock.
+def create_clock(config: AppConfig, rgbmatrix_provider: Callable[[], rgbmatrix.RGBMatrix] | None = None, time_source: Callable[[], float] = time.time) -> Clock:
     # System configuration objects
     display_tz = pytz.timezone(config.display_tz)
+    font_registry.preload(config.font_path, config.preload_fonts)
+    profiler.enabled = config.profiling
 
     # Create data resolvers
     data_resolvers: List[DataResolver[Any]] = []
-    env_canada = EnvironmentCanadaDataResolver()
+    http_client = HttpClient(cache=HttpCache(directory=config.cache_path))
+    parse_executor = create_parse_executor(config.parse_executor)
+    env_canada = EnvironmentCanadaDataResolver(http_client=http_client, executor=parse_executor)
     data_resolvers.append(env_canada)
-    current_time = CurrentTimeDataResolver()
+    current_time = CurrentTimeDataResolver(time_source=time_source, display_tz=display_tz)
     data_resolvers.append(current_time)
     current_weather = CurrentWeatherDataMqttResolver(
         topic=config.weather_mqtt_topic,
@@ -72,11 +92,14 @@ def create_clock(config: AppConfig) -> Clock:
     data_resolvers.append(current_weather)
     weather_forecast_data = WeatherForecastDataMqttResolver(
         topic=config.weather_mqtt_topic,
+        display_tz=display_tz,
     )
     data_resolvers.append(weather_forecast_data)
     calendar_data = CalendarDataResolver(
         ical_url=config.calendar_ical_url,
         display_tz=display_tz,
+        http_client=http_client,
+        executor=parse_executor,
     )
     data_resolvers.append(calendar_data)
     oven_on_data = OvenOnDataResolver()
@@ -113,7 +136,7 @@ def create_clock(config: AppConfig) -> Clock:
         topic="homeassistant/output/timer/kitchen",
     )
     data_resolvers.append(timer_data)
-    purpleair = PurpleAirDataResolver(url=config.purpleair_url)
+    purpleair = PurpleAirDataResolver(url=config.purpleair_url, http_client=http_client)
     data_resolvers.append(purpleair)
 
     # Create components
@@ -159,6 +182,7 @@ def create_clock(config: AppConfig) -> Clock:
         ))
     daily_weather_forecast_component_today = DailyWeatherForecastComponent(
         weather_forecast_data=weather_forecast_data,
+        current_time=current_time,
         offset=datetime.timedelta(days=0),
         display_tz=display_tz,
         label="tdy",
@@ -166,6 +190,7 @@ def create_clock(config: AppConfig) -> Clock:
     )
     daily_weather_forecast_component_tomorrow = DailyWeatherForecastComponent(
         weather_forecast_data=weather_forecast_data,
+        current_time=current_time,
         offset=datetime.timedelta(days=1),
         display_tz=display_tz,
         label="tmw",
@@ -173,11 +198,13 @@ def create_clock(config: AppConfig) -> Clock:
     )
     hourly_weather_forecast_component = HourlyWeatherForecastComponent(
         weather_forecast_data=weather_forecast_data,
+        current_time=current_time,
         display_tz=display_tz,
         font_path=config.font_path,
     )
     sun_forecast_component = SunForecastComponent(
         sun_forecast=env_canada,
+        current_time=current_time,
         font_path=config.font_path,
         display_tz=display_tz,
     )
@@ -202,18 +229,21 @@ def create_clock(config: AppConfig) -> Clock:
     )
     door_component_garage = DoorComponent(
         door=garage_door_status_data,
+        current_time=current_time,
         font_path=config.font_path,
         icon_path=config.icon_path,
         name="Garage",
     )
     door_component_man = DoorComponent(
         door=garage_man_door_status_data,
+        current_time=current_time,
         font_path=config.font_path,
         icon_path=config.icon_path,
         name="Man Door",
     )
     door_component_back = DoorComponent(
         door=back_door_status_data,
+        current_time=current_time,
         font_path=config.font_path,
         icon_path=config.icon_path,
         name="Back Door",
@@ -225,6 +255,7 @@ def create_clock(config: AppConfig) -> Clock:
     )
     timer_component = TimerComponent(
         timer=timer_data,
+        current_time=current_time,
         font_path=config.font_path,
         icon_path=config.icon_path,
     )
@@ -237,20 +268,21 @@ def create_clock(config: AppConfig) -> Clock:
     # )
 
     # RGB Matrix initialization
-    if config.mode == "real":
-        rgbmatrixoptions = real_rgbmatrixoptions_factory(
-            cols=64,
-            rows=32,
-            hardware_mapping=config.gpio_hardware_mapping,
-            gpio_slowdown=config.gpio_slowdown,
-        )
-        rgbmatrix_provider = lambda: rgbmatrix.RGBMatrix(options=rgbmatrixoptions)
-    else:
-        rgbmatrixoptions = emulated_rgbmatrixoptions_factory(
-            cols=64,
-            rows=32,
-        )
-        rgbmatrix_provider = lambda: RGBMatrixEmulator.RGBMatrix(options=rgbmatrixoptions)
+    if rgbmatrix_provider is None:
+        if config.mode == "real":
+            rgbmatrixoptions = real_rgbmatrixoptions_factory(
+                cols=64,
+                rows=32,
+                hardware_mapping=config.gpio_hardware_mapping,
+                gpio_slowdown=config.gpio_slowdown,
+            )
+            rgbmatrix_provider = lambda: rgbmatrix.RGBMatrix(options=rgbmatrixoptions)
+        else:
+            rgbmatrixoptions = emulated_rgbmatrixoptions_factory(
+                cols=64,
+                rows=32,
+            )
+            rgbmatrix_provider = lambda: RGBMatrixEmulator.RGBMatrix(options=rgbmatrixoptions)
 
     # Configure MQTT and event handling
     mqtt_config = MqttConfig(
@@ -263,10 +295,20 @@ def create_clock(config: AppConfig) -> Clock:
         discovery_object_id=config.mqtt.discovery_object_id,
     )
     shutdown_event = asyncio.Event()
+    refresh_scheduler = RefreshScheduler(data_resolvers)
+    frame_scheduler = FrameScheduler(target_fps=config.target_fps)
     mqtt_server = MqttServer(
         config=mqtt_config,
         shutdown_event=shutdown_event,
-        other_receivers=[data for data in data_resolvers if isinstance(data, MqttMessageReceiver)]
+        other_receivers=[data for data in data_resolvers if isinstance(data, MqttMessageReceiver)],
+        profiler=profiler if config.profiling else None,
+        refresh_scheduler=refresh_scheduler,
+        # Locations and media player positions can be published many times a second; only the latest matters.
+        coalesce_topics=[
+            distance_to_mathieu_data.topic,
+            distance_to_amanda_data.topic,
+        ] + media_player_data.topic_filters(),
+        coalesce_interval=1 / frame_scheduler.target_fps,
     )
 
     # Layout components in a container node
@@ -319,7 +361,9 @@ def create_clock(config: AppConfig) -> Clock:
         root=root,
         rgbmatrix_provider=rgbmatrix_provider,
         shutdown_event=shutdown_event,
-        services=[mqtt_server],
+        services=[refresh_scheduler, mqtt_server, http_client],
+        damage_tracking=config.damage_tracking,
+        frame_scheduler=frame_scheduler,
     )
 
     return clock
@@ -1,13 +1,18 @@
+from framescheduler import FrameScheduler
 import asyncio
 import sys
+import time
 from typing import Literal, List, Callable
 from rgbmatrix import RGBMatrix # type: ignore
 from service import Service
 
 class DisplayBase(object):
-    def __init__(self, rgbmatrix_provider: Callable[[], RGBMatrix], shutdown_event: asyncio.Event, services: List[Service]) -> None:
+    def __init__(self, rgbmatrix_provider: Callable[[], RGBMatrix], shutdown_event: asyncio.Event, services: List[Service], frame_scheduler: FrameScheduler | None = None) -> None:
         self.rgbmatrix_provider = rgbmatrix_provider
         self.services = services
+        self.frame_scheduler = frame_scheduler if frame_scheduler is not None else FrameScheduler()
+        self.frame_stats_interval = 300
+        self.last_frame_stats = time.time()
 
         self.state: Literal["ON"] | Literal["OFF"] = "ON"
         self.turn_on_event: asyncio.Event | None = None
@@ -51,38 +56,37 @@ class DisplayBase(object):
     def pre_run(self) -> None:
         raise NotImplementedError
 
-    async def update_data(self) -> None:
-        raise NotImplementedError
-
     async def create_canvas(self, matrix: RGBMatrix) -> None:
         raise NotImplementedError
 
     async def draw_frame(self, matrix: RGBMatrix) -> None:
         raise NotImplementedError
 
+    # When the next frame is needed; see Drawable.next_frame_time.
+    def next_frame_time(self, now: float) -> float | None:
+        return None
+
     async def async_run(self) -> None:
         for service in self.services:
             await service.start(self)
         self.pre_run()
-        await self.main_loop()
+        try:
+            await self.main_loop()
+        finally:
+            for service in self.services:
+                await service.stop()
 
     async def main_loop(self) -> None:
         while True:
-            await self.update_data()
-
             if self.state == "OFF":
                 if self.matrix is not None:
                     self.matrix.Clear()
                     del self.matrix
                     self.matrix = None
 
-                # Wake when we're turned on...
+                # Wake when we're turned on; data is kept up to date meanwhile by the RefreshScheduler service.
                 assert self.turn_on_event is not None
-                turn_on_event_task = asyncio.create_task(self.turn_on_event.wait())
-                # Wake after a bit just to do an update_data call...
-                sleep_task = asyncio.create_task(asyncio.sleep(120))
-                # Wait until either wake condition; doesn't matter which.
-                await asyncio.wait([ turn_on_event_task, sleep_task ], return_when=asyncio.FIRST_COMPLETED)
+                await self.turn_on_event.wait()
 
             elif self.state == "ON":
                 if self.matrix is None:
@@ -90,6 +94,15 @@ class DisplayBase(object):
                     self.matrix = self.rgbmatrix_provider()
                     print("Success!")
                     await self.create_canvas(self.matrix)
+                    self.frame_scheduler.reset()
 
+                frame_start = time.time()
+                self.frame_scheduler.frame_started(frame_start)
                 await self.draw_frame(self.matrix)
-                await asyncio.sleep(0.1)
+                delay = self.frame_scheduler.schedule(frame_start, time.time(), self.next_frame_time(frame_start))
+
+                if frame_start - self.last_frame_stats >= self.frame_stats_interval:
+                    print("Frame stats:", self.frame_scheduler.stats())
+                    self.last_frame_stats = frame_start
+
+                await asyncio.sleep(delay)
@@ -1,7 +1,12 @@
 from .barchart import BarChart
 from .carousel import CarouselDrawable, CarouselPanel
 from .containernode import ContainerNode
+from .drawable import Drawable, Rect
+from .fontregistry import Font, FontRegistry, font_registry
 from .iconnode import IconNode
+from .profiler import FrameProfiler, Histogram, profiler
+from .rendercache import RenderCache
+from .sparkline import Sparkline
 from .textnode import TextNode
 
 __all__ = [
@@ -9,6 +14,16 @@ __all__ = [
     "CarouselDrawable",
     "CarouselPanel",
     "ContainerNode",
+    "Drawable",
+    "Font",
+    "FontRegistry",
+    "FrameProfiler",
+    "Histogram",
     "IconNode",
+    "Rect",
+    "RenderCache",
+    "Sparkline",
     "TextNode",
+    "font_registry",
+    "profiler",
 ]
@@ -1,9 +1,41 @@
 from .drawable import Drawable
-from typing import Literal, Any
+from PIL import Image
+from typing import Hashable, Literal, Any
+import functools
+import numpy as np
+import numpy.typing as npt
 
 # horizontal or vertical enum
 Orientation = Literal["horizontal", "vertical"]
 
+ColorScale = tuple[tuple[float, tuple[int, int, int]], ...]
+
+def interpolate_color(color_scale: ColorScale, value: float) -> tuple[int, int, int]:
+    def lerp_color(start_color: tuple[int, int, int], end_color: tuple[int, int, int], t: float) -> tuple[int, int, int]:
+        return (
+            int(start_color[0] + (end_color[0] - start_color[0]) * t),
+            int(start_color[1] + (end_color[1] - start_color[1]) * t),
+            int(start_color[2] + (end_color[2] - start_color[2]) * t)
+        )
+    prev = color_scale[0]
+    if value <= prev[0]:
+        return prev[1]
+    for base_value, color in color_scale:
+        if value <= base_value:
+            if base_value == value:
+                return color
+            return lerp_color(prev[1], color, (value - prev[0]) / (base_value - prev[0]))
+        prev = base_value, color
+    return prev[1]
+
+# The value and color of each step along a bar of `length` pixels.  This only depends on the scale and the bar's size, so
+# it's computed once and shared between every bar (and every frame) with the same parameters.
+@functools.lru_cache(maxsize=64)
+def color_ramp(color_scale: ColorScale, min_value: float, max_value: float, length: int) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.uint8]]:
+    values = np.array([min_value + (i / length) * (max_value - min_value) for i in range(length)], dtype=np.float64)
+    colors = np.array([interpolate_color(color_scale, value) for value in values], dtype=np.uint8).reshape((length, 3))
+    return (values, colors)
+
 class BarChart(Drawable):
     def __init__(self, orientation: Orientation, border: int = 0, border_color: tuple[int, int, int] = (0, 0, 0), **kwargs: Any) -> None:
         super().__init__(**kwargs)
@@ -24,21 +56,32 @@ class BarChart(Drawable):
         raise NotImplementedError
 
     def interpolate_color(self, value: float) -> tuple[int, int, int]:
-        def lerp_color(start_color: tuple[int, int, int], end_color: tuple[int, int, int], t: float) -> tuple[int, int, int]:
-            return (
-                int(start_color[0] + (end_color[0] - start_color[0]) * t),
-                int(start_color[1] + (end_color[1] - start_color[1]) * t),
-                int(start_color[2] + (end_color[2] - start_color[2]) * t)
-            )
-        color_scale = self.color_scale()
-        prev = color_scale[0]
-        for base_value, color in color_scale:
-            if value <= base_value:
-                if base_value == value:
-                    return color
-                return lerp_color(prev[1], color, (value - prev[0]) / (base_value - prev[0]))
-            prev = base_value, color
-        return prev[1]
+        return interpolate_color(tuple(self.color_scale()), value)
+
+    def render_key(self) -> Hashable | None:
+        return (self.value(), self.min_value(), self.max_value(), tuple(self.color_scale()))
+
+    # Fill a single bar occupying the box (x, y, width, height) of our buffer up to `value`; horizontal bars grow from
+    # the left, vertical bars from the bottom.  Subclasses can call this repeatedly to draw multi-bar charts.
+    def draw_bar(self, x: int, y: int, width: int, height: int, value: float) -> None:
+        assert self.buffer is not None
+        if width <= 0 or height <= 0:
+            return
+
+        length = width if self.orientation == "horizontal" else height
+        values, colors = color_ramp(tuple(self.color_scale()), self.min_value(), self.max_value(), length)
+        # values are increasing, so the filled steps are the ones up to the first that exceeds the value
+        filled = int(np.searchsorted(values, value, side="right"))
+        if filled == 0:
+            return
+
+        if self.orientation == "horizontal":
+            pixels = np.broadcast_to(colors[np.newaxis, :filled], (height, filled, 3))
+            box = (x, y)
+        else:
+            pixels = np.broadcast_to(colors[filled - 1::-1, np.newaxis], (filled, width, 3))
+            box = (x, y + height - filled)
+        self.buffer.paste(Image.fromarray(np.ascontiguousarray(pixels), mode="RGB"), box=box)
 
     def do_draw(self) -> None:
         assert self.buffer is not None
@@ -47,7 +90,6 @@ class BarChart(Drawable):
         for i in range(0, self.border):
             self.rect(self.border_color, i, i, self.buffer.width - i * 2, self.buffer.height - i * 2)
 
-        my_min, my_max = self.min_value(), self.max_value()
         my_value = self.value()
         if my_value is None:
             return
@@ -55,24 +97,4 @@ class BarChart(Drawable):
         box = self.get_box(relative=True)
         width = int(box.width) - (self.border * 2)
         height = int(box.height) - (self.border * 2)
-
-        if self.orientation == "horizontal":
-            for x in range(0, width):
-                value_x = (x / width) * (my_max - my_min)
-                if value_x > my_value:
-                    break
-                color = self.interpolate_color(value_x)
-                for y in range(0, height):
-                    self.buffer.putpixel((self.border + x, self.border + y), color)
-        elif self.orientation == "vertical":
-            for y in range(0, height):
-                # print(f"{y=}")
-                value_y = (y / height) * (my_max - my_min)
-                y_coord = height - y
-                # print(f"{y=} {height=} {value_y=} {y_coord=} {my_value=}")
-                if value_y > my_value:
-                    break
-                color = self.interpolate_color(value_y)
-                for x in range(0, width):
-                    # print(self.border + x, height - y - 1)
-                    self.buffer.putpixel((self.border + x, height - y), color)
+        self.draw_bar(self.border, self.border, width, height, my_value)
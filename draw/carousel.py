@@ -1,6 +1,6 @@
-from .drawable import Drawable
+from .drawable import Drawable, Rect
 from data import DataResolver
-from typing import List, Any
+from typing import Hashable, List, Any
 
 class CarouselPanel(object):
     def get_drawable(self) -> Drawable:
@@ -69,3 +69,31 @@ class CarouselDrawable(Drawable):
         self.fill((0, 0, 0))
         if self.current_panel is not None:
             self.current_panel.get_drawable().draw(self.buffer)
+
+    def next_frame_time(self, now: float) -> float | None:
+        # Wake up right when the next panel is due, so that the switch isn't delayed until the next idle tick.
+        next_switch = (int(now / self.time_per_frame) + 1) * self.time_per_frame
+        if self.current_panel is None:
+            return next_switch
+        panel_time = self.current_panel.get_drawable().next_frame_time(now)
+        return next_switch if panel_time is None else min(next_switch, panel_time)
+
+    def render_key(self) -> Hashable | None:
+        return id(self.current_panel)
+
+    def do_draw_damaged(self) -> list[Rect]:
+        assert self.buffer is not None
+        key = self.render_key()
+        if key != self.last_render_key:
+            # Switched panels; the new panel needs to be pasted in full, even if its own buffer is still valid from the
+            # last time it was displayed.
+            self.fill((0, 0, 0))
+            if self.current_panel is not None:
+                drawable = self.current_panel.get_drawable()
+                drawable.last_rect = None
+                drawable.draw(self.buffer, incremental=True)
+            self.last_render_key = key
+            return [(0, 0, self.buffer.width, self.buffer.height)]
+        if self.current_panel is None:
+            return []
+        return self.current_panel.get_drawable().draw(self.buffer, incremental=True)
@@ -1,6 +1,7 @@
-from .drawable import Drawable
+from .drawable import Drawable, Rect
+from .profiler import profiler
 from PIL import Image
-from typing import List, Any
+from typing import Hashable, List, Any
 
 class ContainerNode(Drawable):
     def __init__(self, **kwargs: Any) -> None:
@@ -21,16 +22,43 @@ class ContainerNode(Drawable):
         for child in self._children:
             child.verify_layout_is_clean()
 
-    def draw(self, parent_buffer: Image.Image) -> None:
+    def draw(self, parent_buffer: Image.Image, incremental: bool = False) -> list[Rect]:
         if self.is_root:
-            self.verify_layout_is_clean()
+            with profiler.phase("verify_layout"):
+                self.verify_layout_is_clean()
             if self.is_dirty:
                 # print("Recomputing layout")
-                self.compute_layout(available_space=self.size, use_rounding=True)
-        super().draw(parent_buffer)
+                with profiler.phase("layout"):
+                    self.compute_layout(available_space=self.size, use_rounding=True)
+        return super().draw(parent_buffer, incremental)
 
     def do_draw(self) -> None:
         assert self.buffer is not None
         self.fill(self.background_color)
         for child in self._children:
             child.draw(self.buffer)
+
+    def render_key(self) -> Hashable | None:
+        return self.background_color
+
+    def next_frame_time(self, now: float) -> float | None:
+        times = [t for t in (child.next_frame_time(now) for child in self._children) if t is not None]
+        return min(times) if len(times) > 0 else None
+
+    def do_draw_damaged(self) -> list[Rect]:
+        assert self.buffer is not None
+        # If any child has moved or resized, the area it left behind needs to be repainted with our background; just
+        # repaint everything.  Children whose content hasn't changed will still reuse their buffers.
+        layout_changed = any(child.last_rect != child.box_rect() for child in self._children)
+        if layout_changed or self.render_key() != self.last_render_key:
+            self.fill(self.background_color)
+            for child in self._children:
+                child.last_rect = None
+                child.draw(self.buffer, incremental=True)
+            self.last_render_key = self.render_key()
+            return [(0, 0, self.buffer.width, self.buffer.height)]
+
+        damage: list[Rect] = []
+        for child in self._children:
+            damage.extend(child.draw(self.buffer, incremental=True))
+        return damage
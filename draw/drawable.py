@@ -1,13 +1,21 @@
+from .profiler import profiler
 from PIL import Image, ImageDraw
 from stretchable import Node
 from stretchable.style import AlignItems
-from typing import TypeVar, Any
+from typing import Hashable, TypeVar, Any
+
+# (x, y, width, height)
+Rect = tuple[int, int, int, int]
 
 class Drawable(Node):
     def __init__(self, debug_border: tuple[int, int, int] | None = None, **kwargs: Any) -> None:
         self.buffer: Image.Image | None = None
         self.imagedraw = ImageDraw.Draw(Image.new("RGBA", (1, 1))) # FIXME: typing hack
         self.debug_border = debug_border
+        # State from the last frame, used by incremental (damage-tracking) draws to decide whether self.buffer can be
+        # reused as-is, and whether parent_buffer still holds a copy of it.
+        self.last_rect: Rect | None = None
+        self.last_render_key: Hashable | None = None
         if "flex_grow" not in kwargs:
             kwargs["flex_grow"] = 1
         if "align_items" not in kwargs:
@@ -24,16 +32,69 @@ class Drawable(Node):
     def do_draw(self) -> None:
         raise NotImplementedError
 
-    def draw(self, parent_buffer: Image.Image) -> None:
+    # A hashable value that captures everything do_draw depends upon (besides the size of the box).  When it's
+    # unchanged since the last frame, an incremental draw reuses the existing buffer instead of calling do_draw.
+    # None means "unknown", and always causes a redraw.
+    def render_key(self) -> Hashable | None:
+        return None
+
+    # Internal - bring self.buffer up-to-date for an incremental draw, returning the rects of self.buffer that
+    # changed.  Containers override this to redraw only their changed children.
+    def do_draw_damaged(self) -> list[Rect]:
+        assert self.buffer is not None
+        key = self.render_key()
+        if key is not None and key == self.last_render_key:
+            return []
+        self.do_draw()
+        self.last_render_key = key
+        return [(0, 0, self.buffer.width, self.buffer.height)]
+
+    # When this drawable next needs a frame to be drawn, as a time.time() timestamp: None if its appearance only
+    # changes with its data, a time at or before `now` if it is continuously animating, or a future time when a change
+    # is due at that moment.  Used by the FrameScheduler.
+    def next_frame_time(self, now: float) -> float | None:
+        return None
+
+    # How this drawable is identified in profiler output.
+    def profile_name(self) -> str:
+        return type(self).__name__
+
+    def box_rect(self) -> Rect:
         box = self.get_box()
-        if self.buffer is None or self.buffer.width != box.width or self.buffer.height != box.height:
-            self.buffer = Image.new("RGBA", (int(box.width), int(box.height)))
+        return (int(box.x), int(box.y), int(box.width), int(box.height))
+
+    # Draw onto parent_buffer, returning the rects of parent_buffer that were modified.  In incremental mode, parts of
+    # parent_buffer that are unchanged since the last frame are left untouched, so the caller must preserve
+    # parent_buffer's contents between frames (or reset last_rect if it didn't).
+    def draw(self, parent_buffer: Image.Image, incremental: bool = False) -> list[Rect]:
+        rect = self.box_rect()
+        if self.buffer is None or self.buffer.width != rect[2] or self.buffer.height != rect[3]:
+            self.buffer = Image.new("RGBA", (rect[2], rect[3]))
             self.imagedraw = ImageDraw.Draw(self.buffer)
+            self.last_render_key = None
+
+        with profiler.node(self.profile_name()):
+            if not incremental:
+                self.do_draw()
+                self.last_render_key = None
+                damage = [(0, 0, rect[2], rect[3])]
+            else:
+                damage = self.do_draw_damaged()
+        if incremental:
+            if rect != self.last_rect:
+                damage = [(0, 0, rect[2], rect[3])]
+            elif len(damage) == 0:
+                return []
+        self.last_rect = rect
 
-        self.do_draw()
         if self.debug_border is not None:
-            self.imagedraw.rectangle((0, 0, box.width-1, box.height-1), outline=self.debug_border)
-        parent_buffer.paste(self.buffer, box=(int(box.x), int(box.y)))
+            self.imagedraw.rectangle((0, 0, rect[2]-1, rect[3]-1), outline=self.debug_border)
+        for (x, y, w, h) in damage:
+            if (w, h) == self.buffer.size:
+                parent_buffer.paste(self.buffer, box=(rect[0] + x, rect[1] + y))
+            else:
+                parent_buffer.paste(self.buffer.crop((x, y, x + w, y + h)), box=(rect[0] + x, rect[1] + y))
+        return [(rect[0] + x, rect[1] + y, w, h) for (x, y, w, h) in damage]
 
     def fill(self, color: tuple[int, int, int] | tuple[int, int, int, int]) -> None:
         assert self.buffer is not None
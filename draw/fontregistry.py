@@ -0,0 +1,35 @@
+from .glyphatlas import GlyphAtlas
+from .textlayout import FontMetrics
+from PIL import Image, ImageDraw, ImageFont
+from typing import Iterable
+import os.path
+
+class Font(object):
+    def __init__(self, font_file: str, imagedraw: ImageDraw.ImageDraw) -> None:
+        self.font_file = font_file
+        self.pil_font: ImageFont.ImageFont = ImageFont.load(font_file)
+        self.metrics = FontMetrics(self.pil_font, imagedraw=imagedraw)
+        self.glyph_atlas = GlyphAtlas(font_file)
+
+# Process-wide cache of loaded bitmap fonts.  Each font file is loaded and parsed once, no matter how many TextNodes use
+# it, and all fonts share a single measuring surface.
+class FontRegistry(object):
+    def __init__(self) -> None:
+        self.fonts: dict[str, Font] = {}
+        self.measuring_imagedraw = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+    def get(self, font_path: str, font: str) -> Font:
+        font_file = os.path.normpath(os.path.join(font_path, f"{font}.pil"))
+        loaded = self.fonts.get(font_file)
+        if loaded is None:
+            loaded = Font(font_file, self.measuring_imagedraw)
+            self.fonts[font_file] = loaded
+        return loaded
+
+    # Load fonts ahead of time (eg. at startup) so that creating components doesn't touch the disk.
+    def preload(self, font_path: str, fonts: Iterable[str]) -> None:
+        for font in fonts:
+            self.get(font_path, font)
+
+
+font_registry = FontRegistry()
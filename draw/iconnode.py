@@ -2,7 +2,7 @@ from .drawable import Drawable
 from PIL import Image
 from stretchable.style.geometry.length import LengthPoints
 from stretchable.style.geometry.size import SizeAvailableSpace, SizePoints
-from typing import Literal, Any
+from typing import Hashable, Literal, Any
 import os.path
 
 class IconNode(Drawable):
@@ -28,6 +28,10 @@ class IconNode(Drawable):
             LengthPoints.points(height)
         )
 
+    def render_key(self) -> Hashable | None:
+        # The icon itself never changes
+        return self.background_color
+
     def do_draw(self) -> None:
         assert self.buffer is not None
 
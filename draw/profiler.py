@@ -0,0 +1,98 @@
+from collections import deque
+from typing import Any, ContextManager
+import contextlib
+import time
+
+# Rolling window of duration samples, in seconds.
+class Histogram(object):
+    def __init__(self, window: int = 500) -> None:
+        self.samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, p: float) -> float:
+        if len(self.samples) == 0:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+        }
+
+
+class Span(object):
+    def __init__(self, profiler: "FrameProfiler", histograms: dict[str, Histogram], name: str) -> None:
+        self.profiler = profiler
+        self.histograms = histograms
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.profiler.stack.append(self.name)
+        self.profiler.child_time.append(0.0)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        path = ";".join(self.profiler.stack)
+        children = self.profiler.child_time.pop()
+        self.profiler.stack.pop()
+        if len(self.profiler.child_time) > 0:
+            self.profiler.child_time[-1] += elapsed
+        histogram = self.histograms.get(path)
+        if histogram is None:
+            histogram = Histogram(self.profiler.window)
+            self.histograms[path] = histogram
+        histogram.add(elapsed)
+        self.profiler.self_time[path] = self.profiler.self_time.get(path, 0.0) + elapsed - children
+
+
+# Opt-in frame profiler.  Timings are recorded both per phase of a frame (layout, drawing, pushing to the matrix, ...)
+# and per Drawable, keyed by their position in the call stack (eg. "frame;draw;ContainerNode;TextNode").  When
+# disabled, spans are a shared no-op context manager.
+class FrameProfiler(object):
+    def __init__(self, enabled: bool = False, window: int = 500) -> None:
+        self.enabled = enabled
+        self.window = window
+        self.phases: dict[str, Histogram] = {}
+        self.nodes: dict[str, Histogram] = {}
+        self.stack: list[str] = []
+        self.child_time: list[float] = []
+        # Cumulative time spent in each stack, excluding time spent in the spans nested inside it.
+        self.self_time: dict[str, float] = {}
+        self.null_span = contextlib.nullcontext()
+
+    def phase(self, name: str) -> ContextManager[None]:
+        if not self.enabled:
+            return self.null_span
+        return Span(self, self.phases, name)
+
+    def node(self, name: str) -> ContextManager[None]:
+        if not self.enabled:
+            return self.null_span
+        return Span(self, self.nodes, name)
+
+    def reset(self) -> None:
+        self.phases.clear()
+        self.nodes.clear()
+        self.self_time.clear()
+
+    def report(self) -> dict[str, dict[str, dict[str, float]]]:
+        return {
+            "phases": {path: histogram.summary() for path, histogram in self.phases.items()},
+            "nodes": {path: histogram.summary() for path, histogram in self.nodes.items()},
+        }
+
+    # Collapsed-stack format ("a;b;c <microseconds>" per line), as consumed by flamegraph.pl and speedscope.
+    def flamegraph(self) -> str:
+        return "\n".join(f"{path} {int(seconds * 1_000_000)}" for path, seconds in sorted(self.self_time.items()))
+
+
+profiler = FrameProfiler()
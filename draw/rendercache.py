@@ -0,0 +1,46 @@
+from collections import OrderedDict
+from PIL import Image
+from typing import Hashable
+
+# A bounded least-recently-used cache of rendered image tiles.  Drawables whose output is fully determined by a small
+# set of inputs (eg. TextNode's font, text, and colors) can paste a cached tile rather than rendering again.
+class RenderCache(object):
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.tiles: OrderedDict[Hashable, Image.Image] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Image.Image | None:
+        tile = self.tiles.get(key)
+        if tile is None:
+            self.misses += 1
+            return None
+        self.tiles.move_to_end(key)
+        self.hits += 1
+        return tile
+
+    def put(self, key: Hashable, tile: Image.Image) -> None:
+        self.tiles[key] = tile
+        self.tiles.move_to_end(key)
+        while len(self.tiles) > self.max_entries:
+            self.tiles.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.tiles.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.tiles),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / lookups) if lookups > 0 else 0.0,
+        }
+
+
+# Shared by all TextNodes; the dashboard has a few dozen text nodes, each cycling through a handful of strings.
+text_render_cache = RenderCache(max_entries=256)
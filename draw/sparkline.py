@@ -0,0 +1,133 @@
+from .barchart import ColorScale, color_ramp
+from .drawable import Drawable
+from PIL import Image
+from typing import Hashable, Literal, Any
+import numpy as np
+import numpy.typing as npt
+
+# "line" draws the series as a connected line; "bars" fills each column from the bottom up to its highest value.
+SparklineMode = Literal["line", "bars"]
+
+FloatArray = npt.NDArray[np.floating[Any]]
+
+# values as a floating point array; one that already is (eg. a float32 forecast column) is used as is, without a copy.
+def float_series(values: npt.ArrayLike) -> FloatArray:
+    series = np.asarray(values)
+    if not np.issubdtype(series.dtype, np.floating):
+        return series.astype(np.float64)
+    return series
+
+# Reduce `values` to `width` columns, returning the (low, high, first, last) value of each column's run of points.
+# Longer series are split into runs of consecutive points; shorter ones are stretched so that each point covers one or
+# more columns.  NaNs are skipped, and a column with no values left is NaN throughout.
+def decimate(values: npt.ArrayLike, width: int) -> tuple[FloatArray, FloatArray, FloatArray, FloatArray]:
+    series = float_series(values)
+    count = len(series)
+    columns = np.arange(width)
+    if count == 0:
+        empty = np.full(width, np.nan)
+        return (empty, empty, empty, empty)
+    if count < width:
+        stretched = series[(columns * count) // width]
+        return (stretched, stretched, stretched, stretched)
+    starts = (columns * count + width - 1) // width
+    ends = np.append(starts[1:], count)
+    with np.errstate(invalid="ignore"):
+        low = np.fmin.reduceat(series, starts)
+        high = np.fmax.reduceat(series, starts)
+    return (low, high, series[starts], series[ends - 1])
+
+# A chart of a whole series of values (eg. an hourly forecast, or a history), decimated to one column per pixel and
+# colored by height along color_scale.  Rasterization is done with array operations, so drawing a long series costs
+# about as much as a short one.
+class Sparkline(Drawable):
+    def __init__(self, mode: SparklineMode = "line", border: int = 0, border_color: tuple[int, int, int] = (0, 0, 0), background_color: tuple[int, int, int] = (0, 0, 0), **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.border = border
+        self.border_color = border_color
+        self.background_color = background_color
+
+    # The series to chart, oldest first; NaN for missing values.
+    def values(self) -> npt.ArrayLike:
+        raise NotImplementedError
+
+    # A hashable value that changes whenever values() does (eg. a resolver's version).  None if unknown, in which case
+    # the chart is redrawn every frame.
+    def values_key(self) -> Hashable | None:
+        return None
+
+    # The range of the vertical axis; by default, that of the values.
+    def min_value(self) -> float | None:
+        return None
+
+    def max_value(self) -> float | None:
+        return None
+
+    def color_scale(self) -> list[tuple[float, tuple[int, int, int]]]:
+        raise NotImplementedError
+
+    def render_key(self) -> Hashable | None:
+        key = self.values_key()
+        if key is None:
+            return None
+        return (key, self.mode, self.min_value(), self.max_value(), tuple(self.color_scale()))
+
+    def value_range(self, series: FloatArray) -> tuple[float, float] | None:
+        if np.isnan(series).all():
+            return None
+        min_value = self.min_value()
+        max_value = self.max_value()
+        low = float(np.nanmin(series)) if min_value is None else min_value
+        high = float(np.nanmax(series)) if max_value is None else max_value
+        if high <= low:
+            high = low + 1
+        return (low, high)
+
+    # The pixels of a chart of `series` `width` by `height`, or None if there's nothing to draw.
+    def rasterize(self, series: FloatArray, width: int, height: int, color_scale: ColorScale) -> npt.NDArray[np.uint8] | None:
+        value_range = self.value_range(series)
+        if value_range is None:
+            return None
+        low, high, first, last = decimate(series, width)
+        steps, colors = color_ramp(color_scale, value_range[0], value_range[1], height)
+
+        # Like BarChart, a value is drawn up to the last step that doesn't exceed it; rows count down from the top.
+        def rows(column_values: FloatArray) -> npt.NDArray[np.int64]:
+            step = np.clip(np.searchsorted(steps, column_values, side="right") - 1, 0, height - 1)
+            return height - 1 - step
+
+        present = ~np.isnan(high)
+        top = rows(high)
+        if self.mode == "bars":
+            bottom = np.full(width, height - 1)
+        else:
+            # Extend each column to meet the end of the previous one, so that steep changes are still connected.
+            previous = np.append(first[:1], last[:-1])
+            top = np.minimum(top, np.where(np.isnan(previous), top, rows(previous)))
+            bottom = np.maximum(rows(low), np.where(np.isnan(previous), 0, rows(previous)))
+            bottom = np.where(present, bottom, 0)
+
+        y = np.arange(height)[:, np.newaxis]
+        mask = present & (y >= top) & (y <= bottom)
+        pixels = np.empty((height, width, 3), dtype=np.uint8)
+        pixels[:] = self.background_color
+        np.copyto(pixels, colors[::-1, np.newaxis], where=mask[:, :, np.newaxis])
+        return pixels
+
+    def do_draw(self) -> None:
+        assert self.buffer is not None
+
+        self.fill(self.background_color)
+        for i in range(0, self.border):
+            self.rect(self.border_color, i, i, self.buffer.width - i * 2, self.buffer.height - i * 2)
+
+        box = self.get_box(relative=True)
+        width = int(box.width) - (self.border * 2)
+        height = int(box.height) - (self.border * 2)
+        if width <= 0 or height <= 0:
+            return
+
+        pixels = self.rasterize(float_series(self.values()), width, height, tuple(self.color_scale()))
+        if pixels is not None:
+            self.buffer.paste(Image.fromarray(pixels, mode="RGB"), box=(self.border, self.border))
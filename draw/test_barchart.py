@@ -0,0 +1,77 @@
+from .barchart import BarChart, Orientation
+from .containernode import ContainerNode
+from PIL import Image
+from stretchable.style import PCT
+from typing import Any
+import pytest
+
+UV_SCALE: list[tuple[float, tuple[int, int, int]]] = [
+    (0, (0, 255, 0)),
+    (3, (255, 255, 0)),
+    (6, (255, 165, 0)),
+    (8, (255, 0, 0)),
+    (10, (255, 0, 255)),
+]
+
+class StaticBarChart(BarChart):
+    def __init__(self, orientation: Orientation, v: float | None, **kwargs: Any) -> None:
+        super().__init__(orientation=orientation, **kwargs)
+        self.v = v
+
+    def min_value(self) -> float:
+        return 0
+
+    def max_value(self) -> float:
+        return 11
+
+    def value(self) -> float | None:
+        return self.v
+
+    def color_scale(self) -> list[tuple[float, tuple[int, int, int]]]:
+        return UV_SCALE
+
+# The original per-pixel implementation
+def reference_bar(chart: BarChart, width: int, height: int) -> Image.Image:
+    buffer = Image.new("RGBA", (width + chart.border * 2, height + chart.border * 2), (0, 0, 0, 255))
+    my_value = chart.value()
+    assert my_value is not None
+    if chart.orientation == "horizontal":
+        for x in range(0, width):
+            value_x = (x / width) * (chart.max_value() - chart.min_value())
+            if value_x > my_value:
+                break
+            for y in range(0, height):
+                buffer.putpixel((chart.border + x, chart.border + y), chart.interpolate_color(value_x))
+    else:
+        for y in range(0, height):
+            value_y = (y / height) * (chart.max_value() - chart.min_value())
+            if value_y > my_value:
+                break
+            for x in range(0, width):
+                buffer.putpixel((chart.border + x, chart.border + height - 1 - y), chart.interpolate_color(value_y))
+    return buffer
+
+def render(chart: BarChart, size: tuple[int, int]) -> Image.Image:
+    root = ContainerNode(size=(100*PCT, 100*PCT))
+    root.add_child(chart)
+    root.set_size(*size)
+    buffer = Image.new("RGBA", size)
+    root.draw(buffer)
+    return buffer
+
+@pytest.mark.parametrize("orientation,size", [("vertical", (5, 12)), ("horizontal", (40, 4))])
+@pytest.mark.parametrize("v", [0, 0.5, 2.9, 3, 5.5, 8, 10.9, 11, 20])
+def test_matches_per_pixel_fill(orientation: Orientation, size: tuple[int, int], v: float) -> None:
+    chart = StaticBarChart(orientation, v, size=size)
+    assert render(chart, size).tobytes() == reference_bar(chart, *size).tobytes()
+
+def test_border_and_empty_value() -> None:
+    chart = StaticBarChart("vertical", None, size=(5, 12), border=1, border_color=(19, 19, 15))
+    buffer = render(chart, (5, 12))
+    assert buffer.getpixel((0, 0)) == (19, 19, 15, 255)
+    assert buffer.getpixel((2, 10)) == (0, 0, 0, 255)
+
+    chart = StaticBarChart("vertical", 5.5, size=(5, 12), border=1, border_color=(19, 19, 15))
+    buffer = render(chart, (5, 12))
+    bar = reference_bar(chart, 3, 10)
+    assert buffer.crop((1, 1, 4, 11)).tobytes() == bar.crop((1, 1, 4, 11)).tobytes()
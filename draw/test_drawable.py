@@ -0,0 +1,104 @@
+from .carousel import CarouselDrawable, CarouselPanel
+from .containernode import ContainerNode
+from .textnode import TextNode
+from data import StaticDataResolver
+from PIL import Image
+from stretchable.style import PCT, FlexDirection, JustifyContent
+from typing import Hashable
+import os.path
+import pytest
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "fonts")
+
+class StaticText(TextNode, CarouselPanel):
+    def __init__(self, text: str) -> None:
+        super().__init__(font_path=FONT_PATH, font="5x8")
+        self.text = text
+
+    def get_text(self) -> str:
+        return self.text
+
+@pytest.fixture
+def tree() -> tuple[ContainerNode, StaticText, StaticText, CarouselDrawable]:
+    top = StaticText("12:34")
+    left = StaticText("AQI 35")
+    right = StaticText("tdy")
+    carousel = CarouselDrawable(current_time=StaticDataResolver(0.0))
+    carousel.add_panel(left)
+    carousel.add_panel(right)
+    root = ContainerNode(
+        size=(100*PCT, 100*PCT),
+        flex_direction=FlexDirection.COLUMN,
+        justify_content=JustifyContent.CENTER,
+    )
+    root.add_child(top)
+    root.add_child(carousel)
+    root.set_size(64, 32)
+    return (root, top, left, carousel)
+
+def full_render(root: ContainerNode) -> Image.Image:
+    buffer = Image.new("RGB", (64, 32))
+    root.draw(buffer)
+    return buffer
+
+def test_unchanged_frame_has_no_damage(tree: tuple[ContainerNode, StaticText, StaticText, CarouselDrawable]) -> None:
+    root, top, left, carousel = tree
+    buffer = Image.new("RGB", (64, 32))
+    assert root.draw(buffer, incremental=True) == [(0, 0, 64, 32)]
+    assert root.draw(buffer, incremental=True) == []
+
+def test_damage_is_limited_to_changed_node(tree: tuple[ContainerNode, StaticText, StaticText, CarouselDrawable]) -> None:
+    root, top, left, carousel = tree
+    buffer = Image.new("RGB", (64, 32))
+    root.draw(buffer, incremental=True)
+    root.draw(buffer, incremental=True)
+
+    left.text = "AQI 36"
+    damage = root.draw(buffer, incremental=True)
+    (carousel_x, carousel_y, _, _) = carousel.box_rect()
+    (left_x, left_y, left_w, left_h) = left.box_rect()
+    assert damage == [(carousel_x + left_x, carousel_y + left_y, left_w, left_h)]
+    assert buffer.tobytes() == full_render(root).tobytes()
+
+def test_carousel_panel_switch_redraws(tree: tuple[ContainerNode, StaticText, StaticText, CarouselDrawable]) -> None:
+    root, top, left, carousel = tree
+    buffer = Image.new("RGB", (64, 32))
+    root.draw(buffer, incremental=True)
+
+    carousel.current_time = StaticDataResolver(5.0)
+    damage = root.draw(buffer, incremental=True)
+    assert damage == [carousel.box_rect()]
+    assert buffer.tobytes() == full_render(root).tobytes()
+
+def test_next_frame_time_is_carousel_switch(tree: tuple[ContainerNode, StaticText, StaticText, CarouselDrawable]) -> None:
+    root, top, left, carousel = tree
+    root.draw(Image.new("RGB", (64, 32)))
+    assert root.next_frame_time(3.2) == 5.0
+    assert top.next_frame_time(3.2) is None
+
+class CountingText(TextNode):
+    def __init__(self, resolver: StaticDataResolver[str]) -> None:
+        super().__init__(font_path=FONT_PATH, font="5x8")
+        self.resolver = resolver
+        self.calls = 0
+
+    def text_key(self) -> Hashable:
+        return self.resolver.version
+
+    def get_text(self) -> str:
+        self.calls += 1
+        return self.resolver.data or ""
+
+def test_text_is_reused_while_key_is_unchanged() -> None:
+    resolver = StaticDataResolver("AQI 35")
+    node = CountingText(resolver)
+    root = ContainerNode(size=(100*PCT, 100*PCT))
+    root.add_child(node)
+    root.set_size(64, 32)
+    for _ in range(3):
+        full_render(root)
+    assert node.calls == 1
+    resolver.data = "AQI 40"
+    full_render(root)
+    assert node.calls == 2
+    assert node.inner_get_text() == "AQI 40"
@@ -0,0 +1,29 @@
+from .fontregistry import FontRegistry
+from .textnode import TextNode
+import os.path
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "fonts")
+
+def test_font_loaded_once() -> None:
+    fonts = FontRegistry()
+    first = fonts.get(FONT_PATH, "4x6")
+    second = fonts.get(FONT_PATH + "/", "4x6")
+    assert first is second
+    assert len(fonts.fonts) == 1
+
+def test_fonts_share_measuring_surface() -> None:
+    fonts = FontRegistry()
+    assert fonts.get(FONT_PATH, "4x6").metrics.imagedraw is fonts.get(FONT_PATH, "5x8").metrics.imagedraw
+
+def test_preload() -> None:
+    fonts = FontRegistry()
+    fonts.preload(FONT_PATH, ["4x6", "7x13"])
+    assert sorted(os.path.basename(f) for f in fonts.fonts) == ["4x6.pil", "7x13.pil"]
+
+def test_text_nodes_share_font() -> None:
+    fonts = FontRegistry()
+    a = TextNode(font_path=FONT_PATH, font="4x6", fonts=fonts)
+    b = TextNode(font_path=FONT_PATH, font="4x6", fonts=fonts)
+    assert a.pil_font is b.pil_font
+    assert a.glyph_atlas is b.glyph_atlas
+    assert a.font_metrics is b.font_metrics
@@ -0,0 +1,48 @@
+from .glyphatlas import GlyphAtlas
+from PIL import Image, ImageDraw, ImageFont
+from typing import Literal
+import glob
+import os.path
+import pytest
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "fonts")
+Align = Literal["center"] | Literal["left"] | Literal["right"]
+
+FONT_FILES = sorted(glob.glob(os.path.join(FONT_PATH, "*.pil")))
+
+# Every latin-1 glyph, in chunks, plus some typical dashboard text.
+TEXTS = [
+    "".join(chr(c) for c in range(start, start + 16) if c != 10)
+    for start in range(0, 256, 16)
+] + [
+    "",
+    "12:34",
+    "AQI 35",
+    "tmw 7p: Dentist\nappointment",
+    "UV\n5",
+    "WC\n-27",
+    "Sunrise at 7:42",
+    "tdy: Partly Cloudy H:21° L:9°",
+]
+
+def render_pil(font: ImageFont.ImageFont, size: tuple[int, int], xy: tuple[int, int], text: str, color: tuple[int, int, int] | tuple[int, int, int, int], align: Align) -> bytes:
+    image = Image.new("RGBA", size, (0, 0, 16, 255))
+    ImageDraw.Draw(image).multiline_text(xy, text, fill=color, font=font, spacing=0, align=align)
+    return image.tobytes()
+
+def render_atlas(atlas: GlyphAtlas, size: tuple[int, int], xy: tuple[int, int], text: str, color: tuple[int, int, int] | tuple[int, int, int, int], align: Align) -> bytes:
+    image = Image.new("RGBA", size, (0, 0, 16, 255))
+    atlas.draw_text(image, xy, text, color, align=align)
+    return image.tobytes()
+
+@pytest.mark.parametrize("font_file", FONT_FILES, ids=os.path.basename)
+def test_matches_pil_rendering(font_file: str) -> None:
+    font = ImageFont.load(font_file)
+    atlas = GlyphAtlas(font_file)
+    for text in TEXTS:
+        for align in ("left", "center", "right"):
+            for xy in ((0, 0), (3, 2), (-5, -4), (50, 20)):
+                for color in ((255, 167, 0), (10, 20, 30, 128)):
+                    expected = render_pil(font, (64, 32), xy, text, color, align)
+                    actual = render_atlas(atlas, (64, 32), xy, text, color, align)
+                    assert actual == expected, f"{text=} {align=} {xy=} {color=}"
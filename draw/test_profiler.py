@@ -0,0 +1,60 @@
+from .containernode import ContainerNode
+from .profiler import FrameProfiler, Histogram, profiler
+from .textnode import TextNode
+from PIL import Image
+from stretchable.style import PCT
+from typing import Iterator
+import os.path
+import pytest
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "fonts")
+
+class StaticText(TextNode):
+    def __init__(self, text: str) -> None:
+        super().__init__(font_path=FONT_PATH, font="5x8")
+        self.text = text
+
+    def get_text(self) -> str:
+        return self.text
+
+@pytest.fixture
+def enabled_profiler() -> Iterator[FrameProfiler]:
+    profiler.enabled = True
+    profiler.reset()
+    yield profiler
+    profiler.enabled = False
+    profiler.reset()
+
+def test_histogram_percentiles() -> None:
+    histogram = Histogram(window=100)
+    for i in range(1, 101):
+        histogram.add(i / 1000)
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == pytest.approx(51)
+    assert summary["p99_ms"] == pytest.approx(100)
+
+def test_disabled_records_nothing() -> None:
+    disabled = FrameProfiler()
+    with disabled.phase("draw"):
+        pass
+    assert disabled.report() == {"phases": {}, "nodes": {}}
+
+def test_self_time_excludes_children() -> None:
+    p = FrameProfiler(enabled=True)
+    with p.phase("frame"):
+        with p.node("ContainerNode"):
+            pass
+    assert set(p.phases) == {"frame"}
+    assert set(p.nodes) == {"frame;ContainerNode"}
+    assert p.self_time["frame"] <= p.phases["frame"].samples[0]
+    assert [line.rsplit(" ", 1)[0] for line in p.flamegraph().split("\n")] == ["frame", "frame;ContainerNode"]
+
+def test_drawables_are_profiled(enabled_profiler: FrameProfiler) -> None:
+    root = ContainerNode(size=(100*PCT, 100*PCT))
+    root.add_child(StaticText("12:34"))
+    root.set_size(64, 32)
+    with enabled_profiler.phase("draw"):
+        root.draw(Image.new("RGB", (64, 32)))
+    assert set(enabled_profiler.phases) == {"draw", "draw;verify_layout", "draw;layout"}
+    assert set(enabled_profiler.nodes) == {"draw;ContainerNode", "draw;ContainerNode;StaticText"}
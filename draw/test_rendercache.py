@@ -0,0 +1,57 @@
+from .containernode import ContainerNode
+from .rendercache import RenderCache
+from .textnode import TextNode
+from PIL import Image
+from stretchable.style import PCT
+import os.path
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "fonts")
+
+class StaticText(TextNode):
+    def __init__(self, text: str, render_cache: RenderCache | None) -> None:
+        super().__init__(font_path=FONT_PATH, font="5x8", render_cache=render_cache)
+        self.text = text
+
+    def get_text(self) -> str:
+        return self.text
+
+def render(text: str, render_cache: RenderCache | None) -> tuple[StaticText, ContainerNode, Image.Image]:
+    node = StaticText(text, render_cache)
+    root = ContainerNode(size=(100*PCT, 100*PCT))
+    root.add_child(node)
+    root.set_size(64, 32)
+    buffer = Image.new("RGB", (64, 32))
+    root.draw(buffer)
+    return (node, root, buffer)
+
+def test_lru_eviction() -> None:
+    cache = RenderCache(max_entries=2)
+    a, b, c = Image.new("RGBA", (1, 1)), Image.new("RGBA", (1, 1)), Image.new("RGBA", (1, 1))
+    cache.put("a", a)
+    cache.put("b", b)
+    assert cache.get("a") is a # "a" is now most recently used
+    cache.put("c", c)
+    assert cache.get("b") is None
+    assert cache.get("a") is a
+    assert cache.get("c") is c
+    assert cache.stats() == {"entries": 2, "hits": 3, "misses": 1, "evictions": 1, "hit_ratio": 0.75}
+
+def test_text_node_uses_cache() -> None:
+    cache = RenderCache(max_entries=16)
+    node, root, buffer = render("AQI 35", cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    root.draw(buffer)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    node.text = "AQI 36"
+    root.draw(buffer)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_cached_render_matches_uncached() -> None:
+    cache = RenderCache(max_entries=16)
+    _, root, cached = render("Sunrise at 7:42", cache)
+    root.draw(cached)
+    assert cache.hits == 1
+    _, _, uncached = render("Sunrise at 7:42", None)
+    assert cached.tobytes() == uncached.tobytes()
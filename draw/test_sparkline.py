@@ -0,0 +1,90 @@
+from .containernode import ContainerNode
+from .sparkline import Sparkline, SparklineMode, decimate, float_series
+from PIL import Image
+from stretchable.style import PCT
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+SCALE: list[tuple[float, tuple[int, int, int]]] = [
+    (0, (0, 0, 255)),
+    (10, (255, 0, 0)),
+]
+
+class StaticSparkline(Sparkline):
+    def __init__(self, v: npt.ArrayLike, mode: SparklineMode = "line", **kwargs: Any) -> None:
+        super().__init__(mode=mode, **kwargs)
+        self.v = v
+
+    def values(self) -> npt.ArrayLike:
+        return self.v
+
+    def min_value(self) -> float:
+        return 0
+
+    def max_value(self) -> float:
+        return 10
+
+    def color_scale(self) -> list[tuple[float, tuple[int, int, int]]]:
+        return SCALE
+
+def render(chart: Sparkline, size: tuple[int, int]) -> Image.Image:
+    root = ContainerNode(size=(100*PCT, 100*PCT))
+    root.add_child(chart)
+    root.set_size(*size)
+    buffer = Image.new("RGBA", size)
+    root.draw(buffer)
+    return buffer
+
+# The rows of each column that aren't background
+def columns(buffer: Image.Image) -> list[list[int]]:
+    pixels = np.asarray(buffer.convert("RGB"))
+    return [[int(y) for y in np.nonzero(pixels[:, x].any(axis=1))[0]] for x in range(buffer.width)]
+
+@pytest.mark.parametrize("count,width", [(10000, 7), (24, 24), (25, 24), (5, 12)])
+def test_decimate_matches_loop(count: int, width: int) -> None:
+    values = np.random.default_rng(count).normal(size=count)
+    values[3] = np.nan
+    low, high, first, last = decimate(values, width)
+    for column in range(width):
+        if count >= width:
+            run = values[-(-column * count // width):-(-(column + 1) * count // width)]
+        else:
+            run = values[column * count // width:column * count // width + 1]
+        if np.isnan(run).all():
+            assert np.isnan([low[column], high[column]]).all()
+        else:
+            assert (low[column], high[column]) == (np.nanmin(run), np.nanmax(run))
+        assert np.array_equal([first[column], last[column]], [run[0], run[-1]], equal_nan=True)
+
+def test_line_connects_columns() -> None:
+    # Steps of 2.5 on a 5 pixel high chart: each is one row apart after the first.
+    chart = StaticSparkline([0, 10, 10, 5, np.nan, 5], size=(6, 5))
+    assert columns(render(chart, (6, 5))) == [[4], [0, 1, 2, 3, 4], [0], [0, 1, 2], [], [2]]
+
+def test_bars_fill_to_bottom_with_gradient() -> None:
+    chart = StaticSparkline([0, 10, 5], mode="bars", size=(3, 5))
+    buffer = render(chart, (3, 5))
+    assert columns(buffer) == [[4], [0, 1, 2, 3, 4], [2, 3, 4]]
+    assert buffer.getpixel((1, 4)) == (0, 0, 255, 255)
+    assert buffer.getpixel((1, 0)) == (204, 0, 51, 255)
+
+def test_long_series_fits_width() -> None:
+    values = np.linspace(0, 10, 10000)
+    buffer = render(StaticSparkline(values, size=(20, 8)), (20, 8))
+    assert columns(buffer)[0][-1] == 7 and columns(buffer)[-1][0] == 0
+    assert all(column for column in columns(buffer))
+
+def test_empty_series_and_border() -> None:
+    chart = StaticSparkline([np.nan, np.nan], size=(6, 5), border=1, border_color=(19, 19, 15))
+    buffer = render(chart, (6, 5))
+    assert buffer.getpixel((0, 0)) == (19, 19, 15, 255)
+    assert columns(buffer.crop((1, 1, 5, 4))) == [[], [], [], []]
+
+def test_float_columns_are_not_copied() -> None:
+    column = np.linspace(0, 10, 48, dtype=np.float32)[6:30]
+    assert float_series(column) is column
+    assert float_series([1, 2]).dtype == np.float64
+    low, high, _, _ = decimate(column, 6)
+    assert low.dtype == np.float32 and high[-1] == column[-1]
@@ -0,0 +1,40 @@
+from .textlayout import FontMetrics
+from PIL import Image, ImageDraw, ImageFont
+import os.path
+import pytest
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "fonts")
+
+@pytest.fixture
+def metrics() -> FontMetrics:
+    return FontMetrics(ImageFont.load(os.path.join(FONT_PATH, "4x6.pil")))
+
+@pytest.mark.parametrize("text", ["", "AQI 35", "tmw 7p: Dentist appointment", "UV\n5", "Sunrise at 7:42°"])
+def test_text_size_matches_pil(metrics: FontMetrics, text: str) -> None:
+    imagedraw = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    (left, top, right, bottom) = imagedraw.multiline_textbbox((0, 0), text, font=metrics.pil_font, spacing=0, align="left")
+    assert metrics.text_width(text) == right
+    assert metrics.text_height(text) == bottom
+
+def test_layout_fits(metrics: FontMetrics) -> None:
+    layout = metrics.layout("AQI 35", 64)
+    assert layout.lines == ("AQI 35",)
+    assert not layout.wrapped
+    assert (layout.width, layout.height) == (24, 6)
+
+def test_layout_wraps(metrics: FontMetrics) -> None:
+    layout = metrics.layout("tmw 7p: Dentist appointment", 64)
+    assert layout.lines == ("tmw 7p: Dentist", "appointment")
+    assert layout.wrapped
+    assert (layout.width, layout.fitted_width, layout.height) == (60, 60, 12)
+
+def test_layout_overflowing_word(metrics: FontMetrics) -> None:
+    layout = metrics.layout("a Supercalifragilistic b", 20)
+    assert layout.lines == ("a", "Supercalifragilistic", "b")
+    assert (layout.width, layout.fitted_width, layout.height) == (80, 4, 18)
+
+def test_layout_is_memoized(metrics: FontMetrics) -> None:
+    first = metrics.layout("tmw 7p: Dentist appointment", 64)
+    second = metrics.layout("tmw 7p: Dentist appointment", 64)
+    assert first is second
+    assert metrics.layout.cache_info().hits == 1
@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from PIL import Image, ImageDraw, ImageFont
+import functools
+
+@dataclass(frozen=True)
+class TextLayout:
+    # Lines to render; when the text fits without wrapping this is the original text, which may contain newlines.
+    lines: tuple[str, ...]
+    wrapped: bool
+    # Widest line, including any single word that was too wide to fit within max_width by itself.
+    width: int
+    # Widest line, excluding any words that overflowed max_width.
+    fitted_width: int
+    height: int
+
+# Text measurement and greedy word-wrapping for a bitmap (.pil) font.  Every glyph in a bitmap font has a fixed advance
+# and every line has the same height, so the width of a string is just the sum of its glyphs' advances; we ask PIL for
+# each glyph's advance once, and then never need to measure a string through PIL again.
+class FontMetrics(object):
+    def __init__(self, pil_font: ImageFont.ImageFont, max_layouts: int = 512, imagedraw: ImageDraw.ImageDraw | None = None) -> None:
+        self.pil_font = pil_font
+        self.imagedraw = imagedraw if imagedraw is not None else ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        self.line_height = int(self.imagedraw.textbbox((0, 0), "A", font=pil_font)[3])
+        self.advances: dict[str, int] = {}
+        self.layout = functools.lru_cache(maxsize=max_layouts)(self._layout)
+
+    def advance(self, char: str) -> int:
+        width = self.advances.get(char)
+        if width is None:
+            width = int(self.imagedraw.textbbox((0, 0), char, font=self.pil_font)[2])
+            self.advances[char] = width
+        return width
+
+    def text_width(self, text: str) -> int:
+        if "\n" in text:
+            return max(self.text_width(line) for line in text.split("\n"))
+        return sum(self.advance(char) for char in text)
+
+    def text_height(self, text: str) -> int:
+        return (text.count("\n") + 1) * self.line_height
+
+    # Wrap text word-by-word to fit within max_width.  There is no max height just to keep this simple...
+    def _layout(self, text: str, max_width: float) -> TextLayout:
+        width = self.text_width(text)
+        if width <= max_width:
+            # it will fit in a single-line; nice and easy peasy...
+            return TextLayout(lines=(text,), wrapped=False, width=width, fitted_width=width, height=self.text_height(text))
+
+        # alright... let's just go line-by-line then, shall we.  Find the most text that will fit into each line,
+        # word-by-word.
+        lines = []
+        widest_line = 0
+        widest_fitted_line = 0
+        height_total = 0
+        line = ""
+        line_width = 0
+        words = text.split(" ")
+        i = 0
+        while i < len(words):
+            next_word = words[i]
+            if line == "":
+                proposed_line = next_word
+                proposed_width = self.text_width(next_word)
+            else:
+                proposed_line = line + " " + next_word
+                if "\n" in proposed_line:
+                    proposed_width = self.text_width(proposed_line)
+                else:
+                    proposed_width = line_width + self.advance(" ") + self.text_width(next_word)
+
+            if proposed_width <= max_width:
+                # yes, it will fit on the line
+                line = proposed_line
+                line_width = proposed_width
+                i += 1
+                continue
+
+            # no, proposed_line is too big; we'll make do with the last `line`
+            height_total += self.text_height(proposed_line)
+            if line != "":
+                lines.append(line)
+                widest_line = max(widest_line, line_width)
+                widest_fitted_line = max(widest_fitted_line, line_width)
+                line = ""
+                line_width = 0
+                # leave next_word in place and keep going
+            else:
+                # next_word by itself won't fit on a line; well, we can't skip the middle of a sentence so we'll
+                # just consume it regardless as it's own line.
+                lines.append(next_word)
+                widest_line = max(widest_line, proposed_width)
+                i += 1
+
+        if line != "":
+            height_total += self.text_height(line)
+            lines.append(line)
+            widest_line = max(widest_line, line_width)
+            widest_fitted_line = max(widest_fitted_line, line_width)
+
+        return TextLayout(lines=tuple(lines), wrapped=True, width=widest_line, fitted_width=widest_fitted_line, height=height_total)
+
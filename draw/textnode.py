@@ -1,17 +1,22 @@
 from .drawable import Drawable
-from PIL import Image, ImageFont, ImageDraw
+from .fontregistry import FontRegistry, font_registry
+from .rendercache import RenderCache, text_render_cache
 from stretchable.style.geometry.length import Scale, LengthPoints
 from stretchable.style.geometry.size import SizeAvailableSpace, SizePoints
-from typing import Literal, Any
-import os.path
+from typing import Hashable, Literal, Any
 
 class TextNode(Drawable):
-    def __init__(self, font_path: str, font: str, **kwargs: Any) -> None:
+    def __init__(self, font_path: str, font: str, render_cache: RenderCache | None = text_render_cache, fonts: FontRegistry = font_registry, **kwargs: Any) -> None:
         super(TextNode, self).__init__(measure=self.measure_node, **kwargs)
-        self.pil_font: ImageFont.ImageFont = ImageFont.load(os.path.join(font_path, f"{font}.pil"))
-        self.measuring_buffer = Image.new("RGBA", (1, 1))
-        self.measuring_imagedraw = ImageDraw.Draw(self.measuring_buffer)
+        loaded_font = fonts.get(font_path, font)
+        self.font_file = loaded_font.font_file
+        self.pil_font = loaded_font.pil_font
+        self.font_metrics = loaded_font.metrics
+        self.glyph_atlas = loaded_font.glyph_atlas
+        self.render_cache = render_cache
         self.last_text = ""
+        self.cached_text_key: Hashable | None = None
+        self.cached_text = ""
 
     def verify_layout_is_clean(self) -> None:
         # Before drawing, a chance to mark ourselves as dirty if our
@@ -29,10 +34,21 @@ class TextNode(Drawable):
     def get_text(self) -> str:
         raise NotImplemented
 
+    # A key for everything that get_text depends upon, typically data resolvers' versions; while it's unchanged,
+    # the last text is reused instead of calling get_text again (it's needed several times a frame).  None, the
+    # default, calls get_text every time.
+    def text_key(self) -> Hashable | None:
+        return None
+
     def inner_get_text(self) -> str:
+        key = self.text_key()
+        if key is not None and key == self.cached_text_key:
+            return self.cached_text
         # PIL fonts are only going to work in latin-1... so just a quick drop of anything that doesn't work
         text = self.get_text()
         text = text.encode('latin-1', errors='ignore').decode('latin-1')
+        self.cached_text_key = key
+        self.cached_text = text
         return text
 
     def get_background_color(self) -> tuple[int, int, int, int] | tuple[int, int, int]:
@@ -42,8 +58,26 @@ class TextNode(Drawable):
         return (128, 128, 128)
 
     def do_draw(self) -> None:
-        self.fill(self.get_background_color())
-        self.draw_text(self.get_text_color(), self.inner_get_text())
+        assert self.buffer is not None
+        background_color = self.get_background_color()
+        text_color = self.get_text_color()
+        text = self.inner_get_text()
+        if self.render_cache is None:
+            self.fill(background_color)
+            self.draw_text(text_color, text)
+            return
+
+        key = (self.font_file, text, text_color, background_color, self.buffer.size, "center", "middle")
+        tile = self.render_cache.get(key)
+        if tile is not None:
+            self.buffer.paste(tile)
+            return
+        self.fill(background_color)
+        self.draw_text(text_color, text)
+        self.render_cache.put(key, self.buffer.copy())
+
+    def render_key(self) -> Hashable | None:
+        return (self.inner_get_text(), self.get_text_color(), self.get_background_color())
 
     def measure_node(self, size_points: SizePoints, size_available_space: SizeAvailableSpace) -> SizePoints:
         text = self.inner_get_text()
@@ -74,61 +108,12 @@ class TextNode(Drawable):
     # current font, wrapping if necessary to fit within max_width.  There is no
     # max height just to keep this simple...
     def measure_text(self, text: str,
-        max_width: int,
+        max_width: float,
         halign: Literal["center"] | Literal["left"] | Literal["right"]="center") -> tuple[int, int]:
         if self.pil_font is None:
             raise Exception("must call load_font first")
-
-        # measure the total width of the text...
-        (left, top, right, bottom) = self.measuring_imagedraw.multiline_textbbox((0, 0), text, font=self.pil_font, spacing=0, align="left")
-        if right <= max_width:
-            # it will fit in a single-line; nice and easy peasy...
-            return (right, bottom)
-
-        # alright... let's just go line-by-line then, shall we.  First find the most text that will fit into one line,
-        # word-by-word.
-        lines = []
-        text_words = text.split(" ")
-        line = ""
-        height_total = 0
-        widest_line = 0
-        while True:
-            if len(text_words) == 0:
-                # Ran out of words -- eg. we're done.
-                if line != "":
-                    height_total += bottom
-                    lines.append(line)
-                    (left, top, right, bottom) = self.measuring_imagedraw.multiline_textbbox((0, 0), line, font=self.pil_font, spacing=0, align="left")
-                    widest_line = max(widest_line, right)
-                return (widest_line, height_total)
-
-            next_word = text_words[0]
-            proposed_line = line
-            if proposed_line != "":
-                proposed_line += " "
-            proposed_line += next_word
-
-            # will "proposed_line" fit onto a line?
-            (left, top, right, bottom) = self.measuring_imagedraw.multiline_textbbox((0, 0), proposed_line, font=self.pil_font, spacing=0, align="left")
-            if right > max_width:
-                height_total += bottom
-                # no, proposed_line is too big; we'll make do with the last `line`
-                if line != "":
-                    lines.append(line)
-                    (left, top, right, bottom) = self.measuring_imagedraw.multiline_textbbox((0, 0), line, font=self.pil_font, spacing=0, align="left")
-                    widest_line = max(widest_line, right)
-                    line = ""
-                    # leave next_word in text_words and keep going
-                else:
-                    # next_word by itself won't fit on a line; well, we can't skip the middle of a sentence so we'll
-                    # just consume it regardless as it's own line.
-                    lines.append(next_word)
-                    widest_line = max(widest_line, right)
-                    text_words = text_words[1:]
-            else:
-                # yes, it will fit on the line
-                line = proposed_line
-                text_words = text_words[1:]
+        layout = self.font_metrics.layout(text, max_width)
+        return (layout.width, layout.height)
 
     # halign - left, center, right
     # valign - top, middle, bottom
@@ -143,22 +128,21 @@ class TextNode(Drawable):
 
         x, y, w, h = (0, 0, int(self.get_box().width), int(self.get_box().height))
 
-        assert self.imagedraw is not None
+        assert self.buffer is not None
         if self.pil_font is None:
             raise Exception("must call load_font first")
 
-        # measure the total width of the text...
-        (left, top, right, bottom) = self.imagedraw.multiline_textbbox((0, 0), text, font=self.pil_font, spacing=0, align="left")
-        if right <= (w - pad_left):
+        layout = self.font_metrics.layout(text, w - pad_left)
+        if not layout.wrapped:
             # it will fit in a single-line; nice and easy peasy...
-            text_height = bottom
+            text_height = layout.height
             if valign == "top":
                 text_y = 0
             elif valign == "bottom":
-                text_y = h - bottom
+                text_y = h - text_height
             else: # middle
                 text_y = (h - text_height - pad_top) // 2
-            text_width = right
+            text_width = layout.width
             if halign == "left":
                 text_x = 0
             elif halign == "right":
@@ -166,63 +150,20 @@ class TextNode(Drawable):
             else: # center
                 text_x = (w - text_width - pad_left) // 2
             # print("drawing text...", (pad_left + text_x, pad_top + text_y), text, color, self.pil_font, 0, halign)
-            self.imagedraw.multiline_text((pad_left + text_x, pad_top + text_y), text, fill=color, font=self.pil_font, spacing=0, align=halign)
+            self.glyph_atlas.draw_text(self.buffer, (pad_left + text_x, pad_top + text_y), text, color, align=halign)
             return
 
-        # alright... let's just go line-by-line then, shall we.  First find the most text that will fit into one line,
-        # word-by-word.
-        lines = []
-        text_words = text.split(" ")
-        line = ""
-        height_total = 0
-        widest_line = 0
-        while True:
-            if len(text_words) == 0:
-                # Ran out of words.
-                if line != "":
-                    height_total += bottom
-                    lines.append(line)
-                    (left, top, right, bottom) = self.imagedraw.multiline_textbbox((0, 0), line, font=self.pil_font, spacing=0, align="left")
-                    widest_line = max(widest_line, right)
-                break
-
-            next_word = text_words[0]
-            proposed_line = line
-            if proposed_line != "":
-                proposed_line += " "
-            proposed_line += next_word
-
-            # will "proposed_line" fit onto a line?
-            (left, top, right, bottom) = self.imagedraw.multiline_textbbox((0, 0), proposed_line, font=self.pil_font, spacing=0, align="left")
-            if right > (w - pad_left):
-                height_total += bottom
-                # no, proposed_line is too big; we'll make do with the last `line`
-                if line != "":
-                    lines.append(line)
-                    (left, top, right, bottom) = self.imagedraw.multiline_textbbox((0, 0), line, font=self.pil_font, spacing=0, align="left")
-                    widest_line = max(widest_line, right)
-                    line = ""
-                    # leave next_word in text_words and keep going
-                else:
-                    # next_word by itself won't fit on a line; well, we can't skip the middle of a sentence so we'll
-                    # just consume it regardless as it's own line.  Ignore it for widest_line calc.
-                    lines.append(next_word)
-                    text_words = text_words[1:]
-            else:
-                # yes, it will fit on the line
-                line = proposed_line
-                text_words = text_words[1:]
-
-        new_text = "\n".join(lines)
-
-        text_height = height_total
+        new_text = "\n".join(layout.lines)
+
+        text_height = layout.height
         if valign == "top":
             text_y = 0
         elif valign == "bottom":
-            text_y = max(0, h - bottom)
+            text_y = max(0, h - text_height)
         else: # middle
             text_y = max(0, (h - text_height - pad_top) // 2)
-        text_width = widest_line
+        # Words that overflow the box by themselves are ignored for the widest line calc.
+        text_width = layout.fitted_width
         if halign == "left":
             text_x = 0
         elif halign == "right":
@@ -230,7 +171,7 @@ class TextNode(Drawable):
         else: # center
             text_x = max(0, (w - text_width - pad_left) // 2)
 
-        self.imagedraw.multiline_text((pad_left + text_x, pad_top + text_y), new_text, fill=color, font=self.pil_font, spacing=0, align=halign)
+        self.glyph_atlas.draw_text(self.buffer, (pad_left + text_x, pad_top + text_y), new_text, color, align=halign)
 
 
 # from .box import Box
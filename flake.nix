@@ -65,6 +65,8 @@
             ps.icalendar
             ps.lxml
             ps.mypy
+            ps.numpy
+            ps.orjson
             ps.pylint
             ps.pytest
             ps.pytest-asyncio
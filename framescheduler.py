@@ -0,0 +1,68 @@
+from collections import deque
+import math
+
+# Decides when the next frame should be drawn.
+#
+# Drawables report when they next need a frame (see Drawable.next_frame_time):
+#   - None: nothing is animating, and the display only needs to pick up data changes; we tick slowly (idle_fps),
+#     aligned to whole seconds so that once-a-second changes like the clock's colon blink land on time.
+#   - a time at or before the current frame: something is continuously animating; we run at target_fps.
+#   - a future time: a change is due at that moment (eg. a carousel switching panels); we wake exactly then, limited
+#     only by boost_fps.
+#
+# The delay to the next frame is measured from the start of the current frame, so time spent rendering is compensated
+# for rather than added on top.
+class FrameScheduler(object):
+    def __init__(self, target_fps: float = 10, idle_fps: float = 1, boost_fps: float = 30, window: int = 100) -> None:
+        if target_fps <= 0:
+            raise ValueError(f"target_fps must be positive, not {target_fps}")
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.boost_fps = boost_fps
+        self.scheduled: float | None = None
+        self.frames = 0
+        self.late_frames = 0
+        # Frames that started more than half a target interval after they were scheduled are counted as late.
+        self.late_tolerance = 0.5 / target_fps
+        self.frame_starts: deque[float] = deque(maxlen=window)
+        self.jitter: deque[float] = deque(maxlen=window)
+
+    # Forget the schedule, eg. after the display was turned off, so that the pause isn't counted as a late frame.
+    def reset(self) -> None:
+        self.scheduled = None
+        self.frame_starts.clear()
+
+    def frame_started(self, now: float) -> None:
+        self.frames += 1
+        self.frame_starts.append(now)
+        if self.scheduled is not None:
+            lateness = now - self.scheduled
+            self.jitter.append(abs(lateness))
+            if lateness > self.late_tolerance:
+                self.late_frames += 1
+
+    # Returns the number of seconds to wait, from `now`, before starting the next frame.
+    def schedule(self, frame_start: float, now: float, wanted: float | None) -> float:
+        idle_next = (math.floor(frame_start * self.idle_fps) + 1) / self.idle_fps
+        if wanted is None:
+            next_frame = idle_next
+        elif wanted <= frame_start:
+            next_frame = min(frame_start + 1 / self.target_fps, idle_next)
+        else:
+            next_frame = min(max(wanted, frame_start + 1 / self.boost_fps), idle_next)
+        self.scheduled = next_frame
+        return max(0.0, next_frame - now)
+
+    def achieved_fps(self) -> float:
+        if len(self.frame_starts) < 2 or self.frame_starts[-1] == self.frame_starts[0]:
+            return 0.0
+        return (len(self.frame_starts) - 1) / (self.frame_starts[-1] - self.frame_starts[0])
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "frames": self.frames,
+            "late_frames": self.late_frames,
+            "fps": self.achieved_fps(),
+            "jitter_mean": sum(self.jitter) / len(self.jitter) if len(self.jitter) > 0 else 0.0,
+            "jitter_max": max(self.jitter) if len(self.jitter) > 0 else 0.0,
+        }
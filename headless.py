@@ -0,0 +1,146 @@
+# Support for running the display without an LED matrix: an in-memory matrix, a simulated clock, and canned data for
+# the MQTT-backed data resolvers.  Used by the benchmark and recorder.
+
+from aiomqtt import Message
+from config import AppConfig, LocationConfig, MQTTConfig
+from data import DataResolver
+from mqtt import MqttMessageReceiver, TopicRouter, deliver
+from PIL import Image
+from typing import Any
+import datetime
+import json
+import os
+
+# 2024-01-15 08:00:00 America/Edmonton; fixed so that every run draws the same frames.
+START_TIME = 1705330800.0
+
+class MemoryCanvas(object):
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.image = Image.new("RGB", (width, height))
+
+    def SetImage(self, image: Image.Image, x: int = 0, y: int = 0) -> None:
+        self.image.paste(image, (x, y))
+
+class MemoryMatrix(object):
+    def __init__(self, width: int = 64, height: int = 32) -> None:
+        self.canvases = [MemoryCanvas(width, height), MemoryCanvas(width, height)]
+        self.swaps = 0
+
+    def CreateFrameCanvas(self) -> MemoryCanvas:
+        return self.canvases[0]
+
+    def SwapOnVSync(self, canvas: MemoryCanvas) -> MemoryCanvas:
+        self.swaps += 1
+        return self.canvases[1] if canvas is self.canvases[0] else self.canvases[0]
+
+    def Clear(self) -> None:
+        pass
+
+class SimulatedTime(object):
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+def headless_config(damage_tracking: bool, target_fps: float = 10) -> AppConfig:
+    return AppConfig(
+        mode="emulated",
+        gpio_hardware_mapping="regular",
+        gpio_slowdown=1,
+        purpleair_url="http://localhost/json",
+        display_tz="America/Edmonton",
+        calendar_ical_url="http://localhost/calendar.ics",
+        font_path=os.path.join(os.path.dirname(__file__), "fonts"),
+        preload_fonts=["4x6", "5x8", "6x10", "7x13"],
+        icon_path=os.path.join(os.path.dirname(__file__), "icons"),
+        cache_path=None,
+        parse_executor="inline",
+        mqtt=MQTTConfig(
+            hostname="localhost",
+            port=1883,
+            username="",
+            password="",
+            discovery_prefix="homeassistant",
+            discovery_node_id="pixelperfectpi",
+            discovery_object_id="headless",
+        ),
+        homeassistant_media_mqtt_topic="homeassistant/output/media/family_room_tv",
+        location=LocationConfig(latitude=51.036476342750326, longitude=-114.1045886332063),
+        weather_mqtt_topic="homeassistant/output/weather/Home",
+        damage_tracking=damage_tracking,
+        target_fps=target_fps,
+        profiling=False,
+    )
+
+def canned_payloads(start: float) -> dict[str, dict[str, Any]]:
+    start_dt = datetime.datetime.fromtimestamp(start, datetime.timezone.utc)
+    hourly = [
+        {
+            "condition": "partlycloudy" if i % 3 else "sunny",
+            "datetime": (start_dt + datetime.timedelta(hours=i)).isoformat(),
+            "temperature": -8.0 + i * 0.5,
+            "templow": None,
+            "precipitation": 0.1 * (i % 4),
+            "humidity": 70,
+            "pressure": 1012,
+            "wind_bearing": 270,
+            "wind_speed": 12.0,
+        }
+        for i in range(48)
+    ]
+    daily = [
+        {
+            "condition": "snowy" if i % 2 else "cloudy",
+            "datetime": (start_dt + datetime.timedelta(days=i)).isoformat(),
+            "temperature": -3.0 + i,
+            "templow": -14.0 + i,
+            "precipitation": 1.5,
+            "humidity": 80,
+            "pressure": 1008,
+            "wind_bearing": 250,
+            "wind_speed": 20.0,
+        }
+        for i in range(7)
+    ]
+    door_since = (start_dt - datetime.timedelta(minutes=2)).strftime('%Y-%m-%d %H:%M:%S.%f%z')
+    return {
+        "homeassistant/output/weather/Home": {
+            "current": {
+                "condition": "partlycloudy",
+                "temperature": -17.5,
+                "humidity": 75,
+                "pressure": 1015,
+                "wind_bearing": 280,
+                "wind_speed": 18.0,
+                "uv": "1",
+            },
+            "forecasts": {"daily": daily, "hourly": hourly},
+        },
+        "homeassistant/output/door/garage_door": {"timestamp": door_since, "state": "open"},
+        "homeassistant/output/door/garage_man_door": {"timestamp": door_since, "state": "closed"},
+        "homeassistant/output/door/back_door": {"timestamp": door_since, "state": "closed"},
+        "homeassistant/output/location/mathieu": {"latitude": 51.0447, "longitude": -114.0719},
+        "homeassistant/output/location/amanda": {"latitude": 51.1784, "longitude": -115.5708},
+        "prometheus/alerts/OvenPoweredOn": {"status": "firing"},
+        "homeassistant/output/timer/kitchen": {
+            "state": "active",
+            "duration": "0:18:00",
+            "finishes_at": (start_dt + datetime.timedelta(minutes=18)).strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "remaining": "0:18:00",
+        },
+        "homeassistant/output/media/family_room_tv": {
+            "state": "playing",
+            "position": 600,
+            "duration": 2700,
+            "updated_at": start_dt.strftime('%Y-%m-%d %H:%M:%S.%f%z'),
+        },
+    }
+
+async def feed_payloads(data_resolvers: list[DataResolver[Any]], payloads: dict[str, dict[str, Any]]) -> None:
+    router = TopicRouter([data for data in data_resolvers if isinstance(data, MqttMessageReceiver)])
+    for topic, payload in payloads.items():
+        message = Message(topic, json.dumps(payload).encode(), qos=1, retain=True, mid=0, properties=None)
+        await deliver(message, router.match(topic))
@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 
-from config import AppConfig, LocationConfig, MQTTConfig
+from config import AppConfig, LocationConfig, MQTTConfig, comma_list
 from di import create_clock
-from typing import Literal
+from typing import Literal, cast
 import os
 import socket
 
@@ -10,6 +10,12 @@ def load_config() -> AppConfig:
     with open("/proc/cpuinfo") as f:
         cpuinfo = f.read()
     mode: Literal['real', 'emulated'] = "real" if "Raspberry Pi" in cpuinfo else "emulated"
+    parse_executor = os.environ.get("PARSE_EXECUTOR", "thread")
+    if parse_executor not in ("inline", "thread", "process"):
+        raise ValueError(f"PARSE_EXECUTOR must be inline, thread or process, not {parse_executor!r}")
+    target_fps = float(os.environ.get("TARGET_FPS", 10))
+    if target_fps <= 0:
+        raise ValueError(f"TARGET_FPS must be positive, not {os.environ['TARGET_FPS']!r}")
 
     return AppConfig(
         mode="emulated" if os.environ.get("EMULATED") is not None else mode,
@@ -19,7 +25,10 @@ def load_config() -> AppConfig:
         display_tz=os.environ.get("DISPLAY_TZ", "America/Edmonton"),
         calendar_ical_url=os.environ["ICAL_URL"],  # This is required; ensure it is set in your environment
         font_path=os.environ.get("FONT_PATH", "./fonts/"),
+        preload_fonts=comma_list(os.environ.get("PRELOAD_FONTS", "4x6,5x8,6x10,7x13")),
         icon_path=os.environ.get("ICON_PATH", "./icons/"),
+        cache_path=os.environ.get("CACHE_PATH", os.path.expanduser("~/.cache/pixelperfectpi")),
+        parse_executor=cast(Literal["inline"] | Literal["thread"] | Literal["process"], parse_executor), # validated above
         mqtt=MQTTConfig(
             hostname=os.environ["MQTT_HOST"],
             port=int(os.environ.get("MQTT_PORT", 1883)),
@@ -34,7 +43,10 @@ def load_config() -> AppConfig:
             latitude=float(os.environ.get("LATITUDE", 51.036476342750326)),
             longitude=float(os.environ.get("LONGITUDE", -114.1045886332063))
         ),
-        weather_mqtt_topic=os.environ.get("WEATHER_MQTT_TOPIC", "homeassistant/output/weather/Home")
+        weather_mqtt_topic=os.environ.get("WEATHER_MQTT_TOPIC", "homeassistant/output/weather/Home"),
+        damage_tracking=os.environ.get("DAMAGE_TRACKING") is not None,
+        target_fps=target_fps,
+        profiling=os.environ.get("PROFILING") is not None,
     )
 
 def main(config: AppConfig) -> None:
@@ -1,14 +1,22 @@
 from aiomqtt import Client, Message
 from dataclasses import dataclass
 from service import Service
-from typing import Any, Literal, TYPE_CHECKING
+from typing import Any, Iterable, Literal, TYPE_CHECKING
 import asyncio
 import backoff
 import json
 import logging
 
+try:
+    import orjson
+except ImportError:
+    # Optional; a faster JSON decoder for large payloads such as weather forecasts.
+    orjson = None # type: ignore
+
 if TYPE_CHECKING:
+    from data.refresh import RefreshScheduler
     from displaybase import DisplayBase
+    from draw import FrameProfiler
 
 logging.getLogger('backoff').addHandler(logging.StreamHandler())
 
@@ -23,12 +31,108 @@ class MqttConfig:
     discovery_node_id: str | None
     discovery_object_id: str | None
 
+def decode_json(payload: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
 class MqttMessageReceiver:
+    # Topic filters (which may use the + and # wildcards) of the messages this receiver handles.
+    def topic_filters(self) -> list[str]:
+        return []
     async def subscribe_to_topics(self, client: Client) -> None:
-        pass
+        for topic_filter in self.topic_filters():
+            await client.subscribe(topic_filter)
+    async def handle_message(self, message: Message) -> bool:
+        return False
+
+# A receiver of JSON payloads.  Messages are dispatched to every matching receiver in turn, so deliver() decodes each
+# payload once and passes the decoding to handle_json() of all of them; receivers must treat it as immutable.
+class JsonMessageReceiver(MqttMessageReceiver):
+    # A message handled on its own, not through deliver(), is decoded only if it's on one of the receiver's topics.
     async def handle_message(self, message: Message) -> bool:
+        if not TopicRouter([self]).match(str(message.topic)) or not isinstance(message.payload, bytes):
+            return False
+        return await self.handle_json(message, decode_json(message.payload))
+    async def handle_json(self, message: Message, payload: Any) -> bool:
         return False
 
+# Passes the message to each of the receivers, decoding its payload at most once; returns whether any handled it.
+async def deliver(message: Message, receivers: Iterable[MqttMessageReceiver]) -> bool:
+    message_handled = False
+    decoded = False
+    payload: Any = None
+    for receiver in receivers:
+        try:
+            if isinstance(receiver, JsonMessageReceiver) and isinstance(message.payload, bytes):
+                if not decoded:
+                    payload = decode_json(message.payload)
+                    decoded = True
+                handled = await receiver.handle_json(message, payload)
+            else:
+                handled = await receiver.handle_message(message)
+        except Exception as exc:
+            raise RuntimeError(f"failed in handle_message from receiver {receiver}") from exc
+        # Do not stop at the first; allow multiple receivers to handle the same message
+        message_handled = message_handled or handled
+    return message_handled
+
+class TopicNode(object):
+    def __init__(self) -> None:
+        self.children: dict[str, TopicNode] = {}
+        self.receivers: list[MqttMessageReceiver] = []
+
+# Finds the receivers whose topic filters match a message's topic.  Filters without wildcards are looked up in a dict;
+# wildcard filters are kept in a trie of topic levels, which is only walked when there are any.  Each receiver is
+# returned at most once, however many of its filters match.
+class TopicRouter(object):
+    def __init__(self, receivers: Iterable[MqttMessageReceiver] = ()) -> None:
+        self.exact: dict[str, list[MqttMessageReceiver]] = {}
+        self.wildcards = TopicNode()
+        self.has_wildcards = False
+        self.filters: dict[str, None] = {}
+        for receiver in receivers:
+            for topic_filter in receiver.topic_filters():
+                self.add(topic_filter, receiver)
+
+    def add(self, topic_filter: str, receiver: MqttMessageReceiver) -> None:
+        self.filters[topic_filter] = None
+        levels = topic_filter.split("/")
+        if "+" not in levels and "#" not in levels:
+            self.exact.setdefault(topic_filter, []).append(receiver)
+            return
+        node = self.wildcards
+        for level in levels:
+            node = node.children.setdefault(level, TopicNode())
+        node.receivers.append(receiver)
+        self.has_wildcards = True
+
+    # Each distinct filter once, to subscribe to.
+    def topic_filters(self) -> list[str]:
+        return list(self.filters)
+
+    def match(self, topic: str) -> list[MqttMessageReceiver]:
+        receivers = list(self.exact.get(topic, []))
+        # Wildcards don't match topics beginning with $, eg. $SYS
+        if self.has_wildcards and not topic.startswith("$"):
+            nodes = [self.wildcards]
+            for level in topic.split("/"):
+                next_nodes = []
+                for node in nodes:
+                    if "#" in node.children:
+                        receivers.extend(node.children["#"].receivers)
+                    if level in node.children:
+                        next_nodes.append(node.children[level])
+                    if "+" in node.children:
+                        next_nodes.append(node.children["+"])
+                nodes = next_nodes
+            for node in nodes:
+                receivers.extend(node.receivers)
+                # "a/#" matches "a" too
+                if "#" in node.children:
+                    receivers.extend(node.children["#"].receivers)
+        return list(dict.fromkeys(receivers)) if len(receivers) > 1 else receivers
+
 def get_discovery_topic(config: MqttConfig) -> str:
     return f"{config.discovery_prefix}/switch/{config.discovery_node_id}/{config.discovery_object_id}/config"
 
@@ -41,6 +145,15 @@ def get_cmd_topic(config: MqttConfig) -> str:
 def get_availability_topic(config: MqttConfig) -> str:
     return f"{config.discovery_prefix}/{config.discovery_node_id}/{config.discovery_object_id}/available"
 
+def get_diagnostics_topic(config: MqttConfig) -> str:
+    return f"{config.discovery_prefix}/{config.discovery_node_id}/{config.discovery_object_id}/diagnostics"
+
+def get_diagnostics_cmd_topic(config: MqttConfig) -> str:
+    return f"{get_diagnostics_topic(config)}/cmd"
+
+def get_flamegraph_topic(config: MqttConfig) -> str:
+    return f"{get_diagnostics_topic(config)}/flamegraph"
+
 def get_discovery_payload(config: MqttConfig) -> dict[str, Any]:
     return {
         "name": config.discovery_object_id,
@@ -59,11 +172,44 @@ def on_runtime_error(e: Exception) -> bool:
     return isinstance(e, RuntimeError)
 
 class MqttServer(Service):
-    def __init__(self, config: MqttConfig, shutdown_event: asyncio.Event, other_receivers: list[MqttMessageReceiver]):
+    def __init__(self,
+        config: MqttConfig,
+        shutdown_event: asyncio.Event,
+        other_receivers: list[MqttMessageReceiver],
+        profiler: "FrameProfiler | None" = None,
+        refresh_scheduler: "RefreshScheduler | None" = None,
+        diagnostics_interval: float = 60,
+        coalesce_topics: Iterable[str] = (),
+        coalesce_interval: float = 0.1):
         self.config = config
         self.shutdown_event = shutdown_event
         self.status_update_queue: asyncio.Queue[str] = asyncio.Queue()
         self.other_receivers = other_receivers
+        self.router = TopicRouter(other_receivers)
+        # Messages on topics matching coalesce_topics (filters, which may use wildcards) are held for up to
+        # coalesce_interval, and only the latest one on each topic is dispatched; for topics that are updated faster
+        # than they can be displayed, like a media player's position.  Typically coalesce_interval is a frame.
+        # The router only tells whether any of the filters match, so they're all routed to the same placeholder receiver.
+        self.coalesce_router = TopicRouter()
+        placeholder = MqttMessageReceiver()
+        for topic_filter in coalesce_topics:
+            self.coalesce_router.add(topic_filter, placeholder)
+        self.coalesce_interval = coalesce_interval
+        # Whether each topic seen so far is coalesced
+        self.coalesced: dict[str, bool] = {}
+        self.pending: dict[str, Message] = {}
+        self.stats = {
+            "received": 0,
+            # Messages held for coalescing, and those of them superseded by a later message before being dispatched.
+            "coalesced": 0,
+            "dropped": 0,
+        }
+        # When set, frame timings are published to the diagnostics topic every diagnostics_interval seconds, and a
+        # flamegraph can be requested by publishing "flamegraph" to the diagnostics cmd topic.
+        self.profiler = profiler
+        # When set, the polled resolvers' refresh counters are published to the diagnostics topic too.
+        self.refresh_scheduler = refresh_scheduler
+        self.diagnostics_interval = diagnostics_interval
 
     async def start(self, clock: "DisplayBase") -> None:
         if self.config.hostname is None:
@@ -118,37 +264,52 @@ class MqttServer(Service):
         # Subscribe to the topic where we'll receive commands for the switch
         cmd_topic = get_cmd_topic(self.config)
         await client.subscribe(cmd_topic)
-        for other_receiver in self.other_receivers:
-            await other_receiver.subscribe_to_topics(client)
+        diagnostics_cmd_topic = get_diagnostics_cmd_topic(self.config)
+        if self.profiler is not None:
+            await client.subscribe(diagnostics_cmd_topic)
+        # Receivers sharing a topic share one subscription
+        for topic_filter in self.router.topic_filters():
+            await client.subscribe(topic_filter)
 
         # this is correct, but create_task types are wrong? https://github.com/python/typeshed/issues/10185
         messages_next = asyncio.create_task(anext(client.messages)) # type: ignore
         status_update = asyncio.create_task(self.status_update_queue.get())
         shutdown_wait = asyncio.create_task(self.shutdown_event.wait())
+        # Only ticks when there are diagnostics to publish
+        diagnostics_tick: asyncio.Task[None] | None = None
+        if self.profiler is not None or self.refresh_scheduler is not None:
+            diagnostics_tick = asyncio.create_task(asyncio.sleep(self.diagnostics_interval))
+        coalesce_flush: asyncio.Task[None] | None = None
 
         while not self.shutdown_event.is_set():
             aws = [ messages_next, status_update, shutdown_wait ]
+            if diagnostics_tick is not None:
+                aws.append(diagnostics_tick)
+            if coalesce_flush is not None:
+                aws.append(coalesce_flush)
             await asyncio.wait(aws, return_when=asyncio.FIRST_COMPLETED)
 
             if messages_next.done():
                 message = messages_next.result()
+                self.stats["received"] += 1
                 if str(message.topic) == cmd_topic:
                     cmd = message.payload.decode().upper()
                     if cmd == "ON":
                         await clock.turn_on()
                     elif cmd == "OFF":
                         await clock.turn_off()
+                elif str(message.topic) == diagnostics_cmd_topic and self.profiler is not None:
+                    cmd = message.payload.decode().lower()
+                    if cmd == "flamegraph":
+                        await client.publish(get_flamegraph_topic(self.config), self.profiler.flamegraph())
+                    elif cmd == "reset":
+                        self.profiler.reset()
+                elif self.is_coalesced(str(message.topic)):
+                    self.hold(message)
+                    if coalesce_flush is None:
+                        coalesce_flush = asyncio.create_task(asyncio.sleep(self.coalesce_interval))
                 else:
-                    message_handled = False
-                    for other_receiver in self.other_receivers:
-                        try:
-                            if await other_receiver.handle_message(message):
-                                message_handled = True
-                                # Do not break; allow multiple receivers to handle the same message
-                        except Exception as exc:
-                            raise RuntimeError(f"failed in handle_message from receiver {other_receiver}") from exc
-                    if not message_handled:
-                        print("Unknown message", message.topic, message.payload)
+                    await self.dispatch(message)
                 # this is correct, but create_task types are wrong? https://github.com/python/typeshed/issues/10185
                 messages_next = asyncio.create_task(anext(client.messages)) # type: ignore
 
@@ -157,6 +318,52 @@ class MqttServer(Service):
                 await client.publish(get_state_topic(self.config), status, qos=1, retain=True)
                 status_update = asyncio.create_task(self.status_update_queue.get())
 
+            if coalesce_flush is not None and coalesce_flush.done():
+                await self.flush()
+                coalesce_flush = None
+
+            if diagnostics_tick is not None and diagnostics_tick.done():
+                await self.publish_diagnostics(client, clock)
+                diagnostics_tick = asyncio.create_task(asyncio.sleep(self.diagnostics_interval))
+
+        if diagnostics_tick is not None:
+            diagnostics_tick.cancel()
+        if coalesce_flush is not None:
+            coalesce_flush.cancel()
+
+    async def dispatch(self, message: Message) -> None:
+        if not await deliver(message, self.router.match(str(message.topic))):
+            print("Unknown message", message.topic, message.payload)
+
+    def is_coalesced(self, topic: str) -> bool:
+        coalesced = self.coalesced.get(topic)
+        if coalesced is None:
+            coalesced = self.coalesced[topic] = len(self.coalesce_router.match(topic)) > 0
+        return coalesced
+
+    # Hold message until the next flush, replacing any message on the same topic that's already held.
+    def hold(self, message: Message) -> None:
+        topic = str(message.topic)
+        self.stats["coalesced"] += 1
+        if topic in self.pending:
+            self.stats["dropped"] += 1
+        self.pending[topic] = message
+
+    async def flush(self) -> None:
+        (pending, self.pending) = (self.pending, {})
+        for message in pending.values():
+            await self.dispatch(message)
+
+    async def publish_diagnostics(self, client: Client, clock: "DisplayBase") -> None:
+        payload: dict[str, Any] = {}
+        if self.profiler is not None:
+            payload.update(self.profiler.report())
+            payload["frames"] = clock.frame_scheduler.stats()
+        if self.refresh_scheduler is not None:
+            payload["resolvers"] = self.refresh_scheduler.report()
+        payload["mqtt"] = dict(self.stats)
+        await client.publish(get_diagnostics_topic(self.config), json.dumps(payload))
+
     async def status_update(self, state: Literal["ON"] | Literal["OFF"]) -> None:
         await self.status_update_queue.put(state)
 
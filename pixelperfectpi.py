@@ -2,15 +2,15 @@ from component.time import TimeComponent
 from data import DataResolver
 from data.currenttime import CurrentTimeDataResolver
 from displaybase import DisplayBase
-from draw import ContainerNode
+from draw import ContainerNode, Rect, profiler
+from framescheduler import FrameScheduler
 from PIL import Image
 from rgbmatrix import RGBMatrix # type: ignore
 from service import Service
 from stretchable import Node
 from stretchable.style import PCT, AUTO, FlexDirection, AlignItems, AlignContent, JustifyContent
-from typing import Set, TypeVar, Any, List, Callable
+from typing import TypeVar, List, Callable
 import asyncio
-import time
 
 T = TypeVar('T')
 
@@ -34,35 +34,55 @@ class Clock(DisplayBase):
         data_resolvers: List[DataResolver[T]],
         current_time: CurrentTimeDataResolver,
         root: ContainerNode,
-        shutdown_event: asyncio.Event, services: List[Service]) -> None:
-        super().__init__(rgbmatrix_provider=rgbmatrix_provider, shutdown_event=shutdown_event, services=services)
+        shutdown_event: asyncio.Event, services: List[Service],
+        damage_tracking: bool = False,
+        frame_scheduler: FrameScheduler | None = None) -> None:
+        super().__init__(rgbmatrix_provider=rgbmatrix_provider, shutdown_event=shutdown_event, services=services, frame_scheduler=frame_scheduler)
         self.data_resolvers = data_resolvers
         self.current_time = current_time
         self.root = root
+        # When enabled, only the parts of the drawable tree that changed since the last frame are redrawn, and only
+        # the changed regions are pushed to the matrix.
+        self.damage_tracking = damage_tracking
 
     def pre_run(self) -> None:
-        self.background_tasks: Set[asyncio.Task[Any]] = set()
+        pass
 
     async def create_canvas(self, matrix: RGBMatrix) -> None:
         self.offscreen_canvas = matrix.CreateFrameCanvas()
         self.buffer = Image.new("RGB", (self.offscreen_canvas.width, self.offscreen_canvas.height))
         self.root.set_size(self.offscreen_canvas.width, self.offscreen_canvas.height)
+        self.full_redraw_pending = True
+        # Regions that have changed since self.offscreen_canvas was last drawn upon; as the canvases are
+        # double-buffered, the offscreen canvas is always one frame behind.
+        self.offscreen_canvas_damage: List[Rect] = []
 
-    async def update_data(self) -> None:
-        now = time.time()
-        for data_resolver in self.data_resolvers:
-            task = asyncio.create_task(data_resolver.maybe_refresh(now))
-            self.background_tasks.add(task)
-            task.add_done_callback(self.background_tasks.discard)
+    def next_frame_time(self, now: float) -> float | None:
+        return self.root.next_frame_time(now)
 
     async def draw_frame(self, matrix: RGBMatrix) -> None:
-        self.current_time.freeze_time()
+        with profiler.phase("frame"):
+            self.current_time.freeze_time()
 
-        assert self.buffer is not None
-        self.root.draw(self.buffer)
+            assert self.buffer is not None
+            if not self.damage_tracking:
+                with profiler.phase("draw"):
+                    self.root.draw(self.buffer)
+                with profiler.phase("set_image"):
+                    self.offscreen_canvas.SetImage(self.buffer, 0, 0)
+                with profiler.phase("swap"):
+                    self.offscreen_canvas = matrix.SwapOnVSync(self.offscreen_canvas)
+            else:
+                with profiler.phase("draw"):
+                    damage = self.root.draw(self.buffer, incremental=not self.full_redraw_pending)
+                self.full_redraw_pending = False
+                # If nothing changed, the currently displayed canvas is already correct.
+                if len(damage) != 0:
+                    with profiler.phase("set_image"):
+                        for (x, y, w, h) in self.offscreen_canvas_damage + damage:
+                            self.offscreen_canvas.SetImage(self.buffer.crop((x, y, x + w, y + h)), x, y)
+                    with profiler.phase("swap"):
+                        self.offscreen_canvas = matrix.SwapOnVSync(self.offscreen_canvas)
+                    self.offscreen_canvas_damage = damage
 
-        self.offscreen_canvas.SetImage(self.buffer, 0, 0)
-
-        self.offscreen_canvas = matrix.SwapOnVSync(self.offscreen_canvas)
-
-        self.current_time.release_time()
+            self.current_time.release_time()
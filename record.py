@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+# Headless recording: renders the dashboard on a simulated clock into a recording, much faster than real time.  Frames
+# are drawn when the FrameScheduler would have drawn them, but rather than sleeping until then, the simulated clock is
+# simply moved forward.
+#
+#   ./record.py --hours 24 --fps 1 --output day.ppdelta
+#   ./record.py --hours 0.05 --output preview.png
+#
+# The clock's color cycles continuously, so with the default layout frames are drawn at --fps; at --fps 1 an hour is
+# 3600 frames, which renders in 15-25s here, and a simulated day in 6-9 minutes.  Roughly two thirds of that is layout, which is recomputed whenever a carousel
+# switches panels (every 5 simulated seconds).
+
+from di import create_clock
+from framescheduler import FrameScheduler
+from headless import SimulatedTime, START_TIME, canned_payloads, feed_payloads, headless_config
+from pixelperfectpi import Clock
+from recorder import ApngRecorder, DeltaRecorder, FrameRecorder, RecordingMatrix
+import argparse
+import asyncio
+import contextlib
+import sys
+import time
+
+async def run(clock: Clock, matrix: RecordingMatrix, simulated_time: SimulatedTime, scheduler: FrameScheduler, duration: float) -> int:
+    frames = 0
+    end = simulated_time.now + duration
+    while simulated_time.now < end:
+        frame_start = simulated_time.now
+        await clock.draw_frame(matrix)
+        frames += 1
+        simulated_time.now = frame_start + scheduler.schedule(frame_start, frame_start, clock.next_frame_time(frame_start))
+    return frames
+
+async def record(recorder: FrameRecorder, duration: float, fps: float, damage_tracking: bool) -> int:
+    simulated_time = SimulatedTime(START_TIME)
+    matrix = RecordingMatrix(recorder, simulated_time)
+    clock = create_clock(headless_config(damage_tracking, target_fps=fps), rgbmatrix_provider=lambda: matrix, time_source=simulated_time)
+    clock.pre_run()
+    await clock.create_canvas(matrix)
+    await feed_payloads(clock.data_resolvers, canned_payloads(START_TIME))
+    try:
+        return await run(clock, matrix, simulated_time, clock.frame_scheduler, duration)
+    finally:
+        recorder.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render the clock on a simulated clock into a recording")
+    parser.add_argument("--hours", type=float, default=1)
+    parser.add_argument("--fps", type=float, default=10, help="frame rate while something is animating")
+    parser.add_argument("--damage-tracking", action="store_true")
+    parser.add_argument("--output", required=True, help="*.png for an animated PNG; anything else for a delta recording")
+    args = parser.parse_args()
+
+    recorder: FrameRecorder = ApngRecorder(args.output) if args.output.endswith(".png") else DeltaRecorder(args.output)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):
+        frames = asyncio.run(record(recorder, args.hours * 3600, args.fps, args.damage_tracking))
+    print(f"Rendered {frames} frames covering {args.hours} hours in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
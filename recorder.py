@@ -0,0 +1,92 @@
+from headless import MemoryCanvas, MemoryMatrix
+from PIL import Image, ImageChops
+from typing import Callable, Iterator
+import gzip
+import struct
+
+DELTA_MAGIC = b"PPDELTA1"
+# width, height
+DELTA_HEADER = struct.Struct("<HH")
+# timestamp, x, y, width, height; followed by width * height RGB pixels
+DELTA_FRAME = struct.Struct("<dHHHH")
+
+class FrameRecorder(object):
+    def record(self, timestamp: float, image: Image.Image) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+# Records only the region of each frame that differs from the previous one, into a gzip-compressed stream.  Frames are
+# written out as they're recorded, so this is suitable for long recordings.
+class DeltaRecorder(FrameRecorder):
+    def __init__(self, path: str) -> None:
+        self.file = gzip.open(path, "wb")
+        self.last_frame: Image.Image | None = None
+        self.frames = 0
+
+    def record(self, timestamp: float, image: Image.Image) -> None:
+        image = image.convert("RGB")
+        if self.last_frame is None:
+            self.file.write(DELTA_MAGIC + DELTA_HEADER.pack(image.width, image.height))
+            bbox = (0, 0, image.width, image.height)
+        else:
+            changed = ImageChops.difference(image, self.last_frame).getbbox()
+            if changed is None:
+                return
+            bbox = changed
+        (left, top, right, bottom) = bbox
+        self.file.write(DELTA_FRAME.pack(timestamp, left, top, right - left, bottom - top))
+        self.file.write(image.crop(bbox).tobytes())
+        self.last_frame = image.copy()
+        self.frames += 1
+
+    def close(self) -> None:
+        self.file.close()
+
+# Read back a DeltaRecorder file, yielding the timestamp and complete image of each recorded frame.
+def read_delta(path: str) -> Iterator[tuple[float, Image.Image]]:
+    with gzip.open(path, "rb") as f:
+        if f.read(len(DELTA_MAGIC)) != DELTA_MAGIC:
+            raise ValueError(f"{path} is not a delta recording")
+        (width, height) = DELTA_HEADER.unpack(f.read(DELTA_HEADER.size))
+        frame = Image.new("RGB", (width, height))
+        while True:
+            header = f.read(DELTA_FRAME.size)
+            if len(header) < DELTA_FRAME.size:
+                return
+            (timestamp, x, y, w, h) = DELTA_FRAME.unpack(header)
+            frame.paste(Image.frombytes("RGB", (w, h), f.read(w * h * 3)), (x, y))
+            yield (timestamp, frame.copy())
+
+# Records changed frames into an animated PNG, with each frame shown until the next change.  Frames are held in memory
+# until close(), so this is intended for shorter recordings.
+class ApngRecorder(FrameRecorder):
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.frames: list[Image.Image] = []
+        self.timestamps: list[float] = []
+
+    def record(self, timestamp: float, image: Image.Image) -> None:
+        image = image.convert("RGB")
+        if len(self.frames) > 0 and ImageChops.difference(image, self.frames[-1]).getbbox() is None:
+            return
+        self.frames.append(image.copy())
+        self.timestamps.append(timestamp)
+
+    def close(self) -> None:
+        if len(self.frames) == 0:
+            return
+        durations = [int((end - start) * 1000) for start, end in zip(self.timestamps, self.timestamps[1:])] + [1000]
+        self.frames[0].save(self.path, format="PNG", save_all=True, append_images=self.frames[1:], duration=durations, loop=0)
+
+# An in-memory matrix that hands every frame that's displayed to a recorder, timestamped with time_source.
+class RecordingMatrix(MemoryMatrix):
+    def __init__(self, recorder: FrameRecorder, time_source: Callable[[], float], width: int = 64, height: int = 32) -> None:
+        super().__init__(width, height)
+        self.recorder = recorder
+        self.time_source = time_source
+
+    def SwapOnVSync(self, canvas: MemoryCanvas) -> MemoryCanvas:
+        self.recorder.record(self.time_source(), canvas.image)
+        return super().SwapOnVSync(canvas)
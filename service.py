@@ -12,3 +12,6 @@ class Service(object):
 
     async def start(self, clock: "DisplayBase") -> None:
         pass
+
+    async def stop(self) -> None:
+        pass
@@ -29,6 +29,10 @@ setup(
         'data/distance',
         'data/door',
         'data/envcanada',
+        'data/httpclient',
+        'data/icalindex',
+        'data/icalstream',
+        'data/refresh',
         'data/media_player',
         'data/ovenpower',
         'data/purpleair',
@@ -41,11 +45,18 @@ setup(
         'draw/carousel',
         'draw/containernode',
         'draw/drawable',
+        'draw/fontregistry',
+        'draw/glyphatlas',
         'draw/iconnode',
+        'draw/profiler',
+        'draw/rendercache',
+        'draw/sparkline',
+        'draw/textlayout',
         'draw/textnode',
         'config',
         'di',
         'displaybase',
+        'framescheduler',
         'mqtt',
         'pixelperfectpi',
         'service',
@@ -0,0 +1,6 @@
+from config import comma_list
+
+def test_comma_list() -> None:
+    assert comma_list("4x6,5x8") == ["4x6", "5x8"]
+    assert comma_list("4x6,,5x8,") == ["4x6", "5x8"]
+    assert comma_list("") == []
@@ -0,0 +1,48 @@
+from framescheduler import FrameScheduler
+import pytest
+
+def test_idle_ticks_on_second_boundaries() -> None:
+    scheduler = FrameScheduler(target_fps=10)
+    assert scheduler.schedule(frame_start=100.25, now=100.30, wanted=None) == pytest.approx(0.70)
+    assert scheduler.scheduled == 101.0
+
+def test_animation_runs_at_target_fps_compensating_render_time() -> None:
+    scheduler = FrameScheduler(target_fps=10)
+    assert scheduler.schedule(frame_start=100.25, now=100.29, wanted=100.25) == pytest.approx(0.06)
+    # ...but doesn't skip past the next second boundary
+    assert scheduler.schedule(frame_start=100.95, now=100.96, wanted=100.95) == pytest.approx(0.04)
+
+def test_deadline_is_hit_exactly() -> None:
+    scheduler = FrameScheduler(target_fps=10, boost_fps=30)
+    assert scheduler.schedule(frame_start=104.95, now=104.96, wanted=105.0) == pytest.approx(0.04)
+    # boost_fps bounds how soon the deadline can be met
+    assert scheduler.schedule(frame_start=102.49, now=102.495, wanted=102.5) == pytest.approx(1 / 30 - 0.005)
+
+def test_slow_frame_runs_immediately() -> None:
+    scheduler = FrameScheduler(target_fps=10)
+    assert scheduler.schedule(frame_start=100.0, now=100.5, wanted=100.0) == 0.0
+
+def test_stats() -> None:
+    scheduler = FrameScheduler(target_fps=10)
+    scheduler.frame_started(100.0)
+    scheduler.schedule(100.0, 100.01, 100.0)
+    scheduler.frame_started(100.1)
+    scheduler.schedule(100.1, 100.11, 100.1)
+    scheduler.frame_started(100.3) # 0.1s late
+    stats = scheduler.stats()
+    assert stats["frames"] == 3
+    assert stats["late_frames"] == 1
+    assert stats["fps"] == pytest.approx(2 / 0.3)
+    assert stats["jitter_max"] == pytest.approx(0.1)
+
+def test_reset_forgets_schedule() -> None:
+    scheduler = FrameScheduler(target_fps=10)
+    scheduler.frame_started(100.0)
+    scheduler.schedule(100.0, 100.01, 100.0)
+    scheduler.reset()
+    scheduler.frame_started(500.0)
+    assert scheduler.late_frames == 0
+
+def test_target_fps_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        FrameScheduler(target_fps=0)
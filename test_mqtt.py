@@ -0,0 +1,107 @@
+from aiomqtt import Message
+from data.weather_mqtt import CurrentWeatherDataMqttResolver, WeatherForecastDataMqttResolver
+from headless import START_TIME, canned_payloads
+from unittest.mock import patch
+from mqtt import MqttConfig, MqttMessageReceiver, MqttServer, TopicRouter, decode_json, deliver
+import asyncio
+import json
+import pytest
+import pytz
+
+class Receiver(MqttMessageReceiver):
+    def __init__(self, *topic_filters: str) -> None:
+        self.filters = list(topic_filters)
+        self.payloads: list[bytes] = []
+
+    def topic_filters(self) -> list[str]:
+        return self.filters
+
+    async def handle_message(self, message: Message) -> bool:
+        assert isinstance(message.payload, bytes)
+        self.payloads.append(message.payload)
+        return True
+
+@pytest.mark.parametrize("topic_filter, topic, matches", [
+    ("a/b/c", "a/b/c", True),
+    ("a/b/c", "a/b", False),
+    ("a/+/c", "a/b/c", True),
+    ("a/+/c", "a/b/d", False),
+    ("a/+", "a/b/c", False),
+    ("+/+", "a/b", True),
+    ("a/#", "a", True),
+    ("a/#", "a/b/c", True),
+    ("a/#", "b/c", False),
+    ("#", "a/b", True),
+    ("#", "$SYS/broker", False),
+    ("+/broker", "$SYS/broker", False),
+    ("a/+/#", "a/b", True),
+    ("a/+/#", "a", False),
+])
+def test_wildcards(topic_filter: str, topic: str, matches: bool) -> None:
+    receiver = Receiver(topic_filter)
+    assert TopicRouter([receiver]).match(topic) == ([receiver] if matches else [])
+
+def test_shared_topics_subscribe_once() -> None:
+    current = Receiver("homeassistant/output/weather")
+    forecast = Receiver("homeassistant/output/weather")
+    doors = Receiver("homeassistant/output/door/+", "homeassistant/output/door/garage_door")
+    router = TopicRouter([current, forecast, doors])
+    assert router.topic_filters() == ["homeassistant/output/weather", "homeassistant/output/door/+", "homeassistant/output/door/garage_door"]
+    assert router.match("homeassistant/output/weather") == [current, forecast]
+    # Matched by both of its filters, but dispatched once
+    assert router.match("homeassistant/output/door/garage_door") == [doors]
+    assert router.match("homeassistant/output/oven") == []
+
+@pytest.mark.asyncio
+async def test_payload_is_decoded_once_for_all_receivers() -> None:
+    topic = "homeassistant/output/weather/Home"
+    current = CurrentWeatherDataMqttResolver(topic)
+    forecast = WeatherForecastDataMqttResolver(topic, display_tz=pytz.timezone("America/Edmonton"))
+    payload = json.dumps(canned_payloads(START_TIME)[topic]).encode()
+    message = Message(topic, payload, qos=1, retain=True, mid=0, properties=None)
+    with patch("mqtt.decode_json", wraps=decode_json) as decode:
+        assert await deliver(message, TopicRouter([current, forecast]).match(topic))
+        assert decode.call_count == 1
+    assert current.data is not None and current.data.temperature is not None
+    assert forecast.data is not None and len(forecast.data.hourly) > 0
+
+    # Nothing is kept between deliveries, so there is no decoding shared beyond one message's receivers
+    with patch("mqtt.decode_json", wraps=decode_json) as decode:
+        assert await deliver(message, [current])
+        assert await deliver(message, [forecast])
+        assert decode.call_count == 2
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_decoders_agree(backend: str) -> None:
+    payload = json.dumps(canned_payloads(START_TIME)["homeassistant/output/weather/Home"]).encode()
+    backend_module = pytest.importorskip("orjson") if backend == "orjson" else None
+    with patch("mqtt.orjson", backend_module):
+        assert decode_json(payload) == json.loads(payload)
+
+@pytest.mark.asyncio
+async def test_coalesces_to_latest_message_per_topic() -> None:
+    location = Receiver("homeassistant/output/location/+")
+    door = Receiver("homeassistant/output/door/back_door")
+    server = MqttServer(
+        config=MqttConfig(hostname=None, port=1883, username=None, password=None, discovery_prefix=None, discovery_node_id=None, discovery_object_id=None),
+        shutdown_event=asyncio.Event(),
+        other_receivers=[location, door],
+        coalesce_topics=["homeassistant/output/location/#"],
+    )
+    assert server.is_coalesced("homeassistant/output/location/mathieu")
+    assert not server.is_coalesced("homeassistant/output/door/back_door")
+
+    for (topic, payload) in [
+        ("homeassistant/output/location/mathieu", b"1"),
+        ("homeassistant/output/location/amanda", b"2"),
+        ("homeassistant/output/location/mathieu", b"3"),
+        ("homeassistant/output/location/mathieu", b"4"),
+    ]:
+        server.hold(Message(topic, payload, qos=0, retain=False, mid=0, properties=None))
+    assert location.payloads == []
+    await server.flush()
+    assert location.payloads == [b"4", b"2"]
+    assert (server.stats["coalesced"], server.stats["dropped"]) == (4, 2)
+
+    await server.flush()
+    assert location.payloads == [b"4", b"2"]
@@ -0,0 +1,52 @@
+from headless import SimulatedTime
+from PIL import Image
+from recorder import ApngRecorder, DeltaRecorder, RecordingMatrix, read_delta
+import os.path
+
+def frame(color: tuple[int, int, int], box: tuple[int, int, int, int]) -> Image.Image:
+    image = Image.new("RGB", (64, 32))
+    image.paste(color, box=box)
+    return image
+
+FRAMES = [
+    frame((255, 0, 0), (0, 0, 10, 10)),
+    frame((255, 0, 0), (0, 0, 10, 10)), # unchanged; not recorded
+    frame((0, 255, 0), (20, 5, 30, 15)),
+    frame((0, 0, 255), (60, 28, 64, 32)),
+]
+
+def test_delta_roundtrip(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "recording.ppdelta")
+    recorder = DeltaRecorder(path)
+    for i, image in enumerate(FRAMES):
+        recorder.record(100.0 + i, image)
+    recorder.close()
+
+    frames = list(read_delta(path))
+    assert [timestamp for timestamp, _ in frames] == [100.0, 102.0, 103.0]
+    for (_, actual), expected in zip(frames, [FRAMES[0], FRAMES[2], FRAMES[3]]):
+        assert actual.tobytes() == expected.tobytes()
+
+def test_apng(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "recording.png")
+    recorder = ApngRecorder(path)
+    for i, image in enumerate(FRAMES):
+        recorder.record(100.0 + i * 0.5, image)
+    recorder.close()
+
+    with Image.open(path) as apng:
+        assert apng.n_frames == 3
+        apng.seek(1)
+        assert apng.convert("RGB").tobytes() == FRAMES[2].tobytes()
+
+def test_recording_matrix_timestamps_swaps(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "recording.ppdelta")
+    simulated_time = SimulatedTime(1000.0)
+    matrix = RecordingMatrix(DeltaRecorder(path), simulated_time)
+    canvas = matrix.CreateFrameCanvas()
+    for image in (FRAMES[0], FRAMES[2]):
+        canvas.SetImage(image, 0, 0)
+        canvas = matrix.SwapOnVSync(canvas)
+        simulated_time.now += 0.1
+    matrix.recorder.close()
+    assert [timestamp for timestamp, _ in read_delta(path)] == [1000.0, 1000.1]